@@ -0,0 +1,28 @@
+"""
+Measures how the compile time of if/else if chains scales with the number of branches.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_branches [branch_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.compile import compile_
+from .generate import branch_chain_shader
+
+
+def main(*branch_counts: int) -> None:
+    print(f"{'branches':>10} {'compile time':>14} {'per branch':>12}")
+    for branch_count in branch_counts or (50, 100, 200):
+        source = branch_chain_shader(branch_count)
+        set_context(CompilerContext())
+        start = time.perf_counter()
+        compile_(source, [Path(".")], is_main=True)
+        total = time.perf_counter() - start
+        print(f"{branch_count:>10} {total * 1000:>11.1f} ms {total / branch_count * 1e6:>9.0f} us")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,38 @@
+"""
+Measures end-to-end compile time of the example shaders.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_examples [repeat_count]
+"""
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import mxslc
+
+_examples_dir = Path(__file__).parents[2] / "examples"
+
+
+def main(repeat_count: int = 3) -> None:
+    print(f"{'example':>20} {'best time':>10}")
+    total = 0.0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mxsl_path in sorted(_examples_dir.glob("*.mxsl")):
+            mtlx_path = Path(tmp_dir) / mxsl_path.with_suffix(".mtlx").name
+            times = []
+            for _ in range(repeat_count):
+                start = time.perf_counter()
+                # compile_file reports every file it compiles
+                with redirect_stdout(StringIO()):
+                    mxslc.compile_file(mxsl_path, mtlx_path)
+                times.append(time.perf_counter() - start)
+            total += min(times)
+            print(f"{mxsl_path.stem:>20} {min(times) * 1000:>7.1f} ms")
+    print(f"{'total':>20} {total * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
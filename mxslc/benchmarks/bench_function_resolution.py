@@ -0,0 +1,57 @@
+"""
+Measures the cost of function overload resolution while compiling a large shader.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_function_resolution [statement_count]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc import state
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.compile import compile_
+from .generate import arithmetic_shader
+
+_resolution_functions = ["get_function", "get_function_parameter_types", "get_functions"]
+
+
+def main(statement_count: int = 300) -> None:
+    source = arithmetic_shader(statement_count)
+
+    calls = 0
+    elapsed = 0.0
+
+    def timed(func):
+        def wrapper(*args, **kwargs):
+            nonlocal calls, elapsed
+            calls += 1
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed += time.perf_counter() - start
+            return result
+        return wrapper
+
+    set_context(CompilerContext())
+    originals = {name: getattr(state, name) for name in _resolution_functions}
+    for name, func in originals.items():
+        setattr(state, name, timed(func))
+    try:
+        start = time.perf_counter()
+        compile_(source, [Path(".")], is_main=True)
+        total = time.perf_counter() - start
+    finally:
+        for name, func in originals.items():
+            setattr(state, name, func)
+
+    stats = state.get_resolution_cache_stats()
+    print(f"statements:        {statement_count * 3}")
+    print(f"compile time:      {total * 1000:.1f} ms")
+    print(f"resolution calls:  {calls}")
+    print(f"resolution time:   {elapsed * 1000:.1f} ms")
+    print(f"per call:          {elapsed / max(calls, 1) * 1e6:.1f} us")
+    print(f"cache hits/misses: {stats['hits']}/{stats['misses']}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,43 @@
+"""
+Measures the compile time of a shader that calls a few functions of a large library, when the library is included as
+source and when it is linked as a precompiled library.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_library [function_count ...]
+"""
+import io
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from mxslc import compile_file, compile_library
+from mxslc.stdlib import get_standard_library
+from .generate import library_source, library_shader
+
+
+def main(*function_counts: int) -> None:
+    # loaded up front so that it is not included in the time of the first shader
+    get_standard_library()
+    print(f"{'functions':>10} {'source':>12} {'linked':>12} {'library build':>14}")
+    for function_count in function_counts or (50, 200, 500):
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(io.StringIO()):
+            directory = Path(directory)
+            (directory / "lib.mxsl").write_text(library_source(function_count))
+            (directory / "source.mxsl").write_text(library_shader("lib.mxsl", 5))
+            (directory / "linked.mxsl").write_text(library_shader("lib.mtlx", 5))
+            start = time.perf_counter()
+            compile_library(directory / "lib.mxsl")
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            compile_file(directory / "source.mxsl")
+            source = time.perf_counter() - start
+            start = time.perf_counter()
+            compile_file(directory / "linked.mxsl")
+            linked = time.perf_counter() - start
+        print(f"{function_count:>10} {source * 1000:>9.1f} ms {linked * 1000:>9.1f} ms {build * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,31 @@
+"""
+Measures how the compile time of unrolled for loops scales with the number of iterations.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_loops [iteration_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.compile import compile_
+from mxslc.stdlib import get_standard_library
+from .generate import loop_shader
+
+
+def main(*iteration_counts: int) -> None:
+    # loaded up front so that it is not included in the time of the first loop
+    get_standard_library()
+    print(f"{'iterations':>10} {'compile time':>14} {'per iteration':>15}")
+    for iteration_count in iteration_counts or (500, 1000, 2000):
+        source = loop_shader(iteration_count)
+        set_context(CompilerContext())
+        start = time.perf_counter()
+        compile_(source, [Path(".")], is_main=True)
+        total = time.perf_counter() - start
+        print(f"{iteration_count:>10} {total * 1000:>11.1f} ms {total / iteration_count * 1e6:>12.0f} us")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,46 @@
+"""
+Measures preprocessing and parsing throughput on large generated sources, and the time to count the identifiers in them
+with a dict keyed by token.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_parse [function_count]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.Preprocessor.process import process
+from mxslc.parse import parse
+from mxslc.scan import scan
+from mxslc.token_types import IDENTIFIER
+from .generate import arithmetic_shader
+
+
+def main(function_count: int = 300) -> None:
+    tokens = scan(arithmetic_shader(function_count))
+    set_context(CompilerContext())
+
+    start = time.perf_counter()
+    processed_tokens = process(tokens, [Path(".")], is_main=True)
+    preprocess_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parse(processed_tokens)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counts = {}
+    for token in tokens:
+        if token.type == IDENTIFIER:
+            counts[token] = counts.get(token, 0) + 1
+    count_time = time.perf_counter() - start
+
+    print(f"tokens:          {len(tokens)}")
+    print(f"preprocess time: {preprocess_time * 1000:.1f} ms")
+    print(f"parse time:      {parse_time * 1000:.1f} ms")
+    print(f"count time:      {count_time * 1000:.1f} ms ({len(counts)} identifiers)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,41 @@
+"""
+Measures how many nodes are added to the document, and how long compilation takes, with and without peephole folding.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_peephole [statement_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import CompilerContext
+from mxslc.Optimization import Optimization
+from mxslc.compile import compile_
+from mxslc.post_process import post_process
+from .generate import arithmetic_shader
+
+
+def main(*statement_counts: int) -> None:
+    print(f"{'statements':>10} {'optimizations':>13} {'nodes added':>11} {'nodes after':>11} {'time':>10}")
+    for statement_count in statement_counts or [100, 200, 400, 800]:
+        source = arithmetic_shader(statement_count)
+        for optimizations in [set(), {Optimization.PEEPHOLE}]:
+            with CompilerContext() as context:
+                context.optimizations = optimizations
+                start = time.perf_counter()
+                compile_(source, [Path(".")], is_main=True)
+                nodes_added = _count_nodes(context)
+                post_process()
+                elapsed = time.perf_counter() - start
+                nodes_after = _count_nodes(context)
+            label = ",".join(optimizations) or "none"
+            print(f"{statement_count * 3:>10} {label:>13} {nodes_added:>11} {nodes_after:>11} {elapsed * 1000:>7.1f} ms")
+
+
+def _count_nodes(context: CompilerContext) -> int:
+    document = context.document
+    return sum(len(graph.get_nodes()) for graph in [document, *document.node_graphs])
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
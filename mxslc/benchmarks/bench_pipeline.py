@@ -0,0 +1,56 @@
+"""
+Measures the peak memory used to preprocess and parse a shader that includes many files, and how long it takes to report
+a syntax error at the top of it.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_pipeline [include_count]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from mxslc.CompileError import CompileError
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.Preprocessor.process import process
+from mxslc.parse import parse
+from mxslc.scan import iter_scan
+from mxslc.token_cache import get_token_cache
+from .generate import arithmetic_shader
+
+
+def main(include_count: int = 50) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        include_dir = Path(temp_dir)
+        # the files are only parsed, so it does not matter that they declare the same variables
+        for i in range(include_count):
+            (include_dir / f"include_{i}.mxsl").write_text(arithmetic_shader(100))
+        includes = "".join([f'#include "include_{i}.mxsl"\n' for i in range(include_count)])
+
+        # scanned once up front, so that both measurements only include preprocessing and parsing
+        get_token_cache().clear()
+        for i in range(include_count):
+            list(iter_scan(include_dir / f"include_{i}.mxsl"))
+
+        set_context(CompilerContext())
+        tracemalloc.start()
+        parse(process(iter_scan(includes), [include_dir, Path(".")], is_main=True))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        set_context(CompilerContext())
+        start = time.perf_counter()
+        try:
+            parse(process(iter_scan("float x = ;\n" + includes), [include_dir, Path(".")], is_main=True))
+        except CompileError:
+            pass
+        error_time = time.perf_counter() - start
+
+    print(f"included files:         {include_count}")
+    print(f"peak memory:            {peak / 1e6:.1f} MB")
+    print(f"time to syntax error:   {error_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,36 @@
+"""
+Measures post-processing time on large generated shaders.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_post_process [statement_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import CompilerContext
+from mxslc.compile import compile_
+from mxslc.post_process import post_process
+from .generate import arithmetic_shader
+
+
+def main(*statement_counts: int) -> None:
+    print(f"{'statements':>10} {'nodes before':>12} {'nodes after':>11} {'time':>10}")
+    for statement_count in statement_counts or [100, 200, 400, 800]:
+        with CompilerContext() as context:
+            compile_(arithmetic_shader(statement_count), [Path(".")], is_main=True)
+            nodes_before = _count_nodes(context)
+            start = time.perf_counter()
+            post_process()
+            elapsed = time.perf_counter() - start
+            nodes_after = _count_nodes(context)
+        print(f"{statement_count * 3:>10} {nodes_before:>12} {nodes_after:>11} {elapsed * 1000:>7.1f} ms")
+
+
+def _count_nodes(context: CompilerContext) -> int:
+    document = context.document
+    return sum(len(graph.get_nodes()) for graph in [document, *document.node_graphs])
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,36 @@
+"""
+Measures how preprocessing time scales with the number of defined macros, such as those passed to the compiler with -d.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_preprocess [macro_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.Preprocessor.macros import Macro, define_macro
+from mxslc.Preprocessor.process import process
+from mxslc.scan import scan
+from .generate import arithmetic_shader
+
+
+def main(*macro_counts: int) -> None:
+    # every fifth macro is used by the source, either in an #ifdef or as a value
+    source = "\n".join([f"#ifdef FEATURE_{i}\nfloat f{i} = VALUE_{i};\n#endif" for i in range(0, 1000, 5)])
+    source += "\n" + arithmetic_shader(100)
+    tokens = scan(source)
+    print(f"{'macros':>8} {'preprocess time':>17}")
+    for macro_count in macro_counts or (0, 100, 1000):
+        set_context(CompilerContext())
+        for i in range(macro_count // 2):
+            define_macro(Macro(f"FEATURE_{i}"))
+            define_macro(Macro(f"VALUE_{i}", f"{i}.0"))
+        start = time.perf_counter()
+        process(tokens, [Path(".")], is_main=True)
+        total = time.perf_counter() - start
+        print(f"{macro_count:>8} {total * 1000:>14.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
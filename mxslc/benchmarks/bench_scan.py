@@ -0,0 +1,30 @@
+"""
+Measures scanning throughput on large generated sources.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_scan [megabytes]
+"""
+import sys
+import time
+
+from mxslc.scan import scan
+from .generate import arithmetic_shader
+
+
+def main(megabytes: float = 4.0) -> None:
+    chunk = "// generated benchmark source\n" + arithmetic_shader(300)
+    source = chunk * max(1, int(megabytes * 1024 * 1024 / len(chunk)))
+
+    start = time.perf_counter()
+    tokens = scan(source)
+    elapsed = time.perf_counter() - start
+
+    size = len(source) / (1024 * 1024)
+    print(f"source size: {size:.2f} MB")
+    print(f"tokens:      {len(tokens)}")
+    print(f"scan time:   {elapsed * 1000:.1f} ms")
+    print(f"throughput:  {size / elapsed:.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:]])
@@ -0,0 +1,37 @@
+"""
+Measures the compile time and document size of shaders that declare templated functions, but only call one of their
+template types. Every template type is still compiled, so the time mostly measures the template types that are never
+called, and only the document size shows the ones that are removed.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_templates [function_count ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.compile import compile_
+from mxslc.document import get_document
+from mxslc.post_process import post_process
+from mxslc.stdlib import get_standard_library
+from .generate import template_shader
+
+
+def main(*function_counts: int) -> None:
+    # loaded up front so that it is not included in the time of the first shader
+    get_standard_library()
+    print(f"{'functions':>10} {'compile time':>14} {'nodedefs':>9}")
+    for function_count in function_counts or (10, 50, 100):
+        source = template_shader(function_count)
+        set_context(CompilerContext())
+        start = time.perf_counter()
+        compile_(source, [Path(".")], is_main=True)
+        # the definitions of template types that are never called are removed when the document is post-processed
+        post_process()
+        total = time.perf_counter() - start
+        print(f"{function_count:>10} {total * 1000:>11.1f} ms {len(get_document().node_defs):>9}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
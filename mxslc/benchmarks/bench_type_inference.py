@@ -0,0 +1,51 @@
+"""
+Measures the cost of inferring the types of function arguments while compiling deeply nested expressions.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_type_inference [statement_count] [depth]
+"""
+import sys
+import time
+from pathlib import Path
+
+from mxslc.CompileError import CompileError
+from mxslc.CompilerContext import set_context, CompilerContext
+from mxslc.Expressions import Expression
+from mxslc.compile import compile_
+from .generate import nested_expression_shader
+
+
+def main(statement_count: int = 100, depth: int = 8) -> None:
+    source = nested_expression_shader(statement_count, depth)
+
+    attempts = 0
+    failures = 0
+    init = Expression.init
+
+    def counted(self, *args, **kwargs):
+        nonlocal attempts, failures
+        attempts += not self.is_initialized
+        try:
+            init(self, *args, **kwargs)
+        except CompileError:
+            failures += 1
+            raise
+
+    set_context(CompilerContext())
+    Expression.init = counted
+    try:
+        start = time.perf_counter()
+        compile_(source, [Path(".")], is_main=True)
+        total = time.perf_counter() - start
+    finally:
+        Expression.init = init
+
+    print(f"statements:        {statement_count}")
+    print(f"nesting depth:     {depth}")
+    print(f"compile time:      {total * 1000:.1f} ms")
+    print(f"init attempts:     {attempts}")
+    print(f"failed attempts:   {failures}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,46 @@
+"""
+Measures repeated traversals of the standard library through the MaterialX wrappers.
+
+Usage (from the mxslc directory):
+    python -m benchmarks.bench_wrappers [repeat_count]
+"""
+import sys
+import time
+import tracemalloc
+
+from mxslc.stdlib import get_standard_library
+
+
+def main(repeat_count: int = 10) -> None:
+    document = get_standard_library().document
+
+    def traverse() -> int:
+        count = 0
+        for node_def in document.node_defs:
+            for input_ in node_def.inputs:
+                count += input_.parent == node_def
+            if node_def.output_count == 1:
+                count += node_def.output.data_type.size if node_def.output.data_type in _VALUE_TYPES else 0
+        return count
+
+    traverse()
+    start = time.perf_counter()
+    for _ in range(repeat_count):
+        traverse()
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    traverse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"nodedefs:          {len(document.node_defs)}")
+    print(f"per traversal:     {total / repeat_count * 1000:.1f} ms")
+    print(f"peak allocations:  {peak / 1024:.0f} KiB")
+
+
+_VALUE_TYPES = {"float", "vector2", "vector3", "vector4", "color3", "color4"}
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,141 @@
+"""
+Generators for large synthetic .mxsl programs used by the benchmarks.
+"""
+
+
+def arithmetic_shader(statement_count: int) -> str:
+    """
+    A long chain of float, vector and color arithmetic that exercises overload resolution of the standard library.
+    """
+    lines = [
+        "float f0 = 0.5;",
+        "vec3 v0 = vec3(0.1, 0.2, 0.3);",
+        "color3 c0 = color3(0.5, 0.5, 0.5);",
+    ]
+    for i in range(1, statement_count + 1):
+        p = i - 1
+        match i % 3:
+            case 0:
+                lines.append(f"float f{i} = f{p} * 1.5 + sin(f{p}) - 0.25;")
+                lines.append(f"vec3 v{i} = v{p};")
+                lines.append(f"color3 c{i} = c{p};")
+            case 1:
+                lines.append(f"float f{i} = f{p};")
+                lines.append(f"vec3 v{i} = normalize(v{p} * f{p} + vec3(1.0, 0.0, 0.0));")
+                lines.append(f"color3 c{i} = c{p};")
+            case 2:
+                lines.append(f"float f{i} = f{p};")
+                lines.append(f"vec3 v{i} = v{p};")
+                lines.append(f"color3 c{i} = mix(c{p}, color3(f{p}), 0.5) * 2.0;")
+    return "\n".join(lines) + "\n"
+
+
+def nested_expression_shader(statement_count: int, depth: int) -> str:
+    """
+    Statements made of deeply nested function calls and operators, whose argument types all have to be inferred. Some
+    of the calls, such as image, are overloaded on their return type alone.
+    """
+    templates = [
+        "sin({}) * 1.5",
+        "({} + 0.25) / 2.0",
+        "mix({}, f{p}, 0.5)",
+        "clamp({}, 0.0, 1.0)",
+        "max({} - 0.1, 0.0)",
+        "dotproduct(vec3({}, 0.0, 1.0), v0)",
+        "color3({}).r",
+        "dotproduct(image(\"noise.png\") * {}, v0)",
+    ]
+    lines = [
+        "float f0 = 0.5;",
+        "vec3 v0 = vec3(0.1, 0.2, 0.3);",
+    ]
+    for i in range(1, statement_count + 1):
+        p = i - 1
+        expr = f"f{p}"
+        for d in range(depth):
+            expr = templates[(i + d) % len(templates)].format(expr, p=p)
+        lines.append(f"float f{i} = {expr};")
+    return "\n".join(lines) + "\n"
+
+
+def branch_chain_shader(branch_count: int) -> str:
+    """
+    Long if/else if chains, whose branches have to be linked to the same type, and if expressions nested in the then
+    branches of others. Some branches are null or overloaded on their return type, so their type comes from the others.
+    """
+    lines = [
+        "float x = 0.5;",
+        "vec3 v = vec3(0.1, 0.2, 0.3);",
+    ]
+    chains = [
+        ("float", lambda i: "null" if i % 4 == 0 else f"sin(x * {i}.0)", "null"),
+        ("auto", lambda i: "null" if i % 3 == 0 else f"x * {i}.0 + 1.0", "0.0"),
+        ("color3", lambda i: 'image("noise.png")' if i % 2 == 0 else f"color3(x, {i}.0, 0.0)", "null"),
+        ("vec3", lambda i: f"normalize(v * {i}.0)", "v"),
+    ]
+    for j, (data_type, branch, last) in enumerate(chains):
+        branches = [f"if (x < {i / branch_count:.4f}) {{ {branch(i)} }}" for i in range(branch_count)]
+        lines.append(f"{data_type} y{j} = {' else '.join(branches)} else {{ {last} }};")
+    nested = "null"
+    for i in range(min(branch_count, 20)):
+        nested = f"if (x < {i / 20:.4f}) {{ {nested} }} else {{ x * {i}.0 }}"
+    lines.append(f"auto z = {nested};")
+    return "\n".join(lines) + "\n"
+
+
+def loop_shader(iteration_count: int) -> str:
+    """
+    A for loop that is unrolled into iteration_count copies of its body, which assign to the same variables every time.
+    """
+    return "\n".join([
+        "float a = 0.0;",
+        "vec3 v = vec3(0.0);",
+        f"for (float i = 0.0:{iteration_count}.0)",
+        "{",
+        "    a += i * 0.5;",
+        "    v = v + vec3(a);",
+        "}",
+    ]) + "\n"
+
+
+def template_shader(function_count: int) -> str:
+    """
+    Templated functions declared for five template types each, of which the shader only calls the vec3 instantiation.
+    """
+    lines = ["vec3 v = vec3(0.1, 0.2, 0.3);"]
+    for i in range(function_count):
+        lines += [
+            f"T f{i}<float, vec2, vec3, vec4, color3>(T x)",
+            "{",
+            f"    T y = x * {i}.0 + T(1.0);",
+            "    return y * y - x;",
+            "}",
+        ]
+    lines += [f"v = f{i}(v);" for i in range(function_count)]
+    return "\n".join(lines) + "\n"
+
+
+def library_source(function_count: int) -> str:
+    """
+    A library of functions whose bodies each hold a short chain of arithmetic.
+    """
+    lines = []
+    for i in range(function_count):
+        lines += [
+            f"vec3 f{i}(vec3 x, float k = {i}.0)",
+            "{",
+            "    vec3 y = x * k + vec3(1.0);",
+            "    y = y * y - x;",
+            "    return normalize(y + x / 2.0);",
+            "}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def library_shader(include: str, call_count: int) -> str:
+    """
+    A shader that includes a library and calls the first call_count of its functions.
+    """
+    lines = [f'#include "{include}"', "vec3 v = vec3(0.1, 0.2, 0.3);"]
+    lines += [f"v = f{i}(v);" for i in range(call_count)]
+    return "\n".join(lines) + "\n"
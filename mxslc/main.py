@@ -1,7 +1,7 @@
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 from pathlib import Path
 
-from mxslc import compile_file, Macro
+from mxslc import compile_file, compile_library, Macro, Optimization
 from mxslc.CompileError import CompileError
 from mxslc.scan import as_token
 
@@ -16,7 +16,7 @@ def _parse_main_args(args: list[str]) -> list[bool | int | float | str | Path]:
     return parsed_args
 
 
-def _main(raw_args: list[str] = None):
+def _parse_args(raw_args: list[str] = None) -> Namespace:
     parser = ArgumentParser()
     parser.add_argument("mxsl_path", type=Path, help="Input path to mxsl file or containing folder")
     parser.add_argument("-o", "--output-path", type=Path, help="Output path of generated mtlx file or containing folder")
@@ -25,9 +25,35 @@ def _main(raw_args: list[str] = None):
     parser.add_argument("-i", "--include-dirs", nargs="+", default=[], type=Path, help="Additional directories to search when including files")
     parser.add_argument("-d", "--define", dest="macros", nargs="+", action="append", default=[], type=str, help="Additional macro definitions")
     parser.add_argument("-v", "--validate", action="store_true", help="Validate the output MaterialX file")
+    # each -O takes at most one name, so it can not consume the input path unless it is given without a name
+    parser.add_argument("-O", "--optimize", dest="optimizations", nargs="?", action="append", default=[], choices=list(Optimization), help="Optimization to apply to the output, can be given more than once, or all optimizations if no name is given")
+    # the number of jobs is required, so that a path given after -j is not read as the number of jobs
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of files to compile in parallel when compiling a folder, or 0 for all available cores")
+    parser.add_argument("--incremental", action="store_true", help="Skip files whose output is up to date with their sources, includes and options")
+    parser.add_argument("--library", action="store_true", help="Compile the functions of the input into a library that other files can include")
+    parser.add_argument("--xinclude-libraries", action="store_true", help="Reference included libraries with an XInclude instead of copying their definitions into the output")
     args = parser.parse_args(raw_args)
+    # -O without a name appends None
+    if None in args.optimizations:
+        args.optimizations = list(Optimization)
+    return args
+
+
+def _main(raw_args: list[str] = None):
+    args = _parse_args(raw_args)
 
     try:
+        if args.library:
+            compile_library(
+                args.mxsl_path,
+                args.output_path,
+                add_include_dirs=args.include_dirs,
+                add_macros=[Macro(*m) for m in args.macros],
+                validate=args.validate,
+                optimizations=args.optimizations,
+                xinclude_libraries=args.xinclude_libraries
+            )
+            return
         compile_file(
             args.mxsl_path,
             args.output_path,
@@ -35,7 +61,11 @@ def _main(raw_args: list[str] = None):
             main_args=_parse_main_args(args.main_args),
             add_include_dirs=args.include_dirs,
             add_macros=[Macro(*m) for m in args.macros],
-            validate=args.validate
+            validate=args.validate,
+            optimizations=args.optimizations,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            xinclude_libraries=args.xinclude_libraries
         )
     except Exception as e:
         print(e)
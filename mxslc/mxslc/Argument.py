@@ -4,7 +4,7 @@ from .CompileError import CompileError
 from .DataType import DataType
 from .Expressions import Expression
 from .Token import Token
-from .mx_wrapper import Node
+from .ir import Node
 
 
 class Argument:
@@ -0,0 +1,82 @@
+"""
+The data written to and read from during a single compilation.
+
+The module-level functions in document, state, Preprocessor.macros and Preprocessor.includes operate on the current
+context. Each thread and asyncio task has its own current context, so independent compilations can run concurrently as
+long as each one is run inside its own context:
+
+    with CompilerContext():
+        compile_(source, include_dirs, is_main=True)
+
+Code that never enters a context shares a single default context.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar, Token as ContextToken
+from pathlib import Path
+from typing import Any
+
+from .Optimization import Optimization
+from .ir import Document
+
+
+type State = Any
+type Macro = Any
+type Dependencies = Any
+type DeadCodeReport = Any
+type Library = Any
+type TemplateInstance = Any
+
+
+class CompilerContext:
+    """
+    A context can be entered more than once, but only by one thread or asyncio task at a time, the same way a single
+    compilation can not be shared between threads.
+    """
+    def __init__(self):
+        self.document = Document()
+        # the root state is created by the state module when it is first needed, because it depends on this context
+        self.state: State | None = None
+        self.loop_counter = 0
+        # see Function.remove_uncalled_template_instances
+        self.template_instances: list[TemplateInstance] = []
+        # incremented whenever a function is added, see State.add_function
+        self.function_generation = 0
+        self.resolution_hits = 0
+        self.resolution_misses = 0
+        # macros are keyed by the lexeme of their identifier
+        self.macros: dict[str, Macro] = {}
+        self.once_files: set[Path] = set()
+        self.include_guards: dict[Path, str] = {}
+        self.include_stats = {"included": 0, "skipped_pragma_once": 0, "skipped_include_guard": 0}
+        # precompiled libraries keyed by the resolved path of their .mtlx file, see library.py
+        self.libraries: dict[Path, Library] = {}
+        # only tracked when compiling incrementally, see manifest.py
+        self.dependencies: Dependencies | None = None
+        self.optimizations: set[Optimization] = set()
+        # only set when the dead_code or unused_inputs optimizations are used, see dead_code.py
+        self.dead_code_report: DeadCodeReport | None = None
+        self.__tokens: list[ContextToken] = []
+
+    def __enter__(self) -> CompilerContext:
+        self.__tokens.append(_current_context.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_context.reset(self.__tokens.pop())
+
+
+_default_context = CompilerContext()
+_current_context: ContextVar[CompilerContext] = ContextVar("mxslc_compiler_context", default=_default_context)
+
+
+def get_context() -> CompilerContext:
+    return _current_context.get()
+
+
+def set_context(context: CompilerContext) -> None:
+    """
+    Makes context the current context of the calling thread or asyncio task until another context is set or entered.
+    """
+    _current_context.set(context)
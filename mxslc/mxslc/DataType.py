@@ -11,23 +11,33 @@ from .Token import Token
 class DataType:
     """
     Represents a data type (e.g., float, vector3, string, etc...).
+
+    There is only ever one instance of each data type, so constructing a data type from a token or string returns the
+    existing instance, and data types can be compared by identity.
     """
-    def __new__(cls, data_type: Token | DataType | str):
-        if data_type is None:
-            return None
-        else:
-            return super().__new__(cls)
+    __slots__ = ("__data_type", "__hash", "__size", "__zeros", "__default", "__is_mutable")
 
-    def __init__(self, data_type: Token | DataType | str):
+    __instances: dict[str, DataType] = {}
+
+    def __new__(cls, data_type: Token | DataType | str):
+        if data_type is None or isinstance(data_type, DataType):
+            return data_type
         if isinstance(data_type, Token):
-            self.__data_type = data_type.type
-        elif isinstance(data_type, DataType):
-            self.__data_type = data_type.__data_type
-        elif isinstance(data_type, str):
-            self.__data_type = data_type
-        else:
+            data_type = data_type.type
+        elif not isinstance(data_type, str):
             raise TypeError
-        assert self.__data_type in Keyword.DATA_TYPES() ^ {Keyword.VOID, Keyword.AUTO}, self.__data_type
+        instance = DataType.__instances.get(data_type)
+        if instance is None:
+            assert data_type in _VALID_DATA_TYPES, data_type
+            instance = super().__new__(cls)
+            instance.__data_type = Keyword(data_type)
+            instance.__hash = hash(instance.__data_type)
+            instance.__size = _SIZES.get(instance.__data_type)
+            instance.__zeros = _ZEROS.get(instance.__data_type)
+            instance.__default = _DEFAULTS.get(instance.__data_type, instance.__zeros)
+            instance.__is_mutable = isinstance(instance.__default, _MUTABLE_VALUE_TYPES)
+            DataType.__instances[data_type] = instance
+        return instance
 
     def instantiate(self, template_type: DataType | None) -> DataType:
         if self.__data_type == Keyword.T and template_type:
@@ -36,68 +46,82 @@ class DataType:
             return self
 
     @property
-    def size(self):
-        return {
-            Keyword.BOOLEAN: 1,
-            Keyword.INTEGER: 1,
-            Keyword.FLOAT: 1,
-            Keyword.VECTOR2: 2,
-            Keyword.VECTOR3: 3,
-            Keyword.VECTOR4: 4,
-            Keyword.COLOR3: 3,
-            Keyword.COLOR4: 4
-        }[Keyword(self.__data_type)]
+    def size(self) -> int:
+        if self.__size is None:
+            raise KeyError(self.__data_type)
+        return self.__size
 
     def zeros(self) -> "Uniform":
-        return {
-            Keyword.BOOLEAN: False,
-            Keyword.INTEGER: 0,
-            Keyword.FLOAT: 0.0,
-            Keyword.VECTOR2: mx.Vector2(),
-            Keyword.VECTOR3: mx.Vector3(),
-            Keyword.VECTOR4: mx.Vector4(),
-            Keyword.COLOR3: mx.Color3(),
-            Keyword.COLOR4: mx.Color4()
-        }[Keyword(self.__data_type)]
+        if self.__zeros is None:
+            raise KeyError(self.__data_type)
+        # vectors and colors can be modified, so every caller gets its own copy
+        return type(self.__zeros)(self.__zeros) if self.__is_mutable else self.__zeros
 
     def default(self) -> "Uniform":
-        if self.__data_type == Keyword.STRING:
-            return ""
-        elif self.__data_type == Keyword.FILENAME:
-            return Path()
-        elif self.__data_type == Keyword.SURFACESHADER:
-            return ""
-        elif self.__data_type == Keyword.DISPLACEMENTSHADER:
-            return ""
-        elif self.__data_type == Keyword.MATERIAL:
-            return ""
-        elif self.__data_type == Keyword.VOID:
-            return ""
-        elif self.__data_type == Keyword.AUTO:
-            return ""
-        else:
-            return self.zeros()
+        if self.__default is None:
+            raise KeyError(self.__data_type)
+        return type(self.__default)(self.__default) if self.__is_mutable else self.__default
 
     @property
     def as_token(self) -> Token:
         return Token(self.__data_type)
 
     def __eq__(self, other: Token | DataType | str) -> bool:
+        if isinstance(other, DataType):
+            return self is other
         if isinstance(other, Token):
             return self.__data_type == other.type
-        if isinstance(other, DataType):
-            return self.__data_type == other.__data_type
         if isinstance(other, str):
             return self.__data_type == other
         return False
 
     def __hash__(self) -> int:
-        return hash(self.__data_type)
+        return self.__hash
+
+    def __reduce__(self) -> tuple:
+        return DataType, (str(self.__data_type),)
 
     def __str__(self) -> str:
         return self.__data_type
 
 
+_VALID_DATA_TYPES = Keyword.DATA_TYPES() ^ {Keyword.VOID, Keyword.AUTO}
+
+_SIZES = {
+    Keyword.BOOLEAN: 1,
+    Keyword.INTEGER: 1,
+    Keyword.FLOAT: 1,
+    Keyword.VECTOR2: 2,
+    Keyword.VECTOR3: 3,
+    Keyword.VECTOR4: 4,
+    Keyword.COLOR3: 3,
+    Keyword.COLOR4: 4
+}
+
+_ZEROS = {
+    Keyword.BOOLEAN: False,
+    Keyword.INTEGER: 0,
+    Keyword.FLOAT: 0.0,
+    Keyword.VECTOR2: mx.Vector2(),
+    Keyword.VECTOR3: mx.Vector3(),
+    Keyword.VECTOR4: mx.Vector4(),
+    Keyword.COLOR3: mx.Color3(),
+    Keyword.COLOR4: mx.Color4()
+}
+
+_MUTABLE_VALUE_TYPES = (mx.Vector2, mx.Vector3, mx.Vector4, mx.Color3, mx.Color4)
+
+_DEFAULTS = {
+    Keyword.STRING: "",
+    Keyword.FILENAME: Path(),
+    Keyword.SURFACESHADER: "",
+    Keyword.DISPLACEMENTSHADER: "",
+    Keyword.MATERIAL: "",
+    Keyword.VOID: "",
+    Keyword.AUTO: ""
+}
+
+
 BOOLEAN = DataType(Keyword.BOOLEAN)
 INTEGER = DataType(Keyword.INTEGER)
 FLOAT = DataType(Keyword.FLOAT)
@@ -31,7 +31,7 @@ class Decompiler:
         self.__doc.load_standard_library()
         self.__func_names = {nd.node_string for nd in self.__doc.node_defs}
         self.__nodes: list[Node] = self.__doc.get_nodes()
-        self.__decompiled_nodes: list[Node] = []
+        self.__decompiled_nodes: set[Node] = set()
         self.__mxsl = ""
 
     def decompile(self) -> str:
@@ -42,7 +42,7 @@ class Decompiler:
         for node in nodes:
             if node in self.__decompiled_nodes:
                 continue
-            self.__decompiled_nodes.append(node)
+            self.__decompiled_nodes.add(node)
             input_nodes = [i.connected_node for i in node.inputs if i.connected_node]
             self.__decompile_nodes(input_nodes)
             self.__mxsl += f"{self.__deexecute(node)}\n"
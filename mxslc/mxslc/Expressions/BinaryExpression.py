@@ -4,7 +4,7 @@ from .. import node_utils
 from ..Argument import Argument
 from ..DataType import BOOLEAN
 from ..Keyword import Keyword
-from ..mx_wrapper import Node
+from ..ir import Node
 from ..Token import Token, IdentifierToken
 
 
@@ -3,7 +3,7 @@ from .expression_utils import format_args
 from .. import node_utils
 from ..DataType import DataType, FLOAT, MULTI_ELEM_TYPES
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 # TODO type checking. Maybe do the same as binary expression.
 class ConstructorCall(Expression):
@@ -17,6 +17,9 @@ class ConstructorCall(Expression):
         args = [a.instantiate_templated_types(template_type) for a in self.__args]
         return ConstructorCall(data_type, args)
 
+    def _possible_types(self) -> set[DataType]:
+        return {self.__data_type}
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         if len(self.__args) == 1:
             self.__args[0].init()
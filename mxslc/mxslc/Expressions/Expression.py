@@ -7,13 +7,14 @@ from ..CompileError import CompileError
 from ..DataType import DataType, DATA_TYPES, VOID
 from ..Keyword import Keyword
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class Expression(ABC):
     def __init__(self, token: Token | None):
         self.__token = token
         self.__initialized = False
+        self.__possible_types: frozenset[DataType] | None = None
 
     @property
     def token(self) -> Token:
@@ -45,6 +46,20 @@ class Expression(ABC):
         except CompileError as e:
             return e
 
+    @property
+    def possible_types(self) -> frozenset[DataType]:
+        """
+        Every data type that the expression could be initialised to. It is computed once from the possible types of the
+        subexpressions, so it can include types that fail to initialise, but never excludes a type that would succeed.
+        """
+        if self.__possible_types is None:
+            self.__possible_types = frozenset(self._possible_types())
+        return self.__possible_types
+
+    #virtualmethod
+    def _possible_types(self) -> set[DataType]:
+        return DATA_TYPES | {VOID}
+
     #virtualmethod
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         ...
@@ -6,7 +6,7 @@ from .. import state, utils
 from ..CompileError import CompileError
 from ..DataType import DataType
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 type Argument = Any
 
@@ -40,25 +40,44 @@ class FunctionCall(Expression):
         args = [a.instantiate_templated_types(template_type) for a in self.__args]
         return FunctionCall(self.__identifier, data_type, args)
 
+    def _possible_types(self) -> set[DataType]:
+        arg_types = tuple((a.position if a.is_positional else a.name, a.expression.possible_types) for a in self.__args)
+        return state.get_function_return_types(self.__identifier.lexeme, self.__template_type, arg_types)
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
+        # arguments are only initialised once the types that they could be and the types that the function accepts agree
+        # on a single type, initialising them can then narrow the types of the other arguments
         while len(self.__uninitialized_args) > 0:
             is_progress = False
-            errors: dict[Argument, CompileError] = {}
+            ambiguous_args: dict[Argument, set[DataType]] = {}
             for arg in self.__uninitialized_args:
                 param_index = arg.position if arg.is_positional else arg.name
                 valid_arg_types = state.get_function_parameter_types(valid_types, self.__identifier, self.__template_type, self.__initialized_args, param_index)
                 if len(valid_arg_types) == 0:
                     raise CompileError(f"Function signature '{utils.format_function(valid_types, self.__identifier.lexeme, self.__template_type, None)}' does not exist.", self.__identifier)
-                errors[arg] = arg.try_init(valid_arg_types)
-                is_progress |= arg.is_initialized
-            if not is_progress:
-                self.__raise_subexpr_error(valid_types, errors)
-
-    def __raise_subexpr_error(self, valid_types: set[DataType], errors: dict[Argument, CompileError]) -> str:
+                arg_types = valid_arg_types & arg.expression.possible_types
+                if len(arg_types) == 0:
+                    # the argument can not be any of the valid types, so it is initialised with them to get the error
+                    self.__init_argument(arg, valid_arg_types, valid_types)
+                elif len(arg_types) == 1:
+                    self.__init_argument(arg, arg_types, valid_types)
+                    is_progress = True
+                else:
+                    ambiguous_args[arg] = arg_types
+            if not is_progress and len(ambiguous_args) > 0:
+                # no argument could narrow the others, so the first is left to resolve its type itself
+                arg, arg_types = next(iter(ambiguous_args.items()))
+                self.__init_argument(arg, arg_types, valid_types)
+
+    def __init_argument(self, arg: Argument, arg_types: set[DataType], valid_types: set[DataType]) -> None:
+        try:
+            arg.init(arg_types)
+        except CompileError as e:
+            self.__raise_subexpr_error(valid_types, arg, e)
+
+    def __raise_subexpr_error(self, valid_types: set[DataType], arg: Argument, error: CompileError) -> None:
         msg = f"Invalid call to '{self.__identifier}':\n"
-        for arg, error in errors.items():
-            if error is not None:
-                msg += f"Argument {arg.position+1}: {error}\n"
+        msg += f"Argument {arg.position+1}: {error}\n"
         msg += "Possible function signatures:\n"
         msg += "\n".join([str(f) for f in state.get_functions(self.__identifier.lexeme, self.__template_type, valid_types, self.__initialized_args, strict_args=False)])
         raise CompileError(msg)
@@ -1,6 +1,6 @@
 from . import Expression
 from ..DataType import DataType
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class GroupingExpression(Expression):
@@ -17,6 +17,9 @@ class GroupingExpression(Expression):
         expr = self.__expr.instantiate_templated_types(template_type)
         return GroupingExpression(expr)
 
+    def _possible_types(self) -> set[DataType]:
+        return self.__expr.possible_types
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         self.__expr.init(valid_types)
 
@@ -1,8 +1,9 @@
 from . import Expression
 from .. import state, node_utils
+from ..CompileError import CompileError
 from ..DataType import DataType
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class IdentifierExpression(Expression):
@@ -17,6 +18,13 @@ class IdentifierExpression(Expression):
     def instantiate_templated_types(self, template_type: DataType) -> Expression:
         return IdentifierExpression(self.__identifier)
 
+    def _possible_types(self) -> set[DataType]:
+        try:
+            return {state.get_node(self.__identifier).data_type}
+        except CompileError:
+            # the missing variable is reported when the expression is initialised
+            return super()._possible_types()
+
     def _init(self, valid_types: set[DataType]) -> None:
         # raises exception if node is not found
         _ = state.get_node(self.__identifier)
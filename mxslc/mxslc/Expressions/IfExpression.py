@@ -1,9 +1,10 @@
+from __future__ import annotations
+
 from . import Expression
-from .expression_utils import init_linked_expressions
 from .. import node_utils
 from ..CompileError import CompileError
 from ..DataType import DataType, BOOLEAN
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class IfExpression(Expression):
@@ -27,12 +28,51 @@ class IfExpression(Expression):
         otherwise = self._otherwise.instantiate_templated_types(template_type)
         return IfExpression(clause, then, otherwise)
 
-    def _init_subexpr(self, valid_types: set[DataType]) -> None:
-        if self._otherwise is None:
-            raise CompileError("No else branch provided in if expression", self.token)
+    def _possible_types(self) -> set[DataType]:
+        chain = self.__else_if_chain()
+        if chain[-1]._otherwise is None:
+            return super()._possible_types()
+        possible_types = super()._possible_types()
+        for branch in self.__branches(chain):
+            possible_types &= branch.possible_types
+        return possible_types
 
-        self.__clause.init(BOOLEAN)
-        init_linked_expressions(self.__then, self._otherwise, valid_types)
+    def _init_subexpr(self, valid_types: set[DataType]) -> None:
+        # else if branches are initialised together in one pass, rather than recursively one if expression at a time
+        chain = self.__else_if_chain()
+        if chain[-1]._otherwise is None:
+            raise CompileError("No else branch provided in if expression", chain[-1].token)
+
+        for if_expr in chain:
+            if_expr.__clause.init(BOOLEAN)
+        branches = self.__branches(chain)
+        branch_types = set(valid_types)
+        for branch in branches:
+            branch_types &= branch.possible_types
+        if len(branch_types) == 0:
+            # the branches can not agree on a type, so they are initialised separately to report why
+            for branch in branches:
+                branch.init(valid_types)
+        else:
+            # if more than one type is still possible, the first branch resolves which, and the others are given its type
+            branches[0].init(branch_types)
+        data_type = branches[0].data_type
+        for branch in branches:
+            branch.init(data_type)
+            if branch.data_type != data_type:
+                raise CompileError(f"Expressions must evaluate to the same type, but were `{data_type}` and `{branch.data_type}`.", branch.token)
+        for if_expr in reversed(chain[1:]):
+            if_expr.init(valid_types)
+
+    def __else_if_chain(self) -> list[IfExpression]:
+        chain = [self]
+        while isinstance(chain[-1]._otherwise, IfExpression) and not chain[-1]._otherwise.is_initialized:
+            chain.append(chain[-1]._otherwise)
+        return chain
+
+    @staticmethod
+    def __branches(chain: list[IfExpression]) -> list[Expression]:
+        return [e.__then for e in chain] + [chain[-1]._otherwise]
 
     @property
     def _data_type(self) -> DataType:
@@ -1,7 +1,7 @@
 from .. import node_utils
 from ..DataType import DataType, INTEGER, FLOAT, MULTI_ELEM_TYPES
 from ..Expressions import Expression
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class IndexingExpression(Expression):
@@ -15,6 +15,9 @@ class IndexingExpression(Expression):
         indexer = self.__indexer.instantiate_templated_types(template_type)
         return IndexingExpression(expr, indexer)
 
+    def _possible_types(self) -> set[DataType]:
+        return {FLOAT}
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         self.__expr.init(MULTI_ELEM_TYPES)
         self.__indexer.init(INTEGER)
@@ -4,7 +4,7 @@ from ..CompileError import CompileError
 from ..DataType import DataType, BOOLEAN, INTEGER, FLOAT, STRING, FILENAME
 from ..Keyword import Keyword
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 from ..token_types import INT_LITERAL, FLOAT_LITERAL, FILENAME_LITERAL, STRING_LITERAL
 
 
@@ -17,6 +17,11 @@ class LiteralExpression(Expression):
     def instantiate_templated_types(self, template_type: DataType) -> Expression:
         return LiteralExpression(self.token)
 
+    def _possible_types(self) -> set[DataType]:
+        if self.__literal.type == Keyword.NULL:
+            return super()._possible_types()
+        return {self._data_type}
+
     def _init(self, valid_types: set[DataType]) -> None:
         if self.__literal.type == Keyword.NULL and len(valid_types) > 1:
             raise CompileError(f"null type is ambiguous.", self.token)
@@ -4,7 +4,7 @@ from .. import node_utils
 from ..CompileError import CompileError
 from ..DataType import DataType
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class NodeConstructor(Expression):
@@ -19,6 +19,9 @@ class NodeConstructor(Expression):
         args = [a.instantiate_templated_types(template_type) for a in self.__args]
         return NodeConstructor(self.token, data_type, args)
 
+    def _possible_types(self) -> set[DataType]:
+        return {self.__data_type}
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         for arg in self.__args:
             arg.init()
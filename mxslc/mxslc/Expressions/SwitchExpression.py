@@ -2,7 +2,7 @@ from . import Expression
 from .. import node_utils
 from ..CompileError import CompileError
 from ..DataType import DataType, INTEGER, FLOAT
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 # TODO implement nested switch expressions (to get 25 cases)
@@ -18,6 +18,12 @@ class SwitchExpression(Expression):
         values = [v.instantiate_templated_types(template_type) for v in self.__values]
         return SwitchExpression(which, values)
 
+    def _possible_types(self) -> set[DataType]:
+        possible_types = super()._possible_types()
+        for value in self.__values:
+            possible_types &= value.possible_types
+        return possible_types
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         self.__which.init({INTEGER, FLOAT})
         for value in self.__values:
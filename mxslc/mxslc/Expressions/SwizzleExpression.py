@@ -5,7 +5,7 @@ from .. import node_utils
 from ..CompileError import CompileError
 from ..DataType import DataType, VECTOR2, VECTOR3, VECTOR4, COLOR4, COLOR3
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 from ..utils import type_of_swizzle, string
 
 
@@ -22,6 +22,9 @@ class SwizzleExpression(Expression):
         left = self.__left.instantiate_templated_types(template_type)
         return SwizzleExpression(left, self.token)
 
+    def _possible_types(self) -> set[DataType]:
+        return {type_of_swizzle(self.__swizzle)}
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         self.__left.init(self.__valid_left_types())
 
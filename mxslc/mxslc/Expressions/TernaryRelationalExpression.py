@@ -2,7 +2,7 @@ from . import Expression, BinaryExpression
 from ..DataType import DataType, BOOLEAN
 from ..Keyword import Keyword
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class TernaryRelationalExpression(Expression):
@@ -19,6 +19,9 @@ class TernaryRelationalExpression(Expression):
     def instantiate_templated_types(self, template_type: DataType) -> Expression:
         return self.__and.instantiate_templated_types(template_type)
 
+    def _possible_types(self) -> set[DataType]:
+        return {BOOLEAN}
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         self.__and.init(BOOLEAN)
 
@@ -4,7 +4,7 @@ from ..CompileError import CompileError
 from ..DataType import DataType, BOOLEAN, INTEGER, FLOAT, MULTI_ELEM_TYPES
 from ..Keyword import Keyword
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class UnaryExpression(Expression):
@@ -24,6 +24,11 @@ class UnaryExpression(Expression):
         right = self.__right.instantiate_templated_types(template_type)
         return UnaryExpression(self.token, right)
 
+    def _possible_types(self) -> set[DataType]:
+        if self.__op in ["!", Keyword.NOT]:
+            return {BOOLEAN}
+        return self.__right.possible_types & ({INTEGER, FLOAT} | MULTI_ELEM_TYPES)
+
     def _init_subexpr(self, valid_types: set[DataType]) -> None:
         if self.__op in ["!", Keyword.NOT]:
             valid_sub_types = BOOLEAN
@@ -13,6 +13,9 @@ class VariableDeclarationExpression(IdentifierExpression):
     def instantiate_templated_types(self, template_type: DataType) -> Expression:
         return VariableDeclarationExpression(self.__data_type.instantiate(template_type), self.__identifier)
 
+    def _possible_types(self) -> set[DataType]:
+        return {self.__data_type}
+
     def _init(self, valid_types: set[DataType]) -> None:
         node = node_utils.constant(data_type=self.__data_type)
         state.add_node(self.__identifier, node)
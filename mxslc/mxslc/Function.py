@@ -14,8 +14,9 @@ from .Expressions.LiteralExpression import NullExpression
 from .Keyword import Keyword
 from .Parameter import ParameterList, Parameter
 from .Token import Token, IdentifierToken
+from .CompilerContext import get_context
 from .document import get_document
-from .mx_wrapper import Node, NodeDef, Output, NodeGraph
+from .ir import GraphElement, Node, NodeDef, Output, NodeGraph
 
 type Statement = Any
 
@@ -56,6 +57,10 @@ class Function(ABC):
     def fullname(self) -> str:
         ...
 
+    @property
+    def template_type(self) -> DataType | None:
+        return self._template_type
+
     @property
     def parameters(self) -> ParameterList:
         return self._params
@@ -98,9 +103,8 @@ class Function(ABC):
             if self.return_type not in return_types:
                 return False
         if args:
-            try:
-                satisfied_params = [self._params[a] for a in args]
-            except IndexError:
+            satisfied_params = [self._params.get(a) for a in args]
+            if None in satisfied_params:
                 return False
             if strict_args:
                 for param in self._params:
@@ -108,6 +112,17 @@ class Function(ABC):
                         return False
         return True
 
+    def accepts_types(self, arg_types: tuple[tuple[int | str, frozenset[DataType]], ...]) -> bool:
+        """
+        Returns true if every argument, given as its position or name and the data types it could be, can be passed to
+        a parameter of this function.
+        """
+        for index, data_types in arg_types:
+            param = self._params.get(index)
+            if param is None or param.data_type not in data_types:
+                return False
+        return True
+
     def __lt__(self, other: Function) -> bool:
         return self.fullname < other.fullname
 
@@ -177,6 +192,8 @@ class NodeGraphFunction(Function):
         self.__node_def: NodeDef | None = None
         self.__node_graph: NodeGraph | None = None
         self.__implicit_outs: dict[str, Output] = {}
+        # set for functions created from a signature until their default values are initialised, see from_signature
+        self.__default_scope: state.State | None = None
 
     @property
     def return_type(self) -> DataType:
@@ -193,6 +210,21 @@ class NodeGraphFunction(Function):
     def fullname(self) -> str:
         return f"ND_{self.name}" if self._template_type is None else f"ND_{self.name}_{self._template_type}"
 
+    @property
+    def node_def(self) -> NodeDef | None:
+        return self.__node_def
+
+    @property
+    def node_graph(self) -> NodeGraph | None:
+        """
+        The nodegraph that implements the function, which is only created for functions declared in this compilation.
+        """
+        return self.__node_graph
+
+    @property
+    def implicit_outputs(self) -> dict[str, Output]:
+        return self.__implicit_outs
+
     def initialise(self) -> None:
         self.parameters.init_default_values()
         self.__create_node_def()
@@ -213,6 +245,8 @@ class NodeGraphFunction(Function):
                 child.set_attribute(attrib.name, attrib.value)
 
     def invoke(self, args: list[Argument]) -> Node:
+        if self.__default_scope is not None:
+            self.__init_default_values()
         return self.__call_node_def(args)
 
     @staticmethod
@@ -240,6 +274,30 @@ class NodeGraphFunction(Function):
         func.__node_def = node_def
         return func
 
+    @staticmethod
+    def from_signature(node_def: NodeDef, return_type: DataType, identifier: Token, template_type: DataType | None, params: ParameterList, implicit_outs: dict[str, Output]) -> Function:
+        """
+        Creates a function from a nodedef that was compiled separately, such as a nodedef of a precompiled library. Unlike
+        from_node_def, the parameters, their default values and the implicit outputs of the original function are kept.
+
+        Default values can call any function, including functions created later from the same library and functions of
+        the standard library, which is only added to the scope once the source has been parsed. So they are initialised
+        in the current scope when the function is first called.
+        """
+        func = NodeGraphFunction(return_type, identifier, template_type, params, None, None)
+        func.__node_def = node_def
+        func.__implicit_outs = implicit_outs
+        func.__default_scope = state.get_scope()
+        return func
+
+    def __init_default_values(self) -> None:
+        outer_scope = state.enter_scope(self.__default_scope)
+        try:
+            self.parameters.init_default_values()
+        finally:
+            state.exit_scope(outer_scope)
+        self.__default_scope = None
+
     def __create_node_def(self) -> None:
         self.__node_def = get_document().add_node_def(self.fullname, self._return_type, self.name)
         for param in self._in_params:
@@ -311,3 +369,94 @@ class NodeGraphFunction(Function):
             else:
                 dot_node = node_utils.dot(node.output)
                 return dot_node
+
+
+class TemplateInstance(Function):
+    """
+    A function declared for one of the template types of a templated function declaration. Every template type is
+    instantiated where the function is declared, so its body is checked the same way as the body of a function without
+    template types, but the definitions of the template types that are never called are removed from the document
+    before it is emitted, see remove_uncalled_template_instances.
+    """
+    def __init__(self,
+                 is_inline: bool,
+                 return_type: DataType,
+                 identifier: Token,
+                 template_type: DataType,
+                 params: ParameterList,
+                 body: list[Statement],
+                 return_expr: Expression):
+        concrete_return_type = return_type.instantiate(template_type)
+        concrete_params = params.instantiate_templated_parameters(template_type)
+        super().__init__(concrete_return_type, identifier, template_type, concrete_params, body, return_expr)
+        self.__is_inline = is_inline
+        # the function is created without a body until it is initialised, which is enough to give its full name
+        self.__func = create_function(is_inline, concrete_return_type, identifier, template_type, concrete_params, None, None)
+        self.__callers: set[GraphElement] = set()
+        self.__is_exported = False
+
+    @property
+    def return_type(self) -> DataType:
+        return self.__func.return_type
+
+    @property
+    def fullname(self) -> str:
+        return self.__func.fullname
+
+    @property
+    def function(self) -> Function:
+        return self.__func
+
+    @property
+    def callers(self) -> set[GraphElement]:
+        """
+        The graphs that the function was called from.
+        """
+        return self.__callers
+
+    @property
+    def is_exported(self) -> bool:
+        return self.__is_exported
+
+    def initialise(self) -> None:
+        body = [s.instantiate_templated_types(self._template_type) for s in self._body]
+        return_expr = self._return_expr.instantiate_templated_types(self._template_type)
+        self.__func = create_function(self.__is_inline, self._return_type, self._identifier, self._template_type, self._params, body, return_expr)
+        self.__func.initialise()
+        get_context().template_instances.append(self)
+
+    def add_attributes(self, attribs: list[Attribute]) -> None:
+        self.__func.add_attributes(attribs)
+
+    def invoke(self, args: list[Argument]) -> Node:
+        self.__callers.add(state.get_graph())
+        return self.__func.invoke(args)
+
+    def export(self) -> Function:
+        """
+        Returns the function declared for the template type and keeps its definition in the document, even if it is
+        never called, such as when it is compiled into a library.
+        """
+        self.__is_exported = True
+        return self.__func
+
+
+def remove_uncalled_template_instances() -> None:
+    """
+    Removes the nodedefs and nodegraphs of template instances that are not called from the document, or from the
+    nodegraph of a function that is kept.
+    """
+    instances = [i for i in get_context().template_instances if isinstance(i.function, NodeGraphFunction)]
+    instance_graphs = {i.function.node_graph: i for i in instances}
+    kept = {i for i in instances if i.is_exported}
+    changed = True
+    while changed:
+        changed = False
+        for instance in instances:
+            if instance not in kept and any(g not in instance_graphs or instance_graphs[g] in kept for g in instance.callers):
+                kept.add(instance)
+                changed = True
+    for instance in instances:
+        if instance not in kept:
+            instance.function.node_graph.remove()
+            instance.function.node_def.remove()
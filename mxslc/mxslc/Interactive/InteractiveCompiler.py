@@ -1,46 +1,56 @@
 from pathlib import Path
 from typing import Sequence
 
-import MaterialX as mx
-
 from .ShaderInterface import ShaderInterface
-from .. import state
-from ..Preprocessor.macros import undefine_all_macros
+from ..CompilerContext import CompilerContext
+from ..Optimization import Optimization
 from ..compile import compile_
-from ..document import get_document, new_document
 from ..file_utils import handle_input_path
+from ..mx_wrapper import Document
 from ..post_process import post_process
 
 
 class InteractiveCompiler:
-    def __init__(self, add_include_dirs: Sequence[Path] = None):
+    def __init__(self, add_include_dirs: Sequence[Path] = None, optimizations: Sequence[str | Optimization] = None):
         self.__add_include_dirs = add_include_dirs or []
+        self.__optimizations = {Optimization(o) for o in optimizations or []}
         self.clear()
 
     @property
-    def document(self) -> mx.Document:
-        return get_document()
+    def context(self) -> CompilerContext:
+        return self.__context
+
+    @property
+    def document(self) -> Document:
+        """
+        A snapshot of the document being compiled. Changes made to it are not compiled.
+        """
+        return Document(self.__context.document.emit())
 
     @property
     def xml(self) -> str:
-        return self.document.xml
+        return self.__context.document.xml
 
     def get_shader_interface(self) -> ShaderInterface:
-        return ShaderInterface()
+        with self.__context:
+            return ShaderInterface()
 
     def include(self, mxsl_path: str | Path) -> None:
         mxsl_filepaths = handle_input_path(mxsl_path)
 
         for mxsl_filepath in mxsl_filepaths:
             include_dirs = [*self.__add_include_dirs, mxsl_filepath.parent, Path(".")]
-            compile_(mxsl_filepath, include_dirs, is_main=False)
+            with self.__context:
+                compile_(mxsl_filepath, include_dirs, is_main=False)
 
     def eval(self, code_snippet: str) -> None:
         include_dirs = [*self.__add_include_dirs, Path(".")]
-        compile_(code_snippet, include_dirs, is_main=True)
+        with self.__context:
+            compile_(code_snippet, include_dirs, is_main=True)
 
     def save(self, mtlx_filepath: Path, mkdir=False) -> None:
-        post_process()
+        with self.__context:
+            post_process()
         mtlx_filepath = mtlx_filepath.resolve()
         if mkdir:
             mtlx_filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -50,6 +60,6 @@ class InteractiveCompiler:
             file.write(self.xml)
 
     def clear(self) -> None:
-        undefine_all_macros()
-        new_document()
-        state.clear()
+        # the context is only current while the compiler is used, enter it to inspect it with the state module
+        self.__context = CompilerContext()
+        self.__context.optimizations = set(self.__optimizations)
@@ -1,93 +1,99 @@
 from __future__ import annotations
 
-import MaterialX as mx
-
 from .ValueExpression import ValueExpression
 from .mx_interactive_types import Value
+from ..CompilerContext import CompilerContext, get_context
 from ..Expressions import UnaryExpression, IndexingExpression, BinaryExpression
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class InteractiveNode:
-    def __init__(self, node: mx.Node | Node):
-        if isinstance(node, mx.Node):
-            self.__node = node
-        else:
-            self.__node = node.source
+    def __init__(self, node: Node):
+        self.__node = node
+        # new nodes are created in the context this node was created in
+        self.__context = get_context()
 
     @property
-    def node(self) -> mx.Node:
+    def node(self) -> Node:
+        """
+        The node in the document being compiled, not an mx.Node, because the MaterialX document is only created when it
+        is emitted. Its name_path finds the same node in InteractiveCompiler.document.
+        """
         return self.__node
 
     def __add__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "+", other)
+        return _binary_expr(self.__context, self.__node, "+", other)
 
     def __sub__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "-", other)
+        return _binary_expr(self.__context, self.__node, "-", other)
 
     def __mul__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "*", other)
+        return _binary_expr(self.__context, self.__node, "*", other)
 
     def __truediv__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "/", other)
+        return _binary_expr(self.__context, self.__node, "/", other)
 
     def __pow__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "^", other)
+        return _binary_expr(self.__context, self.__node, "^", other)
 
     def __mod__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "%", other)
+        return _binary_expr(self.__context, self.__node, "%", other)
 
     def __and__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "&", other)
+        return _binary_expr(self.__context, self.__node, "&", other)
 
     def __or__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "|", other)
+        return _binary_expr(self.__context, self.__node, "|", other)
 
     def __xor__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "^", other)
+        return _binary_expr(self.__context, self.__node, "^", other)
 
     def __eq__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "==", other)
+        return _binary_expr(self.__context, self.__node, "==", other)
 
     def __ne__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "!=", other)
+        return _binary_expr(self.__context, self.__node, "!=", other)
 
     def __lt__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "<", other)
+        return _binary_expr(self.__context, self.__node, "<", other)
 
     def __le__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, "<=", other)
+        return _binary_expr(self.__context, self.__node, "<=", other)
 
     def __gt__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, ">", other)
+        return _binary_expr(self.__context, self.__node, ">", other)
 
     def __ge__(self, other: Value) -> InteractiveNode:
-        return _binary_expr(self.__node, ">=", other)
+        return _binary_expr(self.__context, self.__node, ">=", other)
 
     def __neg__(self) -> InteractiveNode:
-        right = ValueExpression(self.__node)
-        expr = UnaryExpression(Token("-"), right)
-        return InteractiveNode(expr.evaluate())
+        with self.__context:
+            right = ValueExpression(self.__node)
+            expr = UnaryExpression(Token("-"), right)
+            return InteractiveNode(expr.evaluate())
 
     def __invert__(self) -> InteractiveNode:
-        right = ValueExpression(self.__node)
-        expr = UnaryExpression(Token("!"), right)
-        return InteractiveNode(expr.evaluate())
+        with self.__context:
+            right = ValueExpression(self.__node)
+            expr = UnaryExpression(Token("!"), right)
+            return InteractiveNode(expr.evaluate())
 
     def __getitem__(self, index: int) -> InteractiveNode:
-        left = ValueExpression(self.__node)
-        indexer = ValueExpression(index)
-        expr = IndexingExpression(left, indexer)
-        return InteractiveNode(expr.evaluate())
+        with self.__context:
+            left = ValueExpression(self.__node)
+            indexer = ValueExpression(index)
+            expr = IndexingExpression(left, indexer)
+            return InteractiveNode(expr.evaluate())
 
     def __getattr__(self, property_: str) -> InteractiveNode:
         # TODO swizzles
         raise NotImplementedError()
 
 
-def _binary_expr(left: Value, op: str, right: Value) -> InteractiveNode:
-    left = ValueExpression(left)
-    right = ValueExpression(right)
-    expr = BinaryExpression(left, Token(op), right)
-    return InteractiveNode(expr.evaluate())
+def _binary_expr(context: CompilerContext, left: Value, op: str, right: Value) -> InteractiveNode:
+    with context:
+        left = ValueExpression(left)
+        right = ValueExpression(right)
+        expr = BinaryExpression(left, Token(op), right)
+        return InteractiveNode(expr.evaluate())
@@ -3,18 +3,20 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Sequence
 
-import MaterialX as mx
-
-from .ValueExpression import ValueExpression
+from .ValueExpression import ValueExpression, to_node
 from .InteractiveNode import InteractiveNode
 from .mx_interactive_types import Value
-from .. import state, node_utils
+from .. import state
 from ..Argument import Argument
 from ..CompileError import CompileError
-from ..mx_wrapper import Node
+from ..CompilerContext import get_context
 
 
 class ShaderInterface:
+    def __init__(self):
+        # variables and functions are looked up in the context the interface was created in
+        super().__setattr__("_ShaderInterface__context", get_context())
+
     def __getattr__(self, name: str) -> InteractiveNode | InteractiveFunction:
         return self[name]
 
@@ -22,19 +24,22 @@ class ShaderInterface:
         self[name] = value
 
     def __contains__(self, name: str) -> bool:
-        return state.is_node(name) or state.is_function(name)
+        with self.__context:
+            return state.is_node(name) or state.is_function(name)
 
     def __getitem__(self, name: str) -> InteractiveNode | InteractiveFunction:
-        if state.is_node(name):
-            return InteractiveNode(state.get_node(name))
-        if state.is_function(name):
-            return InteractiveFunction(name)
+        with self.__context:
+            if state.is_node(name):
+                return InteractiveNode(state.get_node(name))
+            if state.is_function(name):
+                return InteractiveFunction(name)
         raise CompileError(f"No variable or function named '{name}' found.")
 
     def __setitem__(self, name: str, value: Value) -> None:
         # TODO type checking
-        if state.is_node(name):
-            state.set_node(name, _to_mtlx_node(value))
+        with self.__context:
+            if state.is_node(name):
+                state.set_node(name, to_node(value))
         raise CompileError(f"No variable named '{name}' found.")
 
     def __len__(self) -> int:
@@ -48,11 +53,13 @@ class ShaderInterface:
 
 class InteractiveFunction:
     def __init__(self, name: str):
+        self.__context = get_context()
         self.__function = state.get_function(name)
 
     def __call__(self, *args: Value | InteractiveNode) -> InteractiveNode:
-        node = self.__function.invoke(_to_arg_list(args))
-        return InteractiveNode(node)
+        with self.__context:
+            node = self.__function.invoke(_to_arg_list(args))
+            return InteractiveNode(node)
 
     @property
     def file(self) -> Path:
@@ -63,13 +70,6 @@ class InteractiveFunction:
         return self.__function.line
 
 
-def _to_mtlx_node(value: Value) -> Node:
-    if isinstance(value, mx.Node):
-        return Node(value)
-    else:
-        return node_utils.constant(value)
-
-
 def _to_arg_list(args: Sequence[Value | InteractiveNode]) -> list[Argument]:
     arg_list = []
     for i, arg in enumerate(args):
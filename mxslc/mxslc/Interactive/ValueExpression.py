@@ -2,18 +2,17 @@ import MaterialX as mx
 
 from .mx_interactive_types import Value
 from .. import node_utils
+from ..CompileError import CompileError
+from ..CompilerContext import get_context
 from ..DataType import DataType
 from ..Expressions import Expression
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class ValueExpression(Expression):
     def __init__(self, value: Value):
         super().__init__(None)
-        if isinstance(value, mx.Node):
-            self.__node = Node(value)
-        else:
-            self.__node = node_utils.constant(value)
+        self.__node = to_node(value)
 
     def instantiate_templated_types(self, data_type: DataType) -> Expression:
         return self
@@ -24,3 +23,15 @@ class ValueExpression(Expression):
 
     def _evaluate(self) -> Node:
         return self.__node
+
+
+def to_node(value: Value) -> Node:
+    if isinstance(value, Node):
+        return value
+    if isinstance(value, mx.Node):
+        # materialx nodes are read from a snapshot of the document, see InteractiveCompiler.document
+        node = get_context().document.get_descendant(value.getNamePath())
+        if not isinstance(node, Node):
+            raise CompileError(f"Node '{value.getNamePath()}' was not found in the document being compiled.")
+        return node
+    return node_utils.constant(value)
@@ -1,4 +1,6 @@
 import MaterialX as mx
+
+from ..ir import Node
 from ..mx_wrapper import Uniform
 
-type Value = mx.Node | Uniform
+type Value = mx.Node | Node | Uniform
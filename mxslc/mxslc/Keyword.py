@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from enum import StrEnum, auto
+from functools import cache
 
 
 class Keyword(StrEnum):
@@ -58,8 +59,10 @@ class Keyword(StrEnum):
     VEC4 = auto()
 
     @staticmethod
-    def DATA_TYPES() -> set[Keyword]:
-        return {
+    @cache
+    def DATA_TYPES() -> frozenset[Keyword]:
+        # cached, because the parser checks against the data types often
+        return frozenset({
             Keyword.BOOLEAN,
             Keyword.INTEGER,
             Keyword.FLOAT,
@@ -81,4 +84,4 @@ class Keyword(StrEnum):
             Keyword.BSDF,
             Keyword.EDF,
             Keyword.VDF
-        }
+        })
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from enum import StrEnum, auto
+
+
+class Optimization(StrEnum):
+    """
+    Optional optimizations. They change how the MaterialX graph is built, but not what it computes.
+    """
+    # dot, constant and identity convert nodes are only added to the document if they cannot be resolved away
+    PEEPHOLE = auto()
+    # nodes that compute the same values as another node in the same graph are merged into it
+    CSE = auto()
+    # math nodes whose inputs are all literals are replaced by the values they evaluate to
+    CONSTANT_FOLDING = auto()
+    # nodes, nodegraphs and nodedefs that do not contribute to a shader or material are removed
+    DEAD_CODE = auto()
+    # nodedef inputs that are not read by their nodegraph are removed, which changes the signature of the nodedef
+    UNUSED_INPUTS = auto()
@@ -91,6 +91,15 @@ class ParameterList:
         return self
 
     def __getitem__(self, index: int | str | Argument) -> Parameter:
+        if (param := self.get(index)) is not None:
+            return param
+        raise IndexError(f"No parameter found with the index '{index}'.")
+
+    def get(self, index: int | str | Argument) -> Parameter | None:
+        """
+        Returns the parameter at index, or None if there is no such parameter. Unlike indexing, this does not format an
+        error message, which is expensive for arguments, so it is used when looking for a matching overload.
+        """
         if isinstance(index, int) and index < len(self.__params):
             return self.__params[index]
         elif isinstance(index, str):
@@ -98,13 +107,10 @@ class ParameterList:
                 if param.name == index:
                     return param
         elif isinstance(index, Argument):
-            if index.is_positional:
-                param = self[index.position]
-            else:
-                param = self[index.name]
-            if param.data_type == index.data_type:
+            param = self.get(index.position if index.is_positional else index.name)
+            if param is not None and param.data_type == index.data_type:
                 return param
-        raise IndexError(f"No parameter found with the index '{index}'.")
+        return None
 
     def __len__(self) -> int:
         return len(self.__params)
@@ -0,0 +1,87 @@
+"""
+Tracks the files included during preprocessing so that files marked with `#pragma once`, or protected by an include
+guard whose macro is still defined, are skipped without being scanned or processed again.
+"""
+
+from pathlib import Path
+
+from .Directive import IF, IFDEF, IFNDEF, ELIF, ELSE, ENDIF, DEFINE
+from .macros import is_macro_defined
+from ..CompilerContext import get_context
+from ..Token import Token
+from ..token_types import IDENTIFIER, EOL
+
+
+def mark_included_once(file: Path) -> None:
+    get_context().once_files.add(file.resolve())
+
+
+def set_include_guard(file: Path, macro: str | None) -> None:
+    file = file.resolve()
+    include_guards = get_context().include_guards
+    if macro is None:
+        include_guards.pop(file, None)
+    else:
+        include_guards[file] = macro
+
+
+def skip_include(file: Path) -> bool:
+    """
+    Returns true if including file again would have no effect.
+    """
+    file = file.resolve()
+    context = get_context()
+    if file in context.once_files:
+        context.include_stats["skipped_pragma_once"] += 1
+        return True
+    if file in context.include_guards and is_macro_defined(context.include_guards[file]):
+        context.include_stats["skipped_include_guard"] += 1
+        return True
+    context.include_stats["included"] += 1
+    return False
+
+
+def find_include_guard(tokens: list[Token]) -> str | None:
+    """
+    Returns the guard macro if the tokens follow the include guard idiom:
+        #ifndef X
+        #define X
+        ...
+        #endif
+    """
+    tokens = [t for t in tokens if t != EOL]
+    if len(tokens) < 5:
+        return None
+    if tokens[0] != IFNDEF or tokens[1] != IDENTIFIER or tokens[2] != DEFINE or tokens[3] != IDENTIFIER:
+        return None
+    macro = tokens[1].lexeme
+    if tokens[3].lexeme != macro:
+        return None
+    # the #endif matching the #ifndef must be the last token and there must be no #else or #elif at the guards level
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token in [IF, IFDEF, IFNDEF]:
+            depth += 1
+        elif token in [ELIF, ELSE] and depth == 1:
+            return None
+        elif token == ENDIF:
+            depth -= 1
+            if depth == 0:
+                return macro if i == len(tokens) - 1 else None
+    return None
+
+
+def clear_includes() -> None:
+    context = get_context()
+    context.once_files.clear()
+    context.include_guards.clear()
+
+
+def get_include_stats() -> dict[str, int]:
+    return dict(get_context().include_stats)
+
+
+def reset_include_stats() -> None:
+    include_stats = get_context().include_stats
+    for key in include_stats:
+        include_stats[key] = 0
@@ -1,3 +1,4 @@
+from ..CompilerContext import get_context
 from ..Token import Token
 from ..scan import as_token
 
@@ -21,39 +22,47 @@ class Macro:
         return self.__value
 
 
-_macros: list[Macro] = []
-
-
 def define_macro(macro: str | Token | Macro) -> None:
     if isinstance(macro, str | Token):
         macro = Macro(macro)
-    if is_macro_defined(macro.identifier):
-        # TODO add warning when defining a defined macro
-        undefine_macro(macro.identifier)
-    _macros.append(macro)
+    # TODO add warning when defining a defined macro
+    get_context().macros[macro.identifier.lexeme] = macro
 
 
 def undefine_macro(identifier: str | Token) -> None:
-    identifier = as_token(identifier)
-    for macro in _macros:
-        if macro.identifier == identifier:
-            _macros.remove(macro)
-            return
     # TODO add warning when undefining an undefined macro
+    get_context().macros.pop(_name(identifier), None)
 
 
 def is_macro_defined(identifier: str | Token) -> bool:
-    identifier = as_token(identifier)
-    return identifier in [m.identifier for m in _macros]
+    return _name(identifier) in get_context().macros
 
 
 def replace_macro(identifier: str | Token) -> list[Token]:
-    identifier = as_token(identifier)
-    for macro in _macros:
-        if macro.identifier == identifier:
-            return macro.value
-    raise AssertionError()
+    macro = get_context().macros.get(_name(identifier))
+    if macro is None:
+        raise AssertionError()
+    return macro.value
+
+
+def expand_macro(token: Token) -> list[Token] | None:
+    """
+    Returns the tokens that token is replaced with if it is a defined macro, otherwise None. Macros are expanded when
+    they are defined, so this is a single lookup.
+    """
+    macro = get_context().macros.get(token.lexeme)
+    return None if macro is None else macro.value
 
 
 def undefine_all_macros() -> None:
-    _macros.clear()
+    get_context().macros.clear()
+
+
+def _name(identifier: str | Token) -> str:
+    """
+    Returns the key of a macro in the macro table, which is the lexeme of its identifier, so that tokens can be looked up
+    without tokenizing them again.
+    """
+    if isinstance(identifier, Token):
+        return identifier.lexeme
+    return as_token(identifier).lexeme
@@ -4,7 +4,6 @@ from ..CompileError import CompileError
 from ..Keyword import Keyword
 from ..Token import Token
 from ..TokenReader import TokenReader
-from ..token_types import INT_LITERAL, FLOAT_LITERAL, STRING_LITERAL, FILENAME_LITERAL
 
 
 def parse(tokens: list[Token]) -> Primitive:
@@ -82,8 +81,8 @@ class Parser(TokenReader):
             return self.__primary()
 
     def __primary(self) -> Expression:
-        if literal := self._consume(Keyword.TRUE, Keyword.FALSE, INT_LITERAL, FLOAT_LITERAL, STRING_LITERAL, FILENAME_LITERAL):
-            return LiteralExpression(literal)
+        if self._peek().is_literal:
+            return LiteralExpression(self._consume())
         if self._consume("("):
             expr = self.__expression()
             self._match(")")
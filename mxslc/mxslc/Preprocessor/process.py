@@ -1,11 +1,15 @@
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 from .Directive import DIRECTIVES, DEFINE, UNDEF, IF, IFDEF, IFNDEF, INCLUDE, PRAGMA, PRINT, ELIF, ELSE, ENDIF
-from .macros import Macro, define_macro, undefine_macro, is_macro_defined, replace_macro
+from .includes import skip_include, find_include_guard, set_include_guard, mark_included_once
+from .macros import Macro, define_macro, undefine_macro, is_macro_defined, expand_macro
 from .parse import parse
 from ..CompileError import CompileError
 from ..Token import Token
 from ..TokenReader import TokenReader
+from ..library import link_library
+from ..manifest import record_directory, record_missing
 from ..scan import scan
 from ..token_types import IDENTIFIER, EOL
 
@@ -16,29 +20,33 @@ from ..token_types import IDENTIFIER, EOL
 # this can lead to differences in behaviour
 
 
-def process(tokens: list[Token], include_dirs: list[Path], is_main: bool) -> list[Token]:
+def process(tokens: Iterable[Token], include_dirs: list[Path], is_main: bool) -> Iterator[Token]:
+    """
+    Returns the processed tokens as a stream, which reads and processes tokens, including the tokens of included files,
+    as they are needed.
+    """
     return Processor(tokens, include_dirs, is_main).process()
 
 
 class Processor(TokenReader):
-    def __init__(self, tokens: list[Token], include_dirs: list[Path], is_main: bool):
+    def __init__(self, tokens: Iterable[Token], include_dirs: list[Path], is_main: bool):
         super().__init__(tokens)
         self.__include_dirs = include_dirs
         self.__is_main = is_main
+        # true while the tokens of a branch that was not taken are being processed
+        self.__is_skipping = False
 
-    def process(self) -> list[Token]:
-        processed_tokens = []
+    def process(self) -> Iterator[Token]:
         self.__define_main()
         while self._reading_tokens():
-            processed_tokens.extend(self.__process_next())
-        return processed_tokens
+            yield from self.__process_next()
 
-    def __process_next(self) -> list[Token]:
-        if self._peek() in DIRECTIVES:
+    def __process_next(self) -> Iterable[Token]:
+        if self._peek().type in DIRECTIVES:
             return self.__process_directive()
         return self.__process_non_directive()
 
-    def __process_directive(self) -> list[Token]:
+    def __process_directive(self) -> Iterable[Token]:
         directive = self._peek()
         if directive == DEFINE:
             return self.__process_define()
@@ -71,17 +79,31 @@ class Processor(TokenReader):
         undefine_macro(identifier)
         return []
 
-    def __process_if(self) -> list[Token]:
-        branches = [self.__process_branch()]
-        while self._peek() in [ELIF, ELSE]:
-            branches.append(self.__process_branch())
+    def __process_if(self) -> Iterator[Token]:
+        # the directives in every branch are processed, but only the tokens of the first branch whose condition is true
+        # are kept, which are passed on as soon as they are processed
+        is_branch_taken = False
+        while True:
+            condition = self.__process_condition()
+            is_kept = condition and not is_branch_taken
+            is_branch_taken |= condition
+            if is_kept:
+                while self._peek() not in [ELIF, ELSE, ENDIF]:
+                    yield from self.__process_next()
+            else:
+                # processed for their side effects, such as defining macros, but files are not included and pragmas are
+                # ignored
+                was_skipping = self.__is_skipping
+                self.__is_skipping = True
+                while self._peek() not in [ELIF, ELSE, ENDIF]:
+                    for _ in self.__process_next():
+                        pass
+                self.__is_skipping = was_skipping
+            if self._peek() not in [ELIF, ELSE]:
+                break
         self._match(ENDIF)
-        for condition, tokens in branches:
-            if condition:
-                return tokens
-        return []
 
-    def __process_branch(self) -> tuple[bool, list[Token]]:
+    def __process_condition(self) -> bool:
         branch_type = self._match(IF, IFDEF, IFNDEF, ELIF, ELSE)
         if branch_type in [IF, ELIF]:
             condition_tokens = []
@@ -98,41 +120,64 @@ class Processor(TokenReader):
         else:
             condition = True
             self._match(EOL)
-        tokens = []
-        while self._peek() not in [ELIF, ELSE, ENDIF]:
-            tokens.extend(self.__process_next())
-        return condition, tokens
+        return condition
 
-    def __process_include(self) -> list[Token]:
+    def __process_include(self) -> Iterator[Token]:
         directive = self._match(INCLUDE)
+        if self.__is_skipping:
+            self.__skip_line()
+            return
         path_tokens = []
         while self._peek() != EOL:
             path_tokens.extend(self.__process_next())
         path_tokens.append(self._match(EOL))
         path = parse(path_tokens)
         included_files = self.__search_in_include_dirs(directive, path)
-        included_tokens = []
         for included_file in included_files:
-            included_tokens.extend(process(scan(included_file), self.__new_include_dirs(included_file.parent), is_main=False))
+            # the .mtlx file of a precompiled library is linked instead of being compiled
+            if included_file.suffix == ".mtlx":
+                link_library(included_file, directive)
+                continue
+            if skip_include(included_file):
+                continue
+            tokens = scan(included_file)
+            set_include_guard(included_file, find_include_guard(tokens))
+            yield from process(tokens, self.__new_include_dirs(included_file.parent), is_main=False)
         self.__define_main()
-        return included_tokens
 
     def __process_pragma(self) -> list[Token]:
-        # TODO implement pragma directives
+        directive = self._match(PRAGMA)
+        if self.__is_skipping:
+            self.__skip_line()
+            return []
+        pragma_tokens = []
+        while self._peek() != EOL:
+            pragma_tokens.append(self._consume())
+        self._match(EOL)
+        if len(pragma_tokens) == 1 and pragma_tokens[0].lexeme == "once":
+            if directive.file is not None:
+                mark_included_once(directive.file)
+        # TODO add warning for unknown pragmas
         return []
 
     def __process_print(self) -> list[Token]:
         # TODO implement print directive
         return []
 
-    def __process_non_directive(self) -> list[Token]:
+    def __process_non_directive(self) -> Iterable[Token]:
         token = self._consume()
         if token == EOL:
             return []
-        if is_macro_defined(token):
-            return replace_macro(token)
+        expansion = expand_macro(token)
+        if expansion is not None:
+            return expansion
         return [token]
 
+    def __skip_line(self) -> None:
+        while self._peek() != EOL:
+            self._consume()
+        self._match(EOL)
+
     def __define_main(self) -> None:
         if self.__is_main:
             define_macro("__MAIN__")
@@ -150,6 +195,7 @@ class Processor(TokenReader):
             if path.is_file():
                 return [path]
             if path.is_dir():
+                record_directory(path)
                 return list(path.glob("*.mxsl"))
 
         for include_dir in self.__include_dirs:
@@ -157,7 +203,10 @@ class Processor(TokenReader):
             if full_path.is_file():
                 return [full_path]
             if full_path.is_dir():
+                record_directory(full_path)
                 return list(full_path.glob("*.mxsl"))
+            # creating this file would change which file is included
+            record_missing(full_path)
 
         raise CompileError(f"File or directory not found: {path}.", token)
 
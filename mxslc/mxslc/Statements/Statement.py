@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 
 from ..Attribute import Attribute
 from ..DataType import DataType
-from ..mx_wrapper import Node
+from ..ir import Node
 
 
 class Statement(ABC):
@@ -4,7 +4,7 @@ from ..CompileError import CompileError
 from ..DataType import DataType, FLOAT, COLOR3, VECTOR3, BOOLEAN, SHADER_TYPES
 from ..Expressions import Expression, IfExpression, IdentifierExpression
 from ..Token import Token
-from ..mx_wrapper import Node
+from ..ir import Node
 from ..utils import type_of_swizzle, string
 
 
@@ -1,43 +1,36 @@
 from __future__ import annotations
+
+import sys
 from pathlib import Path
+from typing import Any, Callable
 
 from .Keyword import Keyword
 from .token_types import FLOAT_LITERAL, INT_LITERAL, STRING_LITERAL, FILENAME_LITERAL, IDENTIFIER
 
 
 class Token:
+    """
+    A token scanned from source code.
+
+    Tokens are equal to strings that match their type, and to other tokens with the same lexeme. Identifier and literal
+    tokens are hashed by their lexeme, so that tokens can be stored in sets and dicts without all of them colliding, and
+    other tokens are hashed by their type, so that they can be found in sets of keywords and token types. Sets of token
+    types containing the identifier or literal types should be checked against the type of the token instead.
+    """
+    __slots__ = ("__type", "__lexeme", "__file", "__line", "__value", "__hash", "__is_keyword", "__is_data_type", "__is_literal")
+
     def __init__(self, type_: str, lexeme: str = None, file: Path = None, line: int = None):
-        self.__type = type_
-        self.__lexeme = lexeme or type_
+        type_info = _TYPE_INFO.get(type_)
+        if type_info is None:
+            type_info = _TYPE_INFO[type_] = _type_info(type_)
+        self.__type, self.__is_keyword, self.__is_data_type, self.__is_literal, is_hashed_by_lexeme, parse_value = type_info
+        # lexemes are interned, so that they are usually compared by identity, except for literals, which rarely repeat
+        lexeme = str(lexeme or type_)
+        self.__lexeme = lexeme if self.__is_literal else sys.intern(lexeme)
         self.__file = file
         self.__line = line
-
-        # data type aliases
-        if self.__type == Keyword.BOOL:
-            self.__type = Keyword.BOOLEAN
-        if self.__type == Keyword.INT:
-            self.__type = Keyword.INTEGER
-        if self.__type == Keyword.VEC2:
-            self.__type = Keyword.VECTOR2
-        if self.__type == Keyword.VEC3:
-            self.__type = Keyword.VECTOR3
-        if self.__type == Keyword.VEC4:
-            self.__type = Keyword.VECTOR4
-
-        # parse value
-        self.__value = None
-        if self.__type == Keyword.TRUE:
-            self.__value = True
-        if self.__type == Keyword.FALSE:
-            self.__value = False
-        if self.__type == FLOAT_LITERAL:
-            self.__value = float(lexeme)
-        if self.__type == INT_LITERAL:
-            self.__value = int(lexeme)
-        if self.__type == STRING_LITERAL:
-            self.__value = lexeme.strip('"')
-        if self.__type == FILENAME_LITERAL:
-            self.__value = Path(lexeme.strip('"'))
+        self.__hash = hash(self.__lexeme if is_hashed_by_lexeme else self.__type)
+        self.__value = parse_value(self.__lexeme) if parse_value else None
 
     @property
     def type(self) -> str:
@@ -59,18 +52,69 @@ class Token:
     def line(self) -> int:
         return self.__line
 
+    @property
+    def is_keyword(self) -> bool:
+        return self.__is_keyword
+
+    @property
+    def is_data_type(self) -> bool:
+        return self.__is_data_type
+
+    @property
+    def is_literal(self) -> bool:
+        return self.__is_literal
+
     def __eq__(self, other: str | Token) -> bool:
         if isinstance(other, str):
-            return self.type == other
+            return self.__type == other
         if isinstance(other, Token):
-            return self.lexeme == other.lexeme
+            return self.__lexeme == other.__lexeme
         return False
 
     def __str__(self) -> str:
-        return self.lexeme
+        return self.__lexeme
 
     def __hash__(self) -> int:
-        return hash(self.type)
+        return self.__hash
+
+    def __reduce__(self) -> tuple:
+        # the hash is not pickled, because string hashes are different in every process
+        return Token, (self.__type, self.__lexeme, self.__file, self.__line)
+
+
+_ALIASES = {
+    Keyword.BOOL: Keyword.BOOLEAN,
+    Keyword.INT: Keyword.INTEGER,
+    Keyword.VEC2: Keyword.VECTOR2,
+    Keyword.VEC3: Keyword.VECTOR3,
+    Keyword.VEC4: Keyword.VECTOR4
+}
+
+_LITERAL_TYPES = frozenset({Keyword.TRUE, Keyword.FALSE, INT_LITERAL, FLOAT_LITERAL, STRING_LITERAL, FILENAME_LITERAL})
+
+_VALUE_PARSERS = {
+    Keyword.TRUE: lambda _: True,
+    Keyword.FALSE: lambda _: False,
+    FLOAT_LITERAL: float,
+    INT_LITERAL: int,
+    STRING_LITERAL: lambda lexeme: lexeme.strip('"'),
+    FILENAME_LITERAL: lambda lexeme: Path(lexeme.strip('"'))
+}
+
+
+def _type_info(type_: str) -> tuple[str, bool, bool, bool, bool, Callable[[str], Any] | None]:
+    """
+    Returns the type of the tokens of type_, after resolving aliases, whether they are keywords, data types, literals and
+    hashed by their lexeme, and the function that parses their value.
+    """
+    type_ = _ALIASES.get(type_, type_)
+    is_literal = type_ in _LITERAL_TYPES
+    return sys.intern(str(type_)), type_ in Keyword, type_ in Keyword.DATA_TYPES(), is_literal, is_literal or type_ == IDENTIFIER, _VALUE_PARSERS.get(type_)
+
+
+# tokens are classified by a single lookup of their type. other types, such as symbols and operators, are added the
+# first time they are seen
+_TYPE_INFO = {t: _type_info(t) for t in [*Keyword, *_LITERAL_TYPES, IDENTIFIER]}
 
 
 class IdentifierToken(Token):
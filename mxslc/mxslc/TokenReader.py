@@ -1,5 +1,6 @@
 from abc import ABC
-from collections.abc import Collection
+from collections import deque
+from collections.abc import Collection, Iterable
 
 from .CompileError import CompileError
 from .Keyword import Keyword
@@ -8,15 +9,20 @@ from .token_types import IDENTIFIER, STRING_LITERAL, FLOAT_LITERAL
 
 
 class TokenReader(ABC):
-    def __init__(self, tokens: list[Token]):
-        self.__tokens = tokens
-        self.__index = 0
+    """
+    Reads tokens from a list or a lazy stream of tokens. Only the tokens being peeked at are held, so tokens from a stream
+    are not produced until they are needed and can be discarded as soon as they have been consumed.
+    """
+    def __init__(self, tokens: Iterable[Token]):
+        self.__tokens = iter(tokens)
+        self.__lookahead: deque[Token] = deque()
+        self.__last_token: Token | None = None
 
     def _reading_tokens(self) -> bool:
         """
         Returns true if there are more tokens to read.
         """
-        return self.__index < len(self.__tokens)
+        return self.__fill(1)
 
     def _peek(self) -> Token:
         """
@@ -42,8 +48,8 @@ class TokenReader(ABC):
         """
         token_types = _flatten(token_types)
         token = self._peek()
-        if len(token_types) == 0 or token in token_types:
-            self.__index += 1
+        if len(token_types) == 0 or token.type in token_types:
+            self.__lookahead.popleft()
             return token
         return None
 
@@ -57,16 +63,28 @@ class TokenReader(ABC):
             return token
         # raise compile error if not a match
         token = self._peek()
-        if token in Keyword and token_types == [IDENTIFIER]:
+        if token.is_keyword and token_types == [IDENTIFIER]:
             msg = f"'{token.lexeme}' is a protected keyword and cannot be used as an identifier."
         else:
             msg = f"Expected {_format_tokens(token_types)}, but found '{token.lexeme}'."
         raise CompileError(on_fail or msg, fail_token or token)
 
     def __peek(self, future: int) -> Token:
-        if self.__index + future >= len(self.__tokens):
-            raise CompileError(f"Unexpected end of file.", self.__tokens[-1])
-        return self.__tokens[self.__index + future]
+        if not self.__fill(future + 1):
+            raise CompileError(f"Unexpected end of file.", self.__last_token)
+        return self.__lookahead[future]
+
+    def __fill(self, count: int) -> bool:
+        """
+        Reads tokens from the stream until count tokens can be peeked at. Returns false if the stream ends first.
+        """
+        while len(self.__lookahead) < count:
+            token = next(self.__tokens, None)
+            if token is None:
+                return False
+            self.__lookahead.append(token)
+            self.__last_token = token
+        return True
 
 
 def _flatten(token_types: tuple[str | Collection[str], ...]) -> list[str]:
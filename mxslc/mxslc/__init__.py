@@ -1,4 +1,6 @@
 from .compile_file import compile_file
+from .compile_library import compile_library
 from .Preprocessor.macros import Macro
+from .Optimization import Optimization
 from .Interactive.InteractiveCompiler import InteractiveCompiler
 from .Decompiler.decompile import decompile_file
@@ -1,28 +1,40 @@
+from itertools import chain
 from pathlib import Path
 
 from . import state
-from .Function import NodeGraphFunction
+from .CompilerContext import CompilerContext, get_context
 from .Preprocessor.process import process as preprocess
 from .file_utils import pkg_path
-from .mx_wrapper import Document
 from .parse import parse
-from .scan import scan
+from .scan import scan, iter_scan
+from .stdlib import get_standard_library_functions
 
 
-def compile_(source: str | Path, include_dirs: list[Path], is_main: bool) -> None:
-        tokens = scan(pkg_path(r"slxlib/slxlib_defs.mxsl")) + scan(source)
-        processed_tokens = preprocess(tokens, include_dirs, is_main=is_main)
-        statements = parse(processed_tokens)
-        _load_standard_library()
-        for statement in statements:
-            statement.execute()
+def compile_(source: str | Path, include_dirs: list[Path], is_main: bool, context: CompilerContext = None) -> None:
+    """
+    Compiles source into the document of context, or of the current context if no context is given.
+    """
+    if context is None or context is get_context():
+        _compile(source, include_dirs, is_main)
+    else:
+        with context:
+            _compile(source, include_dirs, is_main)
+
+
+def _compile(source: str | Path, include_dirs: list[Path], is_main: bool) -> None:
+    # tokens are streamed through the preprocessor into the parser, rather than being collected into lists between
+    # each stage
+    tokens = chain(scan(pkg_path(r"slxlib/slxlib_defs.mxsl")), iter_scan(source))
+    processed_tokens = preprocess(tokens, include_dirs, is_main=is_main)
+    statements = parse(processed_tokens)
+    _load_standard_library()
+    for statement in statements:
+        statement.execute()
 
 
 def _load_standard_library() -> None:
-    document = Document()
-    document.load_standard_library()
-    for nd in document.node_defs:
-        if not nd.is_default_version:
-            continue
-        function = NodeGraphFunction.from_node_def(nd)
-        state.add_function(function)
+    # the same state can be compiled into more than once (e.g., by the interactive compiler), but the cached functions
+    # should only be added to it once
+    for function in get_standard_library_functions():
+        if not state.has_function(function):
+            state.add_function(function)
@@ -1,15 +1,22 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Sequence
 
+import MaterialX as mx
+
 from . import state
 from .CompileError import CompileError
+from .CompilerContext import CompilerContext
+from .Optimization import Optimization
 from .Interactive.ShaderInterface import ShaderInterface
 from .Interactive.mx_interactive_types import Value
-from .Preprocessor.macros import undefine_all_macros, Macro, define_macro
+from .Preprocessor.macros import Macro, define_macro
 from .compile import compile_
-from .document import new_document, get_document
 from .file_utils import handle_input_path, handle_output_path
-from .mx_wrapper import Uniform
+from .library import add_library_definitions
+from .manifest import Dependencies, describe_options, is_up_to_date, write_manifest
+from .mx_wrapper import Document, Uniform
 from .post_process import post_process
 
 
@@ -21,23 +28,57 @@ def compile_file(mxsl_path: str | Path,
                  main_args: Sequence[Uniform] = None,
                  add_include_dirs: Sequence[Path] = None,
                  add_macros: Sequence[str | Macro] = None,
-                 validate=False) -> None:
+                 validate=False,
+                 optimizations: Sequence[str | Optimization] = None,
+                 jobs=1,
+                 incremental=False,
+                 xinclude_libraries=False) -> None:
     globals = globals or {}
     main_args = main_args or []
     add_include_dirs = add_include_dirs or []
     add_macros = add_macros or []
+    optimizations = sorted({Optimization(o) for o in optimizations or []})
 
     mxsl_filepaths = handle_input_path(mxsl_path)
+    mtlx_filepaths = [handle_output_path(mtlx_path, p) for p in mxsl_filepaths]
+    jobs = min(_handle_jobs(jobs), len(mxsl_filepaths))
 
-    for mxsl_filepath in mxsl_filepaths:
-        mtlx_filepath = handle_output_path(mtlx_path, mxsl_filepath)
+    if jobs == 1:
+        for mxsl_filepath, mtlx_filepath in zip(mxsl_filepaths, mtlx_filepaths):
+            result = _compile_file(mxsl_filepath, mtlx_filepath, globals, main_func, main_args, add_include_dirs, add_macros, validate, optimizations, incremental, xinclude_libraries)
+            print(result)
+    else:
+        _compile_files_in_parallel(mxsl_filepaths, mtlx_filepaths, globals, main_func, main_args, add_include_dirs, add_macros, validate, optimizations, incremental, xinclude_libraries, jobs)
 
-        undefine_all_macros()
-        new_document()
-        state.clear()
-        state.add_globals(globals)
 
-        include_dirs = add_include_dirs + [mxsl_filepath.parent, Path(".")]
+def _compile_file(mxsl_filepath: Path,
+                  mtlx_filepath: Path,
+                  globals: dict[str, Uniform],
+                  main_func: str | None,
+                  main_args: Sequence[Uniform],
+                  add_include_dirs: Sequence[Path],
+                  add_macros: Sequence[str | Macro],
+                  validate: bool,
+                  optimizations: list[Optimization],
+                  incremental: bool,
+                  xinclude_libraries: bool) -> str:
+    """
+    Compiles a single file and returns a message describing the result.
+    """
+    include_dirs = [*add_include_dirs, mxsl_filepath.parent, Path(".")]
+
+    if incremental:
+        options = describe_options(globals, main_func, main_args, include_dirs, add_macros, validate, optimizations, xinclude_libraries)
+        if is_up_to_date(mtlx_filepath, options):
+            return f"{mxsl_filepath.name} is up to date."
+
+    # every file is compiled in a new context, so files can also be compiled concurrently from different threads
+    with CompilerContext() as context:
+        context.optimizations = set(optimizations)
+        if incremental:
+            context.dependencies = Dependencies()
+
+        state.add_globals(globals)
 
         for macro in add_macros:
             define_macro(macro)
@@ -46,16 +87,99 @@ def compile_file(mxsl_path: str | Path,
         _call_main(mxsl_filepath, main_func, main_args)
         post_process()
 
-        if validate:
-            success, message = get_document().validate()
-            if not success:
-                message += "\n" + get_document().xml
-                raise CompileError(message)
+    document = Document(context.document.emit())
+    add_library_definitions(document, context.libraries.values(), mtlx_filepath, xinclude_libraries)
+
+    if validate:
+        success, message = document.validate()
+        if not success:
+            message += "\n" + document.xml
+            raise CompileError(message)
+
+    with open(mtlx_filepath, "w") as file:
+        file.write(document.xml)
+
+    if incremental:
+        write_manifest(mtlx_filepath, options, context.dependencies)
+
+    result = f"{mxsl_filepath.name} compiled successfully."
+    if context.dead_code_report is not None:
+        result += f" {context.dead_code_report}"
+    return result
+
+
+def _compile_files_in_parallel(mxsl_filepaths: list[Path],
+                               mtlx_filepaths: list[Path],
+                               globals: dict[str, Uniform],
+                               main_func: str | None,
+                               main_args: Sequence[Uniform],
+                               add_include_dirs: Sequence[Path],
+                               add_macros: Sequence[str | Macro],
+                               validate: bool,
+                               optimizations: list[Optimization],
+                               incremental: bool,
+                               xinclude_libraries: bool,
+                               jobs: int) -> None:
+    """
+    Compiles each file in a separate worker process. Every worker has its own compiler state and standard library
+    cache. Results are reported in input order and all failures are raised together once every file has been compiled.
+    """
+    # MaterialX values cannot be pickled, so they are sent to the workers as tuples
+    globals = {name: _pack_uniform(value) for name, value in globals.items()}
+    main_args = [_pack_uniform(value) for value in main_args]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_compile_packed_file, mxsl_filepath, mtlx_filepath, globals, main_func, main_args, add_include_dirs, add_macros, validate, optimizations, incremental, xinclude_libraries)
+            for mxsl_filepath, mtlx_filepath
+            in zip(mxsl_filepaths, mtlx_filepaths)
+        ]
+        errors: list[tuple[Path, Exception]] = []
+        for mxsl_filepath, future in zip(mxsl_filepaths, futures):
+            if error := future.exception():
+                errors.append((mxsl_filepath, error))
+            else:
+                print(future.result())
+    if len(errors) == 1:
+        raise errors[0][1]
+    if len(errors) > 1:
+        message = f"{len(errors)} of {len(mxsl_filepaths)} files failed to compile:\n"
+        message += "\n".join([f"{file.name}: {error}" for file, error in errors])
+        raise CompileError(message)
+
+
+def _compile_packed_file(mxsl_filepath: Path,
+                         mtlx_filepath: Path,
+                         globals: dict[str, Uniform],
+                         main_func: str | None,
+                         main_args: Sequence[Uniform],
+                         add_include_dirs: Sequence[Path],
+                         add_macros: Sequence[str | Macro],
+                         validate: bool,
+                         optimizations: list[Optimization],
+                         incremental: bool,
+                         xinclude_libraries: bool) -> str:
+    globals = {name: _unpack_uniform(value) for name, value in globals.items()}
+    main_args = [_unpack_uniform(value) for value in main_args]
+    return _compile_file(mxsl_filepath, mtlx_filepath, globals, main_func, main_args, add_include_dirs, add_macros, validate, optimizations, incremental, xinclude_libraries)
+
+
+def _handle_jobs(jobs: int | None) -> int:
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _pack_uniform(value: Uniform) -> Uniform | tuple[str, tuple[float, ...]]:
+    if isinstance(value, mx.Vector2 | mx.Vector3 | mx.Vector4 | mx.Color3 | mx.Color4):
+        return type(value).__name__, value.asTuple()
+    return value
 
-        with open(mtlx_filepath, "w") as file:
-            file.write(get_document().xml)
 
-        print(f"{mxsl_filepath.name} compiled successfully.")
+def _unpack_uniform(value: Uniform | tuple[str, tuple[float, ...]]) -> Uniform:
+    if isinstance(value, tuple):
+        type_name, values = value
+        return getattr(mx, type_name)(*values)
+    return value
 
 
 def _call_main(file: Path, name: str | None, args: Sequence[Value]) -> None:
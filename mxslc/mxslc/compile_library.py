@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Sequence
+
+from .CompileError import CompileError
+from .CompilerContext import CompilerContext
+from .Optimization import Optimization
+from .Preprocessor.macros import Macro, define_macro
+from .compile import compile_
+from .file_utils import handle_input_path, handle_output_path
+from .library import exported_functions, write_signatures, add_library_definitions
+from .mx_wrapper import Document
+from .post_process import post_process
+
+
+def compile_library(mxsl_path: str | Path,
+                    mtlx_path: str | Path = None,
+                    *,
+                    add_include_dirs: Sequence[Path] = None,
+                    add_macros: Sequence[str | Macro] = None,
+                    validate=False,
+                    optimizations: Sequence[str | Optimization] = None,
+                    xinclude_libraries=False) -> None:
+    """
+    Compiles the functions of an .mxsl file into a library that other files can link against, see library.py.
+    """
+    add_include_dirs = add_include_dirs or []
+    add_macros = add_macros or []
+    optimizations = sorted({Optimization(o) for o in optimizations or []})
+
+    for mxsl_filepath in handle_input_path(mxsl_path):
+        mtlx_filepath = handle_output_path(mtlx_path, mxsl_filepath)
+        _compile_library(mxsl_filepath, mtlx_filepath, add_include_dirs, add_macros, validate, optimizations, xinclude_libraries)
+        print(f"{mxsl_filepath.name} compiled successfully into a library.")
+
+
+def _compile_library(mxsl_filepath: Path,
+                     mtlx_filepath: Path,
+                     add_include_dirs: Sequence[Path],
+                     add_macros: Sequence[str | Macro],
+                     validate: bool,
+                     optimizations: list[Optimization],
+                     xinclude_libraries: bool) -> None:
+    include_dirs = [*add_include_dirs, mxsl_filepath.parent, Path(".")]
+
+    with CompilerContext() as context:
+        context.optimizations = set(optimizations)
+
+        for macro in add_macros:
+            define_macro(macro)
+
+        # libraries are compiled the same way as a file that is included by another file
+        compile_(mxsl_filepath, include_dirs, is_main=False)
+        for node in context.document.get_nodes():
+            raise CompileError(f"Libraries can only declare functions, but '{node.name}' is declared outside of a function in {mxsl_filepath.name}.")
+        functions = exported_functions()
+        post_process()
+
+    document = Document(context.document.emit())
+    add_library_definitions(document, context.libraries.values(), mtlx_filepath, xinclude_libraries)
+
+    if validate:
+        success, message = document.validate()
+        if not success:
+            message += "\n" + document.xml
+            raise CompileError(message)
+
+    with open(mtlx_filepath, "w") as file:
+        file.write(document.xml)
+    write_signatures(mtlx_filepath, functions)
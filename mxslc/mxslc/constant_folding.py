@@ -0,0 +1,228 @@
+"""
+Evaluates standard library math nodes whose inputs are all literals.
+
+Values are evaluated as lists of components, so one function covers the float, integer, vector and color variants of a
+node, as well as the variants that take a float for one of their inputs. Missing inputs take the default values of the
+matching standard library nodedef. A node is only folded if its result can be represented exactly as the value of its
+output type, so operations that would produce NaN, infinity or a fractional integer are left in the graph.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from threading import Lock
+from typing import Callable
+from weakref import WeakKeyDictionary
+
+import MaterialX as mx
+
+from .DataType import DataType, BOOLEAN, INTEGER, FLOAT, VECTOR2, VECTOR3, VECTOR4, COLOR3, COLOR4
+from .ir import Node
+from .mx_wrapper import Uniform
+from .stdlib import StandardLibrary
+
+
+type Components = list[float | int | bool]
+type Evaluator = Callable[[dict[str, Components]], Components]
+
+
+def evaluate(node: Node, library: StandardLibrary) -> Uniform | None:
+    """
+    Returns the value that node evaluates to, or None if it cannot be evaluated at compile time. Missing inputs take the
+    default values of the nodedefs in library.
+    """
+    evaluator = _EVALUATORS.get(node.category)
+    if evaluator is None or node.data_type not in _VALUE_TYPES:
+        return None
+    inputs = _literal_inputs(node, library)
+    if inputs is None:
+        return None
+    try:
+        result = evaluator(inputs)
+    except (ArithmeticError, ValueError, KeyError):
+        return None
+    if node.category == "convert" and len(result) == 1:
+        # scalars are converted to every component of the output
+        result = result * _VALUE_TYPES[node.data_type]
+    return _to_value(result, node.data_type)
+
+
+def foldable_categories() -> set[str]:
+    return set(_EVALUATORS)
+
+
+#
+#   inputs and outputs
+#
+
+
+def _literal_inputs(node: Node, library: StandardLibrary) -> dict[str, Components] | None:
+    input_types = frozenset((i.name, str(i.data_type)) for i in node.inputs)
+    defaults = _node_def_defaults(library, node.category, str(node.data_type), input_types)
+    if defaults is None:
+        return None
+    inputs = dict(defaults)
+    for input_ in node.inputs:
+        if not input_.has_literal:
+            return None
+        inputs[input_.name] = _components(input_.literal)
+    if any(v is None for v in inputs.values()):
+        return None
+    return inputs
+
+
+def _node_def_defaults(library: StandardLibrary, category: str, data_type: str, input_types: frozenset[tuple[str, str]]) -> dict[str, Components | None] | None:
+    """
+    Returns the default input values of the standard library nodedef that a node with the given inputs is an instance
+    of. Inputs without a default value, such as those with a default geometric property, map to None. The defaults are
+    cached per library, so they are discarded along with it.
+    """
+    key = (category, data_type, input_types)
+    with _lock:
+        defaults = _node_def_defaults_cache.setdefault(library, {})
+        if key not in defaults:
+            defaults[key] = _find_node_def_defaults(library, category, data_type, input_types)
+        return defaults[key]
+
+
+def _find_node_def_defaults(library: StandardLibrary, category: str, data_type: str, input_types: frozenset[tuple[str, str]]) -> dict[str, Components | None] | None:
+    for node_def in library.document.source.getMatchingNodeDefs(category):
+        if node_def.getType() != data_type:
+            continue
+        nd_inputs = {i.getName(): i for i in node_def.getActiveInputs()}
+        if all(name in nd_inputs and nd_inputs[name].getType() == t for name, t in input_types):
+            return {name: _components(i.getValue()) for name, i in nd_inputs.items()}
+    return None
+
+
+def _components(value: Uniform | None) -> Components | None:
+    if isinstance(value, (bool, int, float)):
+        return [value]
+    if isinstance(value, (mx.Vector2, mx.Vector3, mx.Vector4, mx.Color3, mx.Color4)):
+        return list(value)
+    return None
+
+
+def _to_value(components: Components, data_type: DataType) -> Uniform | None:
+    if len(components) != _VALUE_TYPES[data_type]:
+        return None
+    if data_type == BOOLEAN:
+        return components[0] if isinstance(components[0], bool) else None
+    if any(isinstance(c, bool) or not math.isfinite(c) for c in components):
+        return None
+    if data_type == INTEGER:
+        return int(components[0]) if float(components[0]).is_integer() else None
+    if data_type == FLOAT:
+        return float(components[0])
+    return _VALUE_CONSTRUCTORS[data_type](*[float(c) for c in components])
+
+
+_node_def_defaults_cache: WeakKeyDictionary[StandardLibrary, dict[tuple, dict[str, Components | None] | None]] = WeakKeyDictionary()
+_lock = Lock()
+
+_VALUE_TYPES = {BOOLEAN: 1, INTEGER: 1, FLOAT: 1, VECTOR2: 2, VECTOR3: 3, VECTOR4: 4, COLOR3: 3, COLOR4: 4}
+_VALUE_CONSTRUCTORS = {VECTOR2: mx.Vector2, VECTOR3: mx.Vector3, VECTOR4: mx.Vector4, COLOR3: mx.Color3, COLOR4: mx.Color4}
+
+
+#
+#   evaluators
+#
+
+
+def _map(function: Callable, *names: str) -> Evaluator:
+    """
+    Applies function to each component of the named inputs, repeating single component inputs to match the others.
+    """
+    def evaluator(inputs: dict[str, Components]) -> Components:
+        args = [inputs[n] for n in names]
+        size = max(len(a) for a in args)
+        if any(len(a) not in [1, size] for a in args):
+            raise ValueError
+        return [function(*[a[i] if len(a) > 1 else a[0] for a in args]) for i in range(size)]
+    return evaluator
+
+
+def _condition(compare: Callable) -> Evaluator:
+    def evaluator(inputs: dict[str, Components]) -> Components:
+        condition = compare(inputs["value1"][0], inputs["value2"][0])
+        # the boolean variants return the result of the comparison
+        if "in1" not in inputs:
+            return [condition]
+        return inputs["in1"] if condition else inputs["in2"]
+    return evaluator
+
+
+def _modulo(x: float, y: float) -> float:
+    return x - y * math.floor(x / y)
+
+
+def _sign(x: float) -> float:
+    return type(x)((x > 0) - (x < 0))
+
+
+def _convert(inputs: dict[str, Components]) -> Components:
+    return [int(c) if isinstance(c, bool) else c for c in inputs["in"]]
+
+
+def _magnitude(inputs: dict[str, Components]) -> Components:
+    return [math.sqrt(sum(c * c for c in inputs["in"]))]
+
+
+def _normalize(inputs: dict[str, Components]) -> Components:
+    magnitude = _magnitude(inputs)[0]
+    return [c / magnitude for c in inputs["in"]]
+
+
+def _dot_product(inputs: dict[str, Components]) -> Components:
+    return [sum(_map(operator.mul, "in1", "in2")(inputs))]
+
+
+def _distance(inputs: dict[str, Components]) -> Components:
+    return _magnitude({"in": _map(operator.sub, "in1", "in2")(inputs)})
+
+
+def _cross_product(inputs: dict[str, Components]) -> Components:
+    (ax, ay, az), (bx, by, bz) = inputs["in1"], inputs["in2"]
+    return [ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx]
+
+
+_EVALUATORS: dict[str, Evaluator] = {
+    "add": _map(operator.add, "in1", "in2"),
+    "subtract": _map(operator.sub, "in1", "in2"),
+    "multiply": _map(operator.mul, "in1", "in2"),
+    "divide": _map(operator.truediv, "in1", "in2"),
+    "modulo": _map(_modulo, "in1", "in2"),
+    "power": _map(math.pow, "in1", "in2"),
+    "sin": _map(math.sin, "in"),
+    "cos": _map(math.cos, "in"),
+    "tan": _map(math.tan, "in"),
+    "asin": _map(math.asin, "in"),
+    "acos": _map(math.acos, "in"),
+    "atan2": _map(math.atan2, "iny", "inx"),
+    "sqrt": _map(math.sqrt, "in"),
+    "ln": _map(math.log, "in"),
+    "exp": _map(math.exp, "in"),
+    "absval": _map(abs, "in"),
+    "sign": _map(_sign, "in"),
+    "floor": _map(math.floor, "in"),
+    "ceil": _map(math.ceil, "in"),
+    "min": _map(min, "in1", "in2"),
+    "max": _map(max, "in1", "in2"),
+    "clamp": _map(lambda x, low, high: min(max(x, low), high), "in", "low", "high"),
+    "mix": _map(lambda fg, bg, t: bg * (1.0 - t) + fg * t, "fg", "bg", "mix"),
+    "invert": _map(lambda x, amount: amount - x, "in", "amount"),
+    "ifgreater": _condition(operator.gt),
+    "ifgreatereq": _condition(operator.ge),
+    "ifequal": _condition(operator.eq),
+    "and": _map(lambda a, b: a and b, "in1", "in2"),
+    "or": _map(lambda a, b: a or b, "in1", "in2"),
+    "xor": _map(operator.ne, "in1", "in2"),
+    "not": _map(operator.not_, "in"),
+    "convert": _convert,
+    "magnitude": _magnitude,
+    "normalize": _normalize,
+    "dotproduct": _dot_product,
+    "distance": _distance,
+    "crossproduct": _cross_product,
+}
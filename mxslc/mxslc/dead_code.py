@@ -0,0 +1,146 @@
+"""
+Removes the parts of a document that do not contribute to its shaders and materials.
+
+Nodes are kept if they are upstream of a root, which are shader and material nodes and outputs in the document, the
+outputs of used nodegraphs and any node given the keep attribute (@keep "true"). Nodegraphs, and their nodedefs, are
+used if a kept node is an instance of them.
+
+Nodedef inputs that are not read by the nodegraph are only removed by the separate unused_inputs optimization, because
+it changes the signature of the nodedef. They are removed together with the matching inputs of every instance, used or
+not, which can in turn leave more nodes unused.
+
+A document without any roots, such as a file that only declares functions, is treated as a library. Its nodedefs and
+top-level nodes are all kept and only the nodes inside nodegraphs are removed.
+"""
+
+from __future__ import annotations
+
+from .DataType import SHADER_TYPES, MATERIAL
+from .ir import Document, GraphElement, Node, NodeDef, NodeGraph
+
+
+KEEP_ATTRIBUTE = "keep"
+
+
+class DeadCodeReport:
+    """
+    Counts of the elements removed from a document.
+    """
+    def __init__(self):
+        self.nodes = 0
+        self.inputs = 0
+        self.node_graphs = 0
+        self.node_defs = 0
+
+    def __str__(self) -> str:
+        return (f"Removed {self.nodes} unused nodes, {self.inputs} unused inputs, {self.node_graphs} unused nodegraphs "
+                f"and {self.node_defs} unused nodedefs.")
+
+
+def eliminate_dead_code(document: Document, remove_dead_code=True, remove_unused_inputs=False) -> DeadCodeReport:
+    return DeadCodeEliminator(document, remove_dead_code, remove_unused_inputs).eliminate()
+
+
+class DeadCodeEliminator:
+    def __init__(self, document: Document, remove_dead_code: bool, remove_unused_inputs: bool):
+        self.__document = document
+        self.__remove_dead_code = remove_dead_code
+        self.__remove_unused_inputs = remove_unused_inputs
+        self.__node_graphs: dict[NodeDef, NodeGraph] = {g.node_def: g for g in document.node_graphs if g.node_def is not None}
+        self.__node_defs: dict[str, list[NodeDef]] = {}
+        for node_def in document.node_defs:
+            self.__node_defs.setdefault(node_def.node_string, []).append(node_def)
+        self.__is_library = len(_roots(document)) == 0
+        self.__report = DeadCodeReport()
+
+    def eliminate(self) -> DeadCodeReport:
+        live_nodes, live_node_defs = self.__mark()
+        # removing unused inputs disconnects their upstream nodes, so marking is repeated until nothing else is removed
+        while self.__remove_unused_inputs and not self.__is_library and self.__remove_inputs(live_nodes, live_node_defs):
+            live_nodes, live_node_defs = self.__mark()
+        if not self.__remove_dead_code:
+            return self.__report
+        for graph in [self.__document, *self.__document.node_graphs]:
+            for node in graph.get_nodes():
+                if node not in live_nodes:
+                    node.remove()
+                    self.__report.nodes += 1
+        if not self.__is_library:
+            for node_def in self.__document.node_defs:
+                if node_def not in live_node_defs:
+                    if node_def in self.__node_graphs:
+                        self.__node_graphs[node_def].remove()
+                        self.__report.node_graphs += 1
+                    node_def.remove()
+                    self.__report.node_defs += 1
+        return self.__report
+
+    def __mark(self) -> tuple[set[Node], set[NodeDef]]:
+        """
+        Returns every node upstream of a root and the nodedefs that they are instances of.
+        """
+        live_nodes: set[Node] = set()
+        live_node_defs: set[NodeDef] = set()
+        if self.__is_library:
+            live_node_defs.update(self.__node_graphs)
+            stack = [*self.__document.get_nodes(), *[n for g in self.__node_graphs.values() for n in _roots(g)]]
+        else:
+            # nodegraphs that do not implement a nodedef can not be instantiated, so they are always used
+            stack = [n for g in self.__document.node_graphs if g.node_def is None for n in _roots(g)]
+            stack += _roots(self.__document)
+        while stack:
+            node = stack.pop()
+            if node in live_nodes:
+                continue
+            live_nodes.add(node)
+            for input_ in node.inputs:
+                if input_.connected_node is not None:
+                    stack.append(input_.connected_node)
+            for node_def in self.__node_defs.get(node.category, []):
+                if node_def not in live_node_defs:
+                    live_node_defs.add(node_def)
+                    if node_def in self.__node_graphs:
+                        stack.extend(_roots(self.__node_graphs[node_def]))
+        return live_nodes, live_node_defs
+
+    def __remove_inputs(self, live_nodes: set[Node], live_node_defs: set[NodeDef]) -> bool:
+        """
+        Removes the inputs of used nodedefs that their nodegraph does not read. Returns true if any were removed.
+        """
+        # unused nodes are only discounted if they are removed afterwards, otherwise the document has to stay valid
+        reading_nodes = live_nodes if self.__remove_dead_code else None
+        removed = False
+        for node_string, node_defs in self.__node_defs.items():
+            # instances are only matched to their nodedef by category, so overloaded nodedefs are left as they are
+            if len(node_defs) != 1 or node_defs[0] not in live_node_defs or node_defs[0] not in self.__node_graphs:
+                continue
+            node_def = node_defs[0]
+            used_names = _interface_names(self.__node_graphs[node_def], reading_nodes)
+            instances = [n for g in [self.__document, *self.__document.node_graphs] for n in g.get_nodes()
+                         if n.category == node_string]
+            for input_ in node_def.inputs:
+                if input_.name not in used_names:
+                    for node in instances:
+                        if node.has_input(input_.name):
+                            node.remove_input(input_.name)
+                    node_def.remove_input(input_.name)
+                    self.__report.inputs += 1
+                    removed = True
+        return removed
+
+
+def _roots(graph: GraphElement) -> list[Node]:
+    roots = [o.connected_node for o in graph.outputs if o.connected_node is not None]
+    for node in graph.get_nodes():
+        if node.get_attribute(KEEP_ATTRIBUTE) == "true":
+            roots.append(node)
+        # inside a nodegraph, shader and material nodes are only used if they are upstream of its outputs
+        elif isinstance(graph, Document) and (node.data_type in SHADER_TYPES or node.data_type == MATERIAL):
+            roots.append(node)
+    return roots
+
+
+def _interface_names(node_graph: NodeGraph, live_nodes: set[Node] | None) -> set[str]:
+    nodes = [n for n in node_graph.get_nodes() if live_nodes is None or n in live_nodes]
+    ports = [i for n in nodes for i in n.inputs] + node_graph.outputs
+    return {p.interface_name for p in ports if p.interface_name is not None}
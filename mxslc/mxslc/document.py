@@ -1,4 +1,5 @@
-from .mx_wrapper import Document
+from .CompilerContext import get_context
+from .ir import Document
 
 
 """
@@ -6,13 +7,9 @@ The document being written to during compilation.
 """
 
 
-_document = Document()
+def get_document() -> Document:
+    return get_context().document
 
 
-def get_document():
-    return _document
-
-
-def new_document():
-    global _document
-    _document = Document()
+def new_document() -> None:
+    get_context().document = Document()
@@ -12,7 +12,7 @@ def handle_input_path(input_path: str | Path, extension=".mxsl") -> list[Path]:
     if input_path.is_file():
         return [input_path]
     if input_path.is_dir():
-        input_filepaths = list(input_path.glob(f"*{extension}"))
+        input_filepaths = sorted(input_path.glob(f"*{extension}"))
         if len(input_filepaths) == 0:
             raise FileNotFoundError(f"No {extension} files found in directory: '{input_path}'.")
         return input_filepaths
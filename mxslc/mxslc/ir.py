@@ -0,0 +1,852 @@
+"""
+In-memory representation of the document being compiled.
+
+Statements and expressions build nodedefs, nodegraphs and nodes in this representation instead of calling into the
+MaterialX Python API for every node, input and name lookup. Post-processing runs on it as well, and a MaterialX document
+is only created from it once, by Document.emit, when the result is validated or written. The classes provide the same
+interface as the wrappers in mx_wrapper, which are still used to read existing documents such as the standard library.
+"""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+import MaterialX as mx
+
+from . import mx_wrapper
+from .DataType import DataType, VOID
+from .Keyword import Keyword
+from .mx_wrapper import Uniform
+
+
+#
+#   Type Definitions
+#
+
+
+type Value = Node | Output | Uniform | None
+
+
+# every element is numbered when it is added to its parent, so that it keeps its position when it is renamed
+_next_index = count().__next__
+
+
+#
+#   Element
+#
+
+
+class Element:
+    __slots__ = ("_parent", "_name", "_index", "_attributes")
+
+    def __init__(self, parent: InterfaceElement | None, name: str | None):
+        self._parent = parent
+        self._name = name
+        self._index = _next_index()
+        self._attributes: dict[str, Any] = {}
+
+    @property
+    #virtualmethod
+    def category(self) -> str:
+        ...
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def parent(self) -> InterfaceElement | None:
+        return self._parent
+
+    @property
+    def name_path(self) -> str:
+        if self._parent is None or self._parent._parent is None:
+            return self._name
+        return f"{self._parent.name_path}/{self._name}"
+
+    def get_attribute(self, name: str) -> str:
+        return str(self._attributes.get(name, ""))
+
+    def set_attribute(self, name: str, value: str) -> None:
+        self._attributes[name] = value
+
+    def remove_attribute(self, name: str) -> None:
+        self._attributes.pop(name, None)
+
+    def _emit_attributes(self, source: mx.Element) -> None:
+        for name, value in self._attributes.items():
+            source.setAttribute(name, str(value))
+
+
+#
+#   Typed Element
+#
+
+
+class TypedElement(Element):
+    __slots__ = ("_type",)
+
+    def __init__(self, parent: InterfaceElement | None, name: str | None, data_type: str | None):
+        super().__init__(parent, name)
+        self._type = data_type
+
+    @property
+    def data_type(self) -> DataType:
+        return DataType(self._type)
+
+    @data_type.setter
+    def data_type(self, data_type: DataType | str) -> None:
+        self._type = str(data_type)
+
+    @property
+    def data_size(self) -> int:
+        return self.data_type.size
+
+
+#
+#   Interface Element
+#
+
+
+class InterfaceElement(TypedElement):
+    __slots__ = ("_children", "__taken_suffixes")
+
+    def __init__(self, parent: InterfaceElement | None, name: str | None, data_type: str | None):
+        super().__init__(parent, name, data_type)
+        self._children: dict[str, Element] = {}
+        # for each name prefix, a range of numbers [first, end) whose names are known to be taken, so that names which
+        # are used over and over again, e.g., variables in unrolled loops, do not have to search through every number
+        self.__taken_suffixes: dict[str, tuple[int, int]] = {}
+
+    @property
+    def is_default_version(self) -> bool:
+        return True
+
+    def create_valid_child_name(self, name: str) -> str:
+        # the same names that MaterialX would create, which is the first name that is not taken when repeatedly
+        # incrementing the number at the end of the name
+        name = mx.createValidName(name)
+        if name not in self._children:
+            return name
+        prefix, number = _split_name(name)
+        first, end = self.__taken_suffixes.get(prefix, (0, 0))
+        number += 1
+        if first <= number <= end:
+            number = end
+        else:
+            first = number
+        while f"{prefix}{number}" in self._children:
+            number += 1
+        self.__taken_suffixes[prefix] = (first, number)
+        return f"{prefix}{number}"
+
+    def get_child(self, name: str) -> Element | None:
+        return self._children.get(name)
+
+    def has_input(self, name: str) -> bool:
+        return isinstance(self._children.get(name), Input)
+
+    def add_input(self, name: str, value: Value = None, data_type: DataType = None) -> Input:
+        assert not self.has_input(name)
+        assert value is not None or data_type is not None
+        if value is not None and data_type is not None:
+            assert type_of(value) == data_type
+        name = self.create_valid_child_name(name)
+        input_ = Input(self, name, str(data_type or type_of(value)))
+        self._add_child(input_)
+        if value is not None:
+            input_.value = value
+        else:
+            input_.value = data_type.default()
+        return input_
+
+    def get_input(self, name: str) -> Input:
+        assert self.has_input(name), self.name
+        return self._children[name]
+
+    @property
+    def inputs(self) -> list[Input]:
+        return [c for c in self._children.values() if isinstance(c, Input)]
+
+    @property
+    def input_count(self) -> int:
+        return len(self.inputs)
+
+    def set_input(self, name: str, value: Value) -> Input:
+        if self.has_input(name):
+            input_ = self.get_input(name)
+            input_.value = value
+        else:
+            assert value is not None
+            input_ = self.add_input(name, value)
+        return input_
+
+    def remove_input(self, name: str) -> None:
+        assert self.has_input(name)
+        self._pop_child(name)
+
+    def has_output(self, name: str) -> bool:
+        return isinstance(self._children.get(name), Output)
+
+    def add_output(self, name: str, value: Value = None, data_type: DataType = None) -> Output:
+        assert not self.has_output(name)
+        assert value is not None or data_type is not None
+        if value is not None and data_type is not None:
+            assert type_of(value) == data_type
+        name = self.create_valid_child_name(name)
+        output = Output(self, name, str(data_type or type_of(value)))
+        self._add_child(output)
+        if value is not None:
+            output.value = value
+        else:
+            output.value = data_type.default()
+        return output
+
+    def get_output(self, name: str = None) -> Output:
+        if name is None:
+            if self.output_count == 1:
+                return self.outputs[0]
+            if self.has_output("out"):
+                return self.get_output("out")
+            raise AssertionError(self.name)
+        assert self.has_output(name), self.name
+        return self._children[name]
+
+    @property
+    def output(self) -> Output:
+        return self.get_output()
+
+    @property
+    def outputs(self) -> list[Output]:
+        return [c for c in self._children.values() if isinstance(c, Output)]
+
+    @property
+    def output_count(self) -> int:
+        return len(self.outputs)
+
+    def set_output(self, name: str, value: Value) -> Output:
+        if self.has_output(name):
+            output = self.get_output(name)
+            output.value = value
+        else:
+            assert value is not None
+            output = self.add_output(name, value)
+        return output
+
+    def remove_output(self, name: str) -> None:
+        assert self.has_output(name)
+        self._pop_child(name)
+
+    def _add_child(self, child: Element) -> None:
+        assert child.name not in self._children
+        child._index = _next_index()
+        self._children[child.name] = child
+
+    def _rename_child(self, child: Element, name: str) -> None:
+        name = self.create_valid_child_name(name)
+        self._pop_child(child.name)
+        child._name = name
+        self._children[name] = child
+
+    def _remove_child(self, child: Element) -> None:
+        # removing an element that has already been removed does nothing, the same as in MaterialX
+        if self._children.get(child.name) is child:
+            self._pop_child(child.name)
+
+    def _pop_child(self, name: str) -> None:
+        del self._children[name]
+        prefix, number = _split_name(name)
+        first, end = self.__taken_suffixes.get(prefix, (0, 0))
+        if first <= number < end:
+            self.__taken_suffixes[prefix] = (first, number)
+
+    def _ordered_children(self) -> list[Element]:
+        return sorted(self._children.values(), key=_index_of)
+
+
+#
+#   Graph Element
+#
+
+
+class GraphElement(InterfaceElement):
+    __slots__ = ("__free_node_indices", "__next_node_index")
+
+    def __init__(self, parent: InterfaceElement | None, name: str | None, data_type: str | None):
+        super().__init__(parent, name, data_type)
+        # new nodes are named node1, node2, etc., using the lowest number that is not taken, the same as MaterialX does.
+        # numbers below the next node index are only free if they are in the free node indices.
+        self.__free_node_indices: list[int] = []
+        self.__next_node_index = 1
+
+    def add_node(self, category: str, data_type: DataType | str) -> Node:
+        node = Node(self, category, self._create_node_name(), str(data_type))
+        self._add_child(node)
+        return node
+
+    def remove_node(self, name: str) -> None:
+        if isinstance(self._children.get(name), Node):
+            self._pop_child(name)
+
+    def get_nodes(self, category="") -> list[Node]:
+        return [c for c in self._ordered_children() if isinstance(c, Node) and (not category or c.category == category)]
+
+    def _create_node_name(self) -> str:
+        while self.__free_node_indices:
+            # indices are not removed from the free list when their name is taken by something other than a new node
+            name = f"node{heappop(self.__free_node_indices)}"
+            if name not in self._children:
+                return name
+        while f"node{self.__next_node_index}" in self._children:
+            self.__next_node_index += 1
+        self.__next_node_index += 1
+        return f"node{self.__next_node_index - 1}"
+
+    def _pop_child(self, name: str) -> None:
+        super()._pop_child(name)
+        if name.startswith("node") and name[4:].isdigit() and name[4] != "0":
+            index = int(name[4:])
+            if index < self.__next_node_index:
+                heappush(self.__free_node_indices, index)
+
+    def _emit_children(self, source: mx.GraphElement) -> None:
+        for child in self._ordered_children():
+            child._emit(source)
+
+
+#
+#   Port Element
+#
+
+
+class PortElement(TypedElement):
+    """
+    An input or output. Connections are stored as references to the connected node, which are only turned into names
+    when the document is emitted.
+    """
+    __slots__ = ()
+
+    @property
+    def is_output(self) -> bool:
+        return isinstance(self, Output)
+
+    @property
+    def connected_output(self) -> Output | None:
+        output = self._attributes.get("output")
+        node = self._attributes.get("nodename")
+        if output is None or node is None or not node.has_output(output):
+            return None
+        return node.get_output(output)
+
+    @property
+    def connected_node(self) -> Node | None:
+        return self._attributes.get("nodename")
+
+    @property
+    def literal(self) -> Uniform | None:
+        return self._attributes.get("value")
+
+    @property
+    def has_literal(self) -> bool:
+        return self.literal is not None
+
+    @property
+    def value(self) -> Value:
+        return self.connected_output or self.connected_node or self.literal
+
+    @value.setter
+    def value(self, value: Value) -> None:
+        # outputs are read back as nodes during compilation, so they keep pending literals as nodes
+        if isinstance(value, PendingNode) and not (self.is_output and value.is_literal):
+            value = value.resolve()
+        self.clear_value()
+        if value is None:
+            self.remove()
+        elif isinstance(value, Node):
+            if value.is_null_node:
+                self.remove()
+                value.remove()
+            else:
+                if isinstance(value, PendingNode):
+                    value.materialise()
+                self._attributes["nodename"] = value
+        elif isinstance(value, Output):
+            assert isinstance(value.parent, Node)
+            self._attributes["output"] = value.name
+            self._attributes["nodename"] = value.parent
+        else:
+            # values are stored the way MaterialX stores them, which also sets the type of the port
+            if isinstance(value, Path):
+                self._type = Keyword.FILENAME
+                self._attributes["value"] = str(value)
+            else:
+                self._type = str(type_of(value))
+                self._attributes["value"] = value
+
+    @property
+    def output_string(self) -> str | None:
+        return self._attributes.get("output") or None
+
+    @output_string.setter
+    def output_string(self, output: str | None) -> None:
+        if output is None:
+            self.remove_attribute("output")
+        else:
+            assert self.literal is None
+            assert self.interface_name is None
+            self._attributes["output"] = output
+
+    @property
+    def interface_name(self) -> str | None:
+        return self._attributes.get("interfacename") or None
+
+    @interface_name.setter
+    def interface_name(self, name: str | None) -> None:
+        if name is None:
+            self.remove_attribute("interfacename")
+        else:
+            assert not self.is_output
+            self.clear_value()
+            self._attributes["interfacename"] = name
+
+    def clear_value(self) -> None:
+        for name in ["value", "nodename", "output", "interfacename", "default", "nodegraph"]:
+            self._attributes.pop(name, None)
+
+    def _emit_attributes(self, source: mx.PortElement) -> None:
+        for name, value in self._attributes.items():
+            if name == "value":
+                # MaterialX formats the value, then the type is restored in case it was changed after the value was set
+                source.setValue(value)
+                source.setType(self._type)
+            elif name == "nodename":
+                source.setNodeName(value.name)
+            else:
+                source.setAttribute(name, str(value))
+
+
+#
+#   Document
+#
+
+
+class Document(GraphElement):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(None, "", None)
+
+    @property
+    def category(self) -> str:
+        return "materialx"
+
+    def validate(self) -> tuple[bool, str]:
+        return mx_wrapper.Document(self.emit()).validate()
+
+    def get_descendant(self, name_path: str) -> Element | None:
+        element = self
+        for name in name_path.split("/"):
+            if not isinstance(element, InterfaceElement):
+                return None
+            element = element.get_child(name)
+        return element
+
+    def add_node_def(self, name: str, data_type: DataType, node_name: str) -> NodeDef:
+        assert name.startswith("ND_")
+        node_def = NodeDef(self, self.create_valid_child_name(name), node_name)
+        self._add_child(node_def)
+        if data_type != VOID:
+            output = Output(node_def, "out", str(data_type))
+            node_def._add_child(output)
+            output.default = data_type.default()
+        return node_def
+
+    def add_node_graph_from_def(self, node_def: NodeDef) -> NodeGraph:
+        node_graph = NodeGraph(self, node_def.name.replace("ND_", "NG_"))
+        self._add_child(node_graph)
+        node_graph.node_def = node_def
+        return node_graph
+
+    @property
+    def node_defs(self) -> list[NodeDef]:
+        return [c for c in self._ordered_children() if isinstance(c, NodeDef)]
+
+    @property
+    def node_graphs(self) -> list[NodeGraph]:
+        return [c for c in self._ordered_children() if isinstance(c, NodeGraph)]
+
+    @property
+    def xml(self) -> str:
+        return mx.writeToXmlString(self.emit())
+
+    def emit(self) -> mx.Document:
+        """
+        Creates the MaterialX document that this document represents.
+        """
+        document = mx.createDocument()
+        self._emit_attributes(document)
+        self._emit_children(document)
+        return document
+
+
+#
+#   Node
+#
+
+
+class Node(InterfaceElement):
+    __slots__ = ("_category",)
+
+    def __init__(self, graph: GraphElement, category: str, name: str | None, data_type: str):
+        super().__init__(graph, name, data_type)
+        self._category = category
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def parent(self) -> GraphElement:
+        return self._parent
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        if name != self._name:
+            self._parent._rename_child(self, name)
+
+    @property
+    def data_type(self) -> DataType:
+        if self._type == "multioutput":
+            return VOID
+        else:
+            return DataType(self._type)
+
+    @data_type.setter
+    def data_type(self, data_type: DataType | str) -> None:
+        self._type = str(data_type)
+
+    @property
+    def is_null_node(self) -> bool:
+        return self._category == Keyword.NULL
+
+    def add_interface_name(self, input_name: str, data_type: DataType, interface_name: str) -> Input:
+        input_ = self.add_input(input_name, data_type=data_type)
+        input_.interface_name = interface_name
+        return input_
+
+    def signature(self) -> tuple:
+        """
+        Everything that determines what the node computes, except its name. Connected nodes are compared by identity, so
+        two nodes in the same graph with equal signatures compute the same values.
+        """
+        ports = tuple(
+            (port.category, name, port._type, _attribute_signature(port._attributes))
+            for name, port in sorted(self._children.items())
+        )
+        return self._category, self._type, _attribute_signature(self._attributes), ports
+
+    def remove(self) -> None:
+        self._parent._remove_child(self)
+
+    def _emit(self, graph: mx.GraphElement) -> None:
+        node = graph.addNode(self._category, self._name, self._type)
+        self._emit_attributes(node)
+        for port in self._children.values():
+            port._emit(node)
+
+
+#
+#   Pending Node
+#
+
+
+class PendingNode(Node):
+    """
+    A node that has not been added to its graph yet.
+
+    Pending nodes stand in for nodes that would only be removed again during post-processing, such as constant nodes
+    and dot nodes. Ports connected to a pending node are given the value the node stands for instead, so the node is only
+    added to its graph if it is used in some other way, e.g., by accessing its inputs. node_utils only creates pending
+    nodes when the peephole optimization is used.
+    """
+    __slots__ = ("__inputs", "__value", "__is_materialised")
+
+    def __init__(self, graph: GraphElement, category: str, data_type: DataType, inputs: dict[str, Value], value: Value):
+        super().__init__(graph, category, None, str(data_type))
+        self.__inputs = inputs
+        self.__value = value
+        self.__is_materialised = False
+
+    @staticmethod
+    def alias(graph: GraphElement, category: str, in_: Node) -> PendingNode:
+        """
+        A node that passes its input through unchanged.
+        """
+        return PendingNode(graph, category, in_.data_type, {"in": in_}, in_)
+
+    @property
+    def is_materialised(self) -> bool:
+        return self.__is_materialised
+
+    @property
+    def is_literal(self) -> bool:
+        if self.__is_materialised:
+            return False
+        if isinstance(self.__value, PendingNode):
+            return self.__value.is_literal
+        return not isinstance(self.__value, Node)
+
+    def resolve(self) -> Value:
+        """
+        Returns the value that ports connected to this node should be given instead.
+        """
+        if self.__is_materialised:
+            return self
+        if isinstance(self.__value, PendingNode):
+            return self.__value.resolve()
+        return self.__value
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            self.materialise()
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        if self.__is_materialised:
+            Node.name.fset(self, name)
+        else:
+            self._name = name
+
+    @property
+    def data_type(self) -> DataType:
+        return Node.data_type.fget(self)
+
+    @data_type.setter
+    def data_type(self, data_type: DataType | str) -> None:
+        self.materialise()
+        Node.data_type.fset(self, data_type)
+
+    def set_attribute(self, name: str, value: str) -> None:
+        self.materialise()
+        super().set_attribute(name, value)
+
+    def get_child(self, name: str) -> Element | None:
+        self.materialise()
+        return super().get_child(name)
+
+    def has_input(self, name: str) -> bool:
+        self.materialise()
+        return super().has_input(name)
+
+    def add_input(self, name: str, value: Value = None, data_type: DataType = None) -> Input:
+        self.materialise()
+        return super().add_input(name, value, data_type)
+
+    def get_input(self, name: str) -> Input:
+        self.materialise()
+        return super().get_input(name)
+
+    @property
+    def inputs(self) -> list[Input]:
+        self.materialise()
+        return Node.inputs.fget(self)
+
+    def has_output(self, name: str) -> bool:
+        self.materialise()
+        return super().has_output(name)
+
+    def add_output(self, name: str, value: Value = None, data_type: DataType = None) -> Output:
+        self.materialise()
+        return super().add_output(name, value, data_type)
+
+    @property
+    def outputs(self) -> list[Output]:
+        self.materialise()
+        return Node.outputs.fget(self)
+
+    def remove(self) -> None:
+        if self.__is_materialised:
+            super().remove()
+
+    def materialise(self) -> None:
+        """
+        Adds the node to its graph.
+        """
+        if self.__is_materialised:
+            return
+        self.__is_materialised = True
+        name = self._name
+        self._name = self._parent._create_node_name()
+        self._parent._add_child(self)
+        for input_name, value in self.__inputs.items():
+            if value is None:
+                super().add_input(input_name, data_type=self.data_type)
+            else:
+                super().add_input(input_name, value)
+        if name is not None:
+            Node.name.fset(self, name)
+
+
+#
+#   Input
+#
+
+
+class Input(PortElement):
+    __slots__ = ()
+
+    @property
+    def category(self) -> str:
+        return "input"
+
+    def remove(self) -> None:
+        self._parent.remove_input(self._name)
+
+    def _emit(self, parent: mx.InterfaceElement) -> None:
+        self._emit_attributes(parent.addInput(self._name, self._type))
+
+
+#
+#   Output
+#
+
+
+class Output(PortElement):
+    __slots__ = ()
+
+    @property
+    def category(self) -> str:
+        return "output"
+
+    @property
+    def default(self) -> str:
+        return self.get_attribute("default")
+
+    @default.setter
+    def default(self, value: Uniform) -> None:
+        self.clear_value()
+        self.set_attribute("default", str(value))
+
+    def remove(self) -> None:
+        self._parent.remove_output(self._name)
+
+    def _emit(self, parent: mx.InterfaceElement) -> None:
+        self._emit_attributes(parent.addOutput(self._name, self._type))
+
+
+#
+#   NodeDef
+#
+
+
+class NodeDef(InterfaceElement):
+    __slots__ = ("_node_string",)
+
+    def __init__(self, document: Document, name: str, node_string: str):
+        super().__init__(document, name, None)
+        self._node_string = node_string
+
+    @property
+    def category(self) -> str:
+        return "nodedef"
+
+    @property
+    def parent(self) -> Document:
+        return self._parent
+
+    @property
+    def node_string(self) -> str:
+        return self._node_string
+
+    def add_output(self, name: str, value: Value = None, data_type: DataType = None) -> Output:
+        output = super().add_output(name, value, data_type)
+        output.default = data_type.default()
+        return output
+
+    def remove(self) -> None:
+        self._parent._remove_child(self)
+
+    def _emit(self, document: mx.Document) -> None:
+        node_def = document.addNodeDef(self._name, "", self._node_string)
+        self._emit_attributes(node_def)
+        for port in self._children.values():
+            port._emit(node_def)
+
+
+#
+#   NodeGraph
+#
+
+
+class NodeGraph(GraphElement):
+    __slots__ = ("_node_def",)
+
+    def __init__(self, document: Document, name: str):
+        super().__init__(document, name, None)
+        self._node_def: NodeDef | None = None
+
+    @property
+    def category(self) -> str:
+        return "nodegraph"
+
+    @property
+    def parent(self) -> Document:
+        return self._parent
+
+    @property
+    def node_def(self) -> NodeDef:
+        return self._node_def
+
+    @node_def.setter
+    def node_def(self, node_def: NodeDef) -> None:
+        self._node_def = node_def
+
+    def remove(self) -> None:
+        self._parent._remove_child(self)
+
+    def _emit(self, document: mx.Document) -> None:
+        node_graph = document.addNodeGraph(self._name)
+        if self._node_def is not None:
+            node_graph.setNodeDefString(self._node_def.name)
+        self._emit_attributes(node_graph)
+        self._emit_children(node_graph)
+
+
+#
+#   util functions
+#
+
+
+def type_of(value: Value) -> DataType:
+    if isinstance(value, TypedElement):
+        return value.data_type
+    return mx_wrapper.type_of(value)
+
+
+def _attribute_signature(attributes: dict[str, Any]) -> tuple:
+    # MaterialX values are not hashable, so they are compared by their string form
+    return tuple(sorted((k, v if isinstance(v, (str, Node)) else str(v)) for k, v in attributes.items()))
+
+
+def _split_name(name: str) -> tuple[str, int]:
+    """
+    Splits a name into the prefix and number that mx.incrementName would increment, e.g., x5 into x and 5. Names
+    without a number are treated as x1, so the name after x is x2.
+    """
+    prefix = name.rstrip("0123456789")
+    if prefix == name:
+        return name, 1
+    return prefix, int(name[len(prefix):])
+
+
+def _index_of(element: Element) -> int:
+    return element._index
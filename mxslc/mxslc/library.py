@@ -0,0 +1,234 @@
+"""
+Precompiled libraries of functions.
+
+compile_library writes the nodedefs and nodegraphs of an .mxsl file to an .mtlx file, and their parameters, default
+values, return types and implicit outputs to a signature file next to it. Including the .mtlx file links the library:
+its functions are added to the current scope without compiling their bodies again, and compile_file adds the
+definitions of the functions that were called to the output, either as copies or as an XInclude of the library.
+Inline functions and variables outside of functions can not be part of a library.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import MaterialX as mx
+
+from . import state
+from .CompileError import CompileError
+from .CompilerContext import get_context
+from .DataType import DataType
+from .Function import Function, NodeGraphFunction, TemplateInstance
+from .Parameter import Parameter, ParameterList
+from .Token import Token, IdentifierToken
+from .manifest import record_file
+from .mx_wrapper import Document, NodeDef
+from .parse import parse_expression
+from .scan import scan
+
+
+# bump this whenever the format of the signature file changes
+_SIGNATURE_VERSION = 1
+
+
+def signature_path(mtlx_filepath: Path) -> Path:
+    return mtlx_filepath.with_suffix(".signatures.json")
+
+
+#
+#   compiling
+#
+
+
+def exported_functions() -> list[NodeGraphFunction]:
+    """
+    Returns the functions declared by the compilation in the current scope, including every template type of templated
+    functions.
+    """
+    functions = []
+    for func in state.get_declared_functions():
+        if isinstance(func, TemplateInstance):
+            func = func.export()
+        # functions of the standard library and of linked libraries do not have a nodegraph in this document
+        if isinstance(func, NodeGraphFunction) and func.node_graph is not None:
+            functions.append(func)
+    return functions
+
+
+def write_signatures(mtlx_filepath: Path, functions: list[NodeGraphFunction]) -> None:
+    signatures = {
+        "version": _SIGNATURE_VERSION,
+        "functions": [_describe_function(f) for f in functions]
+    }
+    with open(signature_path(mtlx_filepath), "w") as file:
+        json.dump(signatures, file, indent=2)
+
+
+def _describe_function(func: NodeGraphFunction) -> dict[str, Any]:
+    return {
+        "name": func.name,
+        "node_def": func.node_def.name,
+        "template_type": None if func.template_type is None else str(func.template_type),
+        "return_type": str(func.return_type),
+        "parameters": [_describe_parameter(p) for p in func.parameters],
+        "implicit_outputs": {name: output.name for name, output in func.implicit_outputs.items()}
+    }
+
+
+def _describe_parameter(param: Parameter) -> dict[str, Any]:
+    # default values are stored as source code, because they are evaluated where the function is called
+    try:
+        default = None if param.default_value is None else str(param.default_value)
+    except NotImplementedError:
+        raise CompileError(f"The default value of parameter '{param.name}' can not be stored in a library.", param.identifier)
+    return {"name": param.name, "type": str(param.data_type), "default": default, "is_out": param.is_out}
+
+
+#
+#   linking
+#
+
+
+class Library:
+    """
+    A precompiled library read from its files. Libraries are shared by every compilation that links them and must not be
+    modified, so each compilation creates its own functions from them.
+    """
+    def __init__(self, mtlx_filepath: Path):
+        self.__path = mtlx_filepath
+        # the document must outlive the functions, otherwise their nodedefs become orphaned
+        self.__document = Document(mtlx_filepath)
+        with open(signature_path(mtlx_filepath), "r") as file:
+            signatures = json.load(file)
+        if signatures.get("version") != _SIGNATURE_VERSION:
+            raise CompileError(f"Library {mtlx_filepath.name} was compiled by a different version of the compiler and must be compiled again.")
+        self.__signatures: list[dict[str, Any]] = signatures["functions"]
+        self.__function_node_defs: dict[str, NodeDef] = {nd.name: nd for nd in self.__document.node_defs}
+        self.__node_defs: dict[str, list[mx.NodeDef]] = {}
+        for node_def in self.__document.source.getNodeDefs():
+            self.__node_defs.setdefault(node_def.getNodeString(), []).append(node_def)
+        self.__node_graphs: dict[str, mx.NodeGraph] = {ng.getNodeDefString(): ng for ng in self.__document.source.getNodeGraphs()}
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    @property
+    def document(self) -> Document:
+        return self.__document
+
+    def create_functions(self) -> list[Function]:
+        """
+        Returns new functions for the library. Their default values are parsed again for every compilation, because they
+        are initialised in the scope that the library is linked into.
+        """
+        return [_create_function(self.__function_node_defs[s["node_def"]], s, self.__path) for s in self.__signatures]
+
+    @property
+    def node_strings(self) -> set[str]:
+        return set(self.__node_defs)
+
+    def get_definitions(self, categories: Iterable[str]) -> list[mx.Element]:
+        """
+        Returns the nodedefs and nodegraphs that nodes of the given categories are instances of, together with those of
+        the library functions that they call in turn, in the order they appear in the library.
+        """
+        names: set[str] = set()
+        stack = list(categories)
+        while stack:
+            for node_def in self.__node_defs.get(stack.pop(), []):
+                if node_def.getName() in names:
+                    continue
+                names.add(node_def.getName())
+                if (node_graph := self.__node_graphs.get(node_def.getName())) is not None:
+                    names.add(node_graph.getName())
+                    stack.extend(n.getCategory() for n in node_graph.getNodes())
+        return [e for e in self.__document.source.getChildren() if e.getName() in names]
+
+
+def _create_function(node_def: NodeDef, signature: dict[str, Any], mtlx_filepath: Path) -> Function:
+    params = ParameterList()
+    for param in signature["parameters"]:
+        default = None if param["default"] is None else parse_expression(scan(param["default"] + ";"))
+        params += Parameter(IdentifierToken(param["name"]), DataType(param["type"]), default, is_out=param["is_out"])
+    template_type = None if signature["template_type"] is None else DataType(signature["template_type"])
+    implicit_outs = {name: node_def.get_output(output_name) for name, output_name in signature["implicit_outputs"].items()}
+    identifier = IdentifierToken(signature["name"], mtlx_filepath)
+    return NodeGraphFunction.from_signature(node_def, DataType(signature["return_type"]), identifier, template_type, params, implicit_outs)
+
+
+_libraries: dict[tuple, Library] = {}
+_lock = Lock()
+
+
+def load_library(mtlx_filepath: Path) -> Library:
+    """
+    Returns the library of mtlx_filepath, reading it only if it has changed since it was last read.
+    """
+    mtlx_filepath = mtlx_filepath.resolve()
+    key = (str(mtlx_filepath), *_file_key(mtlx_filepath), *_file_key(signature_path(mtlx_filepath)))
+    with _lock:
+        if key not in _libraries:
+            _libraries[key] = Library(mtlx_filepath)
+        return _libraries[key]
+
+
+def clear_library_cache() -> None:
+    with _lock:
+        _libraries.clear()
+
+
+def _file_key(file: Path) -> tuple[int, int]:
+    stat = os.stat(file)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def link_library(mtlx_filepath: Path, token: Token = None) -> None:
+    """
+    Adds the functions of a precompiled library to the current scope. Linking the same library again has no effect.
+    """
+    mtlx_filepath = mtlx_filepath.resolve()
+    libraries = get_context().libraries
+    if mtlx_filepath in libraries:
+        return
+    if not signature_path(mtlx_filepath).is_file():
+        raise CompileError(f"{mtlx_filepath.name} is not a library, its signature file was not found: {signature_path(mtlx_filepath).name}.", token)
+    record_file(mtlx_filepath)
+    record_file(signature_path(mtlx_filepath))
+    library = load_library(mtlx_filepath)
+    libraries[mtlx_filepath] = library
+    for func in library.create_functions():
+        state.add_function(func)
+
+
+def add_library_definitions(document: Document, libraries: Iterable[Library], mtlx_filepath: Path, xinclude=False) -> None:
+    """
+    Adds the definitions of the library functions called in document to the start of it. The used definitions are
+    copied into the document, or with xinclude, each library that is used is referenced by an XInclude relative to
+    mtlx_filepath instead.
+    """
+    mx_document = document.source
+    categories = {n.getCategory() for g in [mx_document, *mx_document.getNodeGraphs()] for n in g.getNodes()}
+    index = 0
+    for library in libraries:
+        definitions = library.get_definitions(categories)
+        if len(definitions) == 0:
+            continue
+        if xinclude:
+            # MaterialX writes a single XInclude in place of the elements with the same source uri
+            definitions = library.document.source.getChildren()
+            href = Path(os.path.relpath(library.path, mtlx_filepath.parent)).as_posix()
+        for definition in definitions:
+            if mx_document.getChild(definition.getName()) is not None:
+                continue
+            copy = mx_document.addChildOfCategory(definition.getCategory(), definition.getName())
+            copy.copyContentFrom(definition)
+            if xinclude:
+                copy.setSourceUri(href)
+            mx_document.setChildIndex(copy.getName(), index)
+            index += 1
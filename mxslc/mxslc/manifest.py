@@ -0,0 +1,159 @@
+"""
+Build manifests used by incremental compilation.
+
+A manifest is written next to each output file and records everything the output was compiled from: the content hash of
+every file that was read (including files reached through #include), the contents of every included directory, the
+include paths that were searched but did not exist, and the compile options. An output is up to date if none of these
+have changed since its manifest was written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import Any, Sequence
+
+import MaterialX as mx
+
+from .CompilerContext import get_context
+
+
+# bump this whenever the format of the manifest changes
+_MANIFEST_VERSION = 1
+
+
+class Dependencies:
+    """
+    The files, directories and missing paths that a compilation depended on.
+    """
+    def __init__(self):
+        self.files: dict[str, str] = {}
+        self.directories: dict[str, list[str]] = {}
+        self.missing: set[str] = set()
+
+
+def record_file(file: Path) -> None:
+    dependencies = get_context().dependencies
+    if dependencies is not None:
+        # files are hashed when they are read, so a file changing mid-compilation is picked up by the next build
+        dependencies.files[str(file.resolve())] = _hash_file(file)
+
+
+def record_directory(directory: Path) -> None:
+    dependencies = get_context().dependencies
+    if dependencies is not None:
+        dependencies.directories[str(directory.resolve())] = _list_directory(directory)
+
+
+def record_missing(path: Path) -> None:
+    dependencies = get_context().dependencies
+    if dependencies is not None:
+        dependencies.missing.add(str(path.resolve()))
+
+
+def manifest_path(mtlx_filepath: Path) -> Path:
+    return mtlx_filepath.with_name(f".{mtlx_filepath.name}.manifest.json")
+
+
+def describe_options(globals: dict[str, Any],
+                     main_func: str | None,
+                     main_args: Sequence[Any],
+                     include_dirs: Sequence[Path],
+                     macros: Sequence[Any],
+                     validate: bool,
+                     optimizations: Sequence[str],
+                     xinclude_libraries=False) -> dict[str, Any]:
+    """
+    Returns the compile options that affect the output file in a form that can be stored in a manifest.
+    """
+    options = {
+        "compiler": _compiler_hash(),
+        "materialx": mx.getVersionString(),
+        "globals": {name: _describe_value(value) for name, value in sorted(globals.items())},
+        "main_func": main_func,
+        "main_args": [_describe_value(value) for value in main_args],
+        "include_dirs": [str(Path(d).resolve()) for d in include_dirs],
+        "macros": [_describe_macro(macro) for macro in macros],
+        "validate": validate,
+        "optimizations": [str(o) for o in optimizations],
+        "xinclude_libraries": xinclude_libraries
+    }
+    # round trip through json so that options compare equal to the options loaded from a manifest
+    return json.loads(json.dumps(options))
+
+
+def is_up_to_date(mtlx_filepath: Path, options: dict[str, Any]) -> bool:
+    """
+    Returns true if mtlx_filepath was compiled with the same options from files that have not changed since.
+    """
+    try:
+        manifest = json.loads(manifest_path(mtlx_filepath).read_text())
+    except (OSError, ValueError):
+        return False
+    if manifest.get("version") != _MANIFEST_VERSION or manifest.get("options") != options:
+        return False
+    if not mtlx_filepath.is_file() or _hash_file(mtlx_filepath) != manifest["output"]:
+        return False
+    for file, digest in manifest["files"].items():
+        if not Path(file).is_file() or _hash_file(Path(file)) != digest:
+            return False
+    for directory, names in manifest["directories"].items():
+        if not Path(directory).is_dir() or _list_directory(Path(directory)) != names:
+            return False
+    return not any(Path(path).exists() for path in manifest["missing"])
+
+
+def write_manifest(mtlx_filepath: Path, options: dict[str, Any], dependencies: Dependencies) -> None:
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "options": options,
+        "output": _hash_file(mtlx_filepath),
+        "files": dict(sorted(dependencies.files.items())),
+        "directories": dict(sorted(dependencies.directories.items())),
+        "missing": sorted(dependencies.missing)
+    }
+    path = manifest_path(mtlx_filepath)
+    # write to a temporary file first so that an interrupted build never leaves a partially written manifest, each write
+    # has its own temporary file because threads of the same process can write the same manifest at once
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    with os.fdopen(fd, "w") as f:
+        f.write(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, path)
+
+
+def _hash_file(file: Path) -> str:
+    return hashlib.sha256(file.read_bytes()).hexdigest()
+
+
+def _list_directory(directory: Path) -> list[str]:
+    return sorted(p.name for p in directory.glob("*.mxsl"))
+
+
+def _describe_value(value: Any) -> Any:
+    if isinstance(value, mx.Vector2 | mx.Vector3 | mx.Vector4 | mx.Color3 | mx.Color4):
+        return [type(value).__name__, list(value.asTuple())]
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+def _describe_macro(macro: Any) -> Any:
+    if isinstance(macro, str):
+        return macro
+    return [macro.identifier.lexeme, [t.lexeme for t in macro.value]]
+
+
+@cache
+def _compiler_hash() -> str:
+    # outputs are rebuilt whenever the compiler itself changes
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for file in sorted(package_dir.rglob("*")):
+        if file.suffix in [".py", ".mxsl"]:
+            digest.update(str(file.relative_to(package_dir)).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
+from threading import RLock
+from weakref import WeakValueDictionary
 
 import MaterialX as mx
 
@@ -10,6 +12,10 @@ from .Keyword import Keyword
 
 """
 Pythonic wrappers around the generated MaterialX Python API.
+
+Wrappers are kept in an identity map, so wrapping an element that already has a wrapper returns the existing one, as
+long as it is still referenced somewhere. Repeatedly traversing a document, such as the standard library, therefore
+reuses the same wrappers and whatever they have cached.
 """
 
 #
@@ -27,8 +33,28 @@ type Value = Node | Output | Uniform | None
 
 
 class Element:
-    def __init__(self, source: mx.Element):
-        self.__source = source
+    __slots__ = ("__source", "__weakref__")
+
+    # MaterialX elements are not hashable, but the Python object of an element is unique while it is alive, which the
+    # wrapper ensures by holding on to it
+    __wrappers: WeakValueDictionary[int, Element] = WeakValueDictionary()
+    # the map is shared by every thread, and initialising a wrapper can wrap other elements, e.g., the parent of a nodedef
+    __wrappers_lock = RLock()
+
+    def __new__(cls, source: mx.Element):
+        with Element.__wrappers_lock:
+            wrapper = Element.__wrappers.get(id(source))
+            # an element can be wrapped more specifically than before, e.g., as a nodedef instead of an interface element
+            if not isinstance(wrapper, cls):
+                wrapper = super().__new__(cls)
+                wrapper.__source = source
+                wrapper._init_wrapper()
+                Element.__wrappers[id(source)] = wrapper
+            return wrapper
+
+    #virtualmethod
+    def _init_wrapper(self) -> None:
+        ...
 
     @property
     def source(self) -> mx.Element:
@@ -71,7 +97,12 @@ class Element:
         return str(self.source)
 
     def __eq__(self, other: Element) -> bool:
-        return self.source == other.source
+        # mx.Element.__eq__ compares the whole subtree of both elements, whereas wrappers are only equal to wrappers of
+        # the same element
+        return isinstance(other, Element) and self.source is other.source
+
+    def __hash__(self) -> int:
+        return id(self.source)
 
 
 #
@@ -80,8 +111,7 @@ class Element:
 
 
 class TypedElement(Element):
-    def __init__(self, source: mx.InterfaceElement):
-        super().__init__(source)
+    __slots__ = ()
 
     @property
     def source(self) -> mx.TypedElement:
@@ -106,8 +136,7 @@ class TypedElement(Element):
 
 
 class InterfaceElement(TypedElement):
-    def __init__(self, source: mx.InterfaceElement):
-        super().__init__(source)
+    __slots__ = ()
 
     @property
     def source(self) -> mx.InterfaceElement:
@@ -128,10 +157,7 @@ class InterfaceElement(TypedElement):
         return self.source.getDefaultVersion()
 
     def has_input(self, name: str) -> bool:
-        has_input = self.source.getInput(name) is not None
-        if not has_input and self.has_inherit_string:
-            return self.inherits_from.has_input(name)
-        return has_input
+        return name in self._input_map()
 
     def add_input(self, name: str, value: Value = None, data_type: DataType = None) -> Input:
         assert not self.has_input(name)
@@ -141,6 +167,7 @@ class InterfaceElement(TypedElement):
         name = self.create_valid_child_name(name)
         data_type_str = str(data_type or type_of(value))
         input_ = Input(self.source.addInput(name, data_type_str))
+        self._clear_port_maps()
         if value is not None:
             input_.value = value
         else:
@@ -149,19 +176,11 @@ class InterfaceElement(TypedElement):
 
     def get_input(self, name: str) -> Input:
         assert self.has_input(name), self.name
-        input_ = Input(self.source.getInput(name))
-        if input_ is None and self.has_inherit_string:
-            return self.inherits_from.get_input(name)
-        return input_
+        return self._input_map()[name]
 
     @property
     def inputs(self) -> list[Input]:
-        inputs = [Input(i) for i in self.source.getInputs()]
-        inherited_inputs = self.inherits_from.inputs if self.has_inherit_string else []
-        for inherited_input in inherited_inputs:
-            if inherited_input.name not in [i.name for i in inputs]:
-                inputs.append(inherited_input)
-        return inputs
+        return list(self._input_map().values())
 
     @property
     def input_count(self) -> int:
@@ -179,12 +198,10 @@ class InterfaceElement(TypedElement):
     def remove_input(self, name: str) -> None:
         assert self.has_input(name)
         self.source.removeInput(name)
+        self._clear_port_maps()
 
     def has_output(self, name: str) -> bool:
-        has_output = self.source.getOutput(name) is not None
-        if not has_output and self.has_inherit_string:
-            return self.inherits_from.has_output(name)
-        return has_output
+        return name in self._output_map()
 
     def add_output(self, name: str, value: Value = None, data_type: DataType = None) -> Output:
         assert not self.has_output(name)
@@ -194,6 +211,7 @@ class InterfaceElement(TypedElement):
         name = self.create_valid_child_name(name)
         data_type_str = str(data_type or type_of(value))
         output = Output(self.source.addOutput(name, data_type_str))
+        self._clear_port_maps()
         if value is not None:
             output.value = value
         else:
@@ -208,10 +226,7 @@ class InterfaceElement(TypedElement):
                 return self.get_output("out")
             raise AssertionError(self.name)
         assert self.has_output(name), self.name
-        output = Output(self.source.getOutput(name))
-        if output is None and self.has_inherit_string:
-            return self.inherits_from.get_output(name)
-        return output
+        return self._output_map()[name]
 
     @property
     def output(self) -> Output:
@@ -219,12 +234,7 @@ class InterfaceElement(TypedElement):
 
     @property
     def outputs(self) -> list[Output]:
-        outputs = [Output(i) for i in self.source.getOutputs()]
-        inherited_outputs = self.inherits_from.outputs if self.has_inherit_string else []
-        for inherited_output in inherited_outputs:
-            if inherited_output.name not in [i.name for i in outputs]:
-                outputs.append(inherited_output)
-        return outputs
+        return list(self._output_map().values())
 
     @property
     def output_count(self) -> int:
@@ -242,6 +252,36 @@ class InterfaceElement(TypedElement):
     def remove_output(self, name: str) -> None:
         assert self.has_output(name)
         self.source.removeOutput(name)
+        self._clear_port_maps()
+
+    def _input_map(self) -> dict[str, Input]:
+        """
+        Returns the inputs of the element by name, followed by the inputs that it inherits and does not override.
+        """
+        input_map = self._own_input_map()
+        if self.has_inherit_string:
+            inherited = self.inherits_from._input_map()
+            input_map = input_map | {n: i for n, i in inherited.items() if n not in input_map}
+        return input_map
+
+    def _output_map(self) -> dict[str, Output]:
+        output_map = self._own_output_map()
+        if self.has_inherit_string:
+            inherited = self.inherits_from._output_map()
+            output_map = output_map | {n: o for n, o in inherited.items() if n not in output_map}
+        return output_map
+
+    #virtualmethod
+    def _own_input_map(self) -> dict[str, Input]:
+        return {i.getName(): Input(i) for i in self.source.getInputs()}
+
+    #virtualmethod
+    def _own_output_map(self) -> dict[str, Output]:
+        return {o.getName(): Output(o) for o in self.source.getOutputs()}
+
+    #virtualmethod
+    def _clear_port_maps(self) -> None:
+        ...
 
 
 #
@@ -250,8 +290,7 @@ class InterfaceElement(TypedElement):
 
 
 class GraphElement(InterfaceElement):
-    def __init__(self, source: mx.GraphElement):
-        super().__init__(source)
+    __slots__ = ()
 
     @property
     def source(self) -> mx.GraphElement:
@@ -273,8 +312,7 @@ class GraphElement(InterfaceElement):
 
 
 class PortElement(TypedElement):
-    def __init__(self, source: mx.PortElement):
-        super().__init__(source)
+    __slots__ = ()
 
     @property
     def source(self) -> mx.PortElement:
@@ -380,7 +418,9 @@ class PortElement(TypedElement):
 
 
 class Document(GraphElement):
-    def __init__(self, source: mx.Document | str | Path = None):
+    __slots__ = ()
+
+    def __new__(cls, source: mx.Document | str | Path = None):
         if source is None:
             source = mx.createDocument()
         elif isinstance(source, str):
@@ -391,15 +431,17 @@ class Document(GraphElement):
             doc = mx.createDocument()
             mx.readFromXmlFile(doc, str(source))
             source = doc
-
-        super().__init__(source)
+        return super().__new__(cls, source)
 
     @property
     def source(self) -> mx.Document:
         return super().source
 
     def validate(self) -> tuple[bool, str]:
-        tmp = Document(self.xml)
+        # elements referenced by an xinclude are validated as part of the document, instead of being read from their file
+        options = mx.XmlWriteOptions()
+        options.writeXIncludeEnable = False
+        tmp = Document(mx.writeToXmlString(self.source, options))
         tmp.load_standard_library()
         return tmp.source.validate()
 
@@ -441,14 +483,13 @@ class Document(GraphElement):
 
 
 class Node(InterfaceElement):
+    __slots__ = ()
+
     def __new__(cls, source: mx.Node):
         if source is None:
             return None
         else:
-            return super().__new__(cls)
-
-    def __init__(self, source: mx.Node):
-        super().__init__(source)
+            return super().__new__(cls, source)
 
     @property
     def source(self) -> mx.Node:
@@ -506,14 +547,13 @@ class Node(InterfaceElement):
 
 
 class Input(PortElement):
+    __slots__ = ()
+
     def __new__(cls, source: mx.Input):
         if source is None:
             return None
         else:
-            return super().__new__(cls)
-
-    def __init__(self, source: mx.Input):
-        super().__init__(source)
+            return super().__new__(cls, source)
 
     def remove(self) -> None:
         self.parent.remove_input(self.name)
@@ -525,14 +565,13 @@ class Input(PortElement):
 
 
 class Output(PortElement):
+    __slots__ = ()
+
     def __new__(cls, source: mx.Output):
         if source is None:
             return None
         else:
-            return super().__new__(cls)
-
-    def __init__(self, source: mx.Output):
-        super().__init__(source)
+            return super().__new__(cls, source)
 
     @property
     def default(self) -> str:
@@ -553,17 +592,20 @@ class Output(PortElement):
 
 
 class NodeDef(InterfaceElement):
+    __slots__ = ("__ptr2parent", "__input_map", "__output_map")
+
     def __new__(cls, source: mx.NodeDef):
         if source is None:
             return None
         else:
-            return super().__new__(cls)
+            return super().__new__(cls, source)
 
-    def __init__(self, source: mx.NodeDef):
-        super().__init__(source)
+    def _init_wrapper(self) -> None:
         # nodedefs become "orphaned" unless there is an active pointer to their document
         # keep this pointer here stops it from becoming orphaned
         self.__ptr2parent = self.parent
+        self.__input_map: dict[str, Input] | None = None
+        self.__output_map: dict[str, Output] | None = None
 
     @property
     def source(self) -> mx.NodeDef:
@@ -577,6 +619,22 @@ class NodeDef(InterfaceElement):
     def node_string(self) -> str:
         return self.source.getNodeString()
 
+    def _own_input_map(self) -> dict[str, Input]:
+        # the ports of nodedefs are read for every call to a standard library function, so they are cached until the
+        # nodedef is modified. inherited ports are not cached, so changes to the nodedefs this one inherits from are seen
+        if self.__input_map is None:
+            self.__input_map = super()._own_input_map()
+        return self.__input_map
+
+    def _own_output_map(self) -> dict[str, Output]:
+        if self.__output_map is None:
+            self.__output_map = super()._own_output_map()
+        return self.__output_map
+
+    def _clear_port_maps(self) -> None:
+        self.__input_map = None
+        self.__output_map = None
+
     def add_output(self, name: str, value: Value = None, data_type: DataType = None) -> Output:
         output = super().add_output(name, value, data_type)
         output.default = data_type.default()
@@ -589,14 +647,13 @@ class NodeDef(InterfaceElement):
 
 
 class NodeGraph(GraphElement):
-    def __new__(cls, source: mx.NodeDef):
+    __slots__ = ()
+
+    def __new__(cls, source: mx.NodeGraph):
         if source is None:
             return None
         else:
-            return super().__new__(cls)
-
-    def __init__(self, source: mx.NodeGraph):
-        super().__init__(source)
+            return super().__new__(cls, source)
 
     @property
     def source(self) -> mx.NodeGraph:
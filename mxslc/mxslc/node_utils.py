@@ -1,7 +1,14 @@
+from pathlib import Path
+
+import MaterialX as mx
+
 from . import state
-from .DataType import DataType, MULTI_ELEM_TYPES, INTEGER, FLOAT, STRING, FILENAME, SHADER_TYPES
+from .CompilerContext import get_context
+from .DataType import DataType, MULTI_ELEM_TYPES, INTEGER, FLOAT, STRING, FILENAME, SHADER_TYPES, VECTOR3, VECTOR4
 from .Keyword import Keyword
-from .mx_wrapper import Node, Uniform, type_of, Output
+from .Optimization import Optimization
+from .ir import Node, type_of, Output, PendingNode
+from .mx_wrapper import Uniform
 
 
 def create(category: str, data_type: DataType | str) -> Node:
@@ -15,6 +22,12 @@ def constant(value: Uniform = None, data_type: DataType = None) -> Node:
     """
     Add constant node to the current states graph element.
     """
+    if _peephole() and (data_type or type_of(value)) not in SHADER_TYPES:
+        data_type = data_type or type_of(value)
+        literal = value if value is not None else data_type.default()
+        if data_type == FILENAME:
+            literal = Path(literal)
+        return PendingNode(state.get_graph(), "constant", data_type, {"value": value}, literal)
     node = create("constant", data_type or type_of(value))
     if value is not None:
         node.add_input("value", value)
@@ -32,6 +45,9 @@ def extract(in_: Node, index: Node | int | str) -> Node:
         assert index.data_type == INTEGER
     if isinstance(index, str):
         index = {"x": 0, "y": 1, "z": 2, "w": 3, "r": 0, "g": 1, "b": 2, "a": 3}[index]
+    if _peephole() and _is_literal(in_) and (isinstance(index, int) or _is_literal(index)):
+        literal = in_.resolve()[index if isinstance(index, int) else index.resolve()]
+        return PendingNode(state.get_graph(), "extract", FLOAT, {"in": in_, "index": index}, literal)
     node = create("extract", FLOAT)
     node.set_input("in", in_)
     node.set_input("index", index)
@@ -58,6 +74,10 @@ def combine(ins: list[Node], output_type: DataType) -> Node:
     Add combine node to the current states graph element.
     """
     assert 2 <= len(ins) <= 4
+    if _peephole() and all(_is_literal(i) and i.data_type == FLOAT for i in ins):
+        literal = _combine_literals([i.resolve() for i in ins], output_type)
+        inputs = {f"in{i + 1}": in_ for i, in_ in enumerate(ins)}
+        return PendingNode(state.get_graph(), f"combine{len(ins)}", output_type, inputs, literal)
     node = create(f"combine{len(ins)}", output_type)
     for i, in_ in enumerate(ins):
         node.set_input(f"in{i + 1}", in_)
@@ -68,6 +88,8 @@ def convert(in_: Node, output_type: DataType) -> Node:
     """
     Add convert node to the current states graph element.
     """
+    if _peephole() and isinstance(in_, Node) and in_.data_type == output_type:
+        return PendingNode.alias(state.get_graph(), "convert", in_)
     node = create("convert", output_type)
     node.set_input("in", in_)
     return node
@@ -84,6 +106,28 @@ def dot(in_: Node | Output) -> Node:
     """
     Add dot node to the current states graph element.
     """
+    if _peephole() and isinstance(in_, Node) and not in_.is_null_node:
+        return PendingNode.alias(state.get_graph(), "dot", in_)
     node = create("dot", type_of(in_))
     node.set_input("in", in_)
     return node
+
+
+def _peephole() -> bool:
+    """
+    Nodes that post-processing would remove again are created as pending nodes when the peephole optimization is on.
+    """
+    return Optimization.PEEPHOLE in get_context().optimizations
+
+
+def _is_literal(value: Node | Uniform) -> bool:
+    return isinstance(value, PendingNode) and value.is_literal
+
+
+def _combine_literals(literals: list[float], output_type: DataType) -> Uniform:
+    # the same values that post-processing folds combine nodes into
+    if len(literals) == 2:
+        return mx.Vector2(*literals)
+    if len(literals) == 3:
+        return mx.Vector3(*literals) if output_type == VECTOR3 else mx.Color3(*literals)
+    return mx.Vector4(*literals) if output_type == VECTOR4 else mx.Color4(*literals)
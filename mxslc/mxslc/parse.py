@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from .Argument import Argument
 from .Attribute import Attribute
 from .CompileError import CompileError
@@ -10,20 +12,35 @@ from .Parameter import Parameter
 from .Statements import *
 from .Token import Token, IdentifierToken
 from .TokenReader import TokenReader
-from .token_types import IDENTIFIER, FLOAT_LITERAL, INT_LITERAL, STRING_LITERAL, FILENAME_LITERAL
+from .token_types import IDENTIFIER, FLOAT_LITERAL, STRING_LITERAL
 
 
-def parse(tokens: list[Token]) -> list[Statement]:
+def parse(tokens: Iterable[Token]) -> list[Statement]:
     return Parser(tokens).parse()
 
 
+def parse_expression(tokens: Iterable[Token]) -> Expression:
+    return Parser(tokens).parse_expression()
+
+
 class Parser(TokenReader):
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: Iterable[Token]):
         super().__init__(tokens)
 
     def parse(self) -> list[Statement]:
         return self.__program()
 
+    def parse_expression(self) -> Expression:
+        """
+        Parses tokens that hold a single expression followed by a semicolon, such as the default value of a parameter.
+        """
+        expr = self.__expression()
+        self._match(";")
+        if self._reading_tokens():
+            token = self._peek()
+            raise CompileError(f"Expected the end of the expression, but found '{token.lexeme}'.", token)
+        return expr
+
     def __program(self) -> list[Statement]:
         statements = []
         while self._reading_tokens():
@@ -34,9 +51,9 @@ class Parser(TokenReader):
         attribs = self.__attributes()
         stmt = None
         token = self._peek()
-        if (token in [Keyword.CONST, Keyword.GLOBAL]) or (token in Keyword.DATA_TYPES() ^ {Keyword.AUTO} and self._peek_next_next() == "="):
+        if (token in [Keyword.CONST, Keyword.GLOBAL]) or ((token.is_data_type or token == Keyword.AUTO) and self._peek_next_next() == "="):
             stmt = self.__variable_declaration()
-        elif token in Keyword.DATA_TYPES() ^ {Keyword.AUTO, Keyword.VOID} and self._peek_next_next() in ["(", "<"]:
+        elif (token.is_data_type or token in [Keyword.AUTO, Keyword.VOID]) and self._peek_next_next() in ["(", "<"]:
             stmt = self.__function_declaration()
         elif token == IDENTIFIER:
             if self._peek_next() in ["(", "<"]:
@@ -105,7 +122,7 @@ class Parser(TokenReader):
             self._match(")")
         self._match("{")
         statements = []
-        if return_type in Keyword.DATA_TYPES() ^ {Keyword.AUTO}:
+        if return_type.is_data_type or return_type == Keyword.AUTO:
             while self._peek() != Keyword.RETURN:
                 statements.append(self.__statement())
             self._match(Keyword.RETURN)
@@ -260,8 +277,8 @@ class Parser(TokenReader):
 
     def __primary(self) -> Expression:
         # literal
-        if literal := self._consume(Keyword.TRUE, Keyword.FALSE, INT_LITERAL, FLOAT_LITERAL, STRING_LITERAL, FILENAME_LITERAL, Keyword.NULL):
-            return LiteralExpression(literal)
+        if self._peek().is_literal or self._peek() == Keyword.NULL:
+            return LiteralExpression(self._consume())
         # grouping
         if self._consume("("):
             expr = self.__expression()
@@ -270,14 +287,14 @@ class Parser(TokenReader):
         # function call / identifier
         if identifier := self._consume(IDENTIFIER):
             # function call
-            if (self._peek() == "(") or (self._peek() == "<" and self._peek_next() in Keyword.DATA_TYPES() and self._peek_next_next() == ">"):
+            if (self._peek() == "(") or (self._peek() == "<" and self._peek_next().is_data_type and self._peek_next_next() == ">"):
                 return self.__function_call(identifier)
             # identifier
             else:
                 return IdentifierExpression(identifier)
         token = self._peek()
         # constructor call
-        if token in Keyword.DATA_TYPES():
+        if token.is_data_type:
             return self.__constructor_call()
         # if
         if token == Keyword.IF:
@@ -371,7 +388,7 @@ class Parser(TokenReader):
         if self._peek() == IDENTIFIER and self._peek_next() == "=":
             name = self._match(IDENTIFIER)
             self._match("=")
-        elif self._peek() in Keyword.DATA_TYPES() and self._peek_next() == "=":
+        elif self._peek().is_data_type and self._peek_next() == "=":
             keyword = self._match(Keyword.DATA_TYPES())
             name = IdentifierToken(keyword.lexeme)
             self._match("=")
@@ -380,7 +397,7 @@ class Parser(TokenReader):
         return Argument(self.__argument_expression(), index, name)
 
     def __argument_expression(self) -> Expression:
-        if self._peek() in Keyword.DATA_TYPES() and self._peek_next() == IDENTIFIER:
+        if self._peek().is_data_type and self._peek_next() == IDENTIFIER:
             return VariableDeclarationExpression(self._consume(), self._consume())
         else:
             return self.__expression()
\ No newline at end of file
@@ -1,119 +1,231 @@
+from collections import deque
 from pathlib import Path
 
 import MaterialX as mx
 
-from .DataType import FILENAME, VECTOR3, VECTOR4, FLOAT
+from .CompilerContext import get_context
+from .DataType import FILENAME, VECTOR3, VECTOR4, FLOAT, SHADER_TYPES, MATERIAL
+from .Function import remove_uncalled_template_instances
+from .Optimization import Optimization
+from .constant_folding import evaluate, foldable_categories
+from .dead_code import eliminate_dead_code
 from .document import get_document
-from .mx_wrapper import GraphElement, Node
-
-
-# TODO add postprocess to remove unused inputs in nodegraphs
-# TODO these postprocesses can slow down compilation for larger shaders and can probably be done as nodes are added --
-# TODO -- to the network instead of going through the entire network at the end.
+from .ir import GraphElement, Node, PortElement, Value
+from .stdlib import StandardLibrary, get_standard_library
 
 
 def post_process() -> None:
+    remove_uncalled_template_instances()
     document = get_document()
+    optimizations = get_context().optimizations
+    merge_common_subexpressions = Optimization.CSE in optimizations
+    # nodes of user-defined functions can share a category with a standard library node
+    folded_categories = set()
+    library = None
+    if Optimization.CONSTANT_FOLDING in optimizations:
+        library = get_standard_library()
+        folded_categories = foldable_categories() - {nd.node_string for nd in document.node_defs}
+        for library in get_context().libraries.values():
+            folded_categories -= library.node_strings
 
     for graph in [document, *document.node_graphs]:
-        _remove_redundant_convert_nodes(graph)
-        _remove_dot_nodes(graph)
-        _remove_constant_nodes(graph)
-        _remove_combine_extract_nodes(graph)
-
-
-def _remove_redundant_convert_nodes(graph: GraphElement) -> None:
-    cvt_nodes = graph.get_nodes("convert")
-    for cvt_node in cvt_nodes:
+        processor = GraphPostProcessor(graph, folded_categories, library)
+        processor.process()
+        if merge_common_subexpressions:
+            processor.merge_common_subexpressions()
+
+    remove_dead_code = Optimization.DEAD_CODE in optimizations
+    remove_unused_inputs = Optimization.UNUSED_INPUTS in optimizations
+    if remove_dead_code or remove_unused_inputs:
+        get_context().dead_code_report = eliminate_dead_code(document, remove_dead_code, remove_unused_inputs)
+
+
+class GraphPostProcessor:
+    """
+    Removes redundant convert, dot, constant, combine and extract nodes from a single graph.
+
+    The ports connected to each node are indexed once up front and kept up to date as nodes are removed, instead of
+    searching the whole document for the downstream ports of every removed node.
+
+    With the constant_folding optimization, math nodes whose inputs are all literals are replaced by their values as
+    well. With the cse optimization, nodes that compute the same values as another node in the graph are then merged into it.
+    """
+    # nodes are first visited in this order, which is the order the passes used to run in
+    __CATEGORIES = [["convert"], ["dot"], ["constant"], ["combine2", "combine3", "combine4", "extract"]]
+
+    def __init__(self, graph: GraphElement, folded_categories: set[str] = None, library: StandardLibrary = None):
+        self.__folded_categories = folded_categories or set()
+        # the standard library whose nodedefs give the default values of folded nodes
+        self.__library = library
+        # nodes and ports are compared by identity, so they can be used as keys while they are being renamed or rewired
+        self.__nodes: dict[Node, None] = {}
+        self.__consumers: dict[Node, dict[PortElement, None]] = {}
+        for node in graph.get_nodes():
+            self.__nodes[node] = None
+            for input_ in node.inputs:
+                self.__connect(input_)
+        for output in graph.outputs:
+            self.__connect(output)
+
+        self.__worklist: deque[Node] = deque()
+        self.__queued: set[Node] = set()
+        for categories in [*self.__CATEGORIES, self.__folded_categories]:
+            for node in self.__nodes:
+                if node.category in categories:
+                    self.__enqueue(node)
+
+    def process(self) -> None:
+        while self.__worklist:
+            node = self.__worklist.popleft()
+            self.__queued.discard(node)
+            if node not in self.__nodes:
+                continue
+            category = node.category
+            if category == "convert":
+                self.__remove_redundant_convert_node(node)
+            elif category == "dot":
+                self.__remove_dot_node(node)
+            elif category == "constant":
+                self.__remove_constant_node(node)
+            elif category == "combine2":
+                self.__remove_combine_node(node, 2, mx.Vector2)
+            elif category == "combine3":
+                self.__remove_combine_node(node, 3, mx.Vector3 if node.data_type == VECTOR3 else mx.Color3)
+            elif category == "combine4":
+                self.__remove_combine_node(node, 4, mx.Vector4 if node.data_type == VECTOR4 else mx.Color4)
+            elif category == "extract":
+                self.__remove_extract_node(node)
+            if category in self.__folded_categories and node in self.__nodes:
+                self.__fold_node(node)
+
+    #
+    #   folding
+    #
+
+    def __remove_redundant_convert_node(self, cvt_node: Node) -> None:
         cvt_input = cvt_node.get_input("in")
         if cvt_node.data_type == cvt_input.data_type:
-            for port in cvt_node.downstream_ports:
-                port.value = cvt_input.value
-            cvt_node.remove()
-
+            self.__replace_node(cvt_node, cvt_input.value)
 
-def _remove_dot_nodes(graph: GraphElement) -> None:
-    dot_nodes = graph.get_nodes("dot")
-    for dot_node in dot_nodes:
+    def __remove_dot_node(self, dot_node: Node) -> None:
         dot_input = dot_node.get_input("in")
         if dot_input.value is not None:
-            for port in dot_node.downstream_ports:
-                port.value = dot_input.value
-                port.output_string = dot_input.output_string
-            dot_node.remove()
+            self.__replace_node(dot_node, dot_input.value, dot_input.output_string)
         elif dot_input.interface_name is not None:
-            for port in dot_node.downstream_ports:
+            consumers = self.__consumers.get(dot_node, {})
+            for port in list(consumers):
                 if not port.is_output:
                     port.interface_name = dot_input.interface_name
-            if len(dot_node.downstream_ports) == 0:
-                dot_node.remove()
-
+                    del consumers[port]
+            if len(consumers) == 0:
+                self.__remove_node(dot_node)
 
-def _remove_constant_nodes(graph: GraphElement) -> None:
-    const_nodes = graph.get_nodes("constant")
-    for const_node in const_nodes:
+    def __remove_constant_node(self, const_node: Node) -> None:
         input_value = const_node.get_input("value").value
         if const_node.data_type == FILENAME:
             input_value = Path(input_value)
-        for port in const_node.downstream_ports:
-            port.value = input_value
-        const_node.remove()
-
-
-def _remove_combine_extract_nodes(graph: GraphElement) -> None:
-    for node in graph.get_nodes():
-        if node.category == "combine2":
-            _remove_combine2_node(node)
-        if node.category == "combine3":
-            _remove_combine3_node(node)
-        if node.category == "combine4":
-            _remove_combine4_node(node)
-        if node.category == "extract":
-            _remove_extract_node(node)
-
-
-def _remove_combine2_node(node: Node) -> None:
-    literals: list[float] = [i.literal for i in node.inputs if i.has_literal and i.data_type == FLOAT]
-    if len(literals) < 2:
-        return
-    value = mx.Vector2(*literals)
-    for port in node.downstream_ports:
-        port.value = value
-    node.remove()
-
-
-def _remove_combine3_node(node: Node) -> None:
-    literals: list[float] = [i.literal for i in node.inputs if i.has_literal and i.data_type == FLOAT]
-    if len(literals) < 3:
-        return
-    if node.data_type == VECTOR3:
-        value = mx.Vector3(*literals)
-    else:
-        value = mx.Color3(*literals)
-    for port in node.downstream_ports:
-        port.value = value
-    node.remove()
-
-
-def _remove_combine4_node(node: Node) -> None:
-    literals: list[float] = [i.literal for i in node.inputs if i.has_literal and i.data_type == FLOAT]
-    if len(literals) < 4:
-        return
-    if node.data_type == VECTOR4:
-        value = mx.Vector4(*literals)
-    else:
-        value = mx.Color4(*literals)
-    for port in node.downstream_ports:
-        port.value = value
-    node.remove()
-
-
-def _remove_extract_node(node: Node) -> None:
-    if node.has_input("in") and node.has_input("index"):
-        in_ = node.get_input("in")
-        index = node.get_input("index")
-        if in_.has_literal and index.has_literal:
-            value = in_.literal[index.literal]
-            for port in node.downstream_ports:
-                port.value = value
-            node.remove()
+        self.__replace_node(const_node, input_value)
+
+    def __remove_combine_node(self, node: Node, size: int, make_value) -> None:
+        literals: list[float] = [i.literal for i in node.inputs if i.has_literal and i.data_type == FLOAT]
+        if len(literals) < size:
+            return
+        self.__replace_node(node, make_value(*literals))
+
+    def __remove_extract_node(self, node: Node) -> None:
+        if node.has_input("in") and node.has_input("index"):
+            in_ = node.get_input("in")
+            index = node.get_input("index")
+            if in_.has_literal and index.has_literal:
+                self.__replace_node(node, in_.literal[index.literal])
+
+    def __fold_node(self, node: Node) -> None:
+        value = evaluate(node, self.__library)
+        if value is not None:
+            self.__replace_node(node, value)
+
+    #
+    #   common subexpression elimination
+    #
+
+    def merge_common_subexpressions(self) -> None:
+        """
+        Replaces each node with the first node in the graph that has the same signature. Nodes are visited upstream
+        first, so the inputs of a node already refer to the merged nodes when its signature is taken.
+        """
+        first_nodes: dict[tuple, Node] = {}
+        for node in self.__topological_order():
+            if node.is_null_node or node.data_type in SHADER_TYPES or node.data_type == MATERIAL:
+                continue
+            first_node = first_nodes.setdefault(node.signature(), node)
+            if first_node is not node:
+                for port in self.__consumers.pop(node, {}):
+                    output_string = port.output_string
+                    port.value = first_node
+                    port.output_string = output_string
+                    self.__connect(port)
+                self.__remove_node(node)
+        # removing nodes can leave dot nodes without consumers
+        self.process()
+
+    def __topological_order(self) -> list[Node]:
+        upstream_counts = {n: 0 for n in self.__nodes}
+        for node, consumers in self.__consumers.items():
+            for port in consumers:
+                if port.parent in upstream_counts and node in upstream_counts:
+                    upstream_counts[port.parent] += 1
+        order = [n for n, c in upstream_counts.items() if c == 0]
+        for node in order:
+            for port in self.__consumers.get(node, {}):
+                consumer = port.parent
+                if consumer in upstream_counts:
+                    upstream_counts[consumer] -= 1
+                    if upstream_counts[consumer] == 0:
+                        order.append(consumer)
+        return order
+
+    #
+    #   consumer index
+    #
+
+    def __replace_node(self, node: Node, value: Value, output_string: str = None) -> None:
+        """
+        Connects every port connected to node to value instead, then removes node.
+        """
+        is_null_node = isinstance(value, Node) and value.is_null_node
+        for port in self.__consumers.pop(node, {}):
+            port.value = value
+            if output_string is not None:
+                port.output_string = output_string
+            # setting a port to nothing removes the port
+            if value is None or is_null_node:
+                continue
+            self.__connect(port)
+            # a consumer with a new literal input may now be foldable itself
+            if not port.is_output:
+                self.__enqueue(port.parent)
+        if is_null_node:
+            self.__nodes.pop(value, None)
+        self.__remove_node(node)
+
+    def __remove_node(self, node: Node) -> None:
+        for input_ in node.inputs:
+            producer = input_.connected_node
+            if producer is not None:
+                self.__consumers.get(producer, {}).pop(input_, None)
+                # a dot node left without consumers can now be removed
+                if producer in self.__nodes and producer.category == "dot":
+                    self.__enqueue(producer)
+        self.__consumers.pop(node, None)
+        del self.__nodes[node]
+        node.remove()
+
+    def __connect(self, port: PortElement) -> None:
+        producer = port.connected_node
+        if producer is not None:
+            self.__consumers.setdefault(producer, {})[port] = None
+
+    def __enqueue(self, node: Node) -> None:
+        if node not in self.__queued:
+            self.__queued.add(node)
+            self.__worklist.append(node)
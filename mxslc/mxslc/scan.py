@@ -1,10 +1,13 @@
 import re
+from collections.abc import Iterator
 from pathlib import Path
 
 from .CompileError import CompileError
 from .Keyword import Keyword
 from .Token import Token
-from .token_types import IDENTIFIER, FLOAT_LITERAL, INT_LITERAL, FILENAME_LITERAL, STRING_LITERAL, EOL, COMMENT
+from .manifest import record_file
+from .token_cache import get_token_cache
+from .token_types import IDENTIFIER, FLOAT_LITERAL, INT_LITERAL, FILENAME_LITERAL, STRING_LITERAL, EOL
 
 
 def scan(source: str | Path) -> list[Token]:
@@ -12,6 +15,23 @@ def scan(source: str | Path) -> list[Token]:
     Scans a source file or code snippet and returns a list of tokens.
     :param source: Source file or code snippet to scan.
     """
+    if isinstance(source, Path):
+        record_file(source)
+        return get_token_cache().get(source, _scan_uncached)
+    return _scan_uncached(source)
+
+
+def iter_scan(source: str | Path) -> Iterator[Token]:
+    """
+    Same as scan, but code snippets are scanned lazily, as their tokens are read. Files are still scanned in full, so
+    that their tokens can be cached.
+    """
+    if isinstance(source, Path):
+        return iter(scan(source))
+    return Scanner(source).tokens()
+
+
+def _scan_uncached(source: str | Path) -> list[Token]:
     return Scanner(source).scan()
 
 
@@ -26,6 +46,24 @@ def as_token(value: str | Token) -> Token:
     return tokens[0]
 
 
+# Alternatives are tried in order, so earlier groups take priority over later ones (e.g., "1.0" is a float literal and
+# not an int literal followed by a "." and another int literal).
+_TOKEN_PATTERN = re.compile("|".join([
+    r"(?P<whitespace>[ \t\r]+)",
+    r"(?P<comment>//.*)",
+    r"(?P<float>(?:(?:[0-9]*\.[0-9]+)|(?:[0-9]+\.[0-9]*))+(?:e-?[0-9]+)?)",
+    r"(?P<symbol>[(){}\[\].,:;@\n])",
+    r"(?P<operator>[!=><+\-*/%^&|]=?)",
+    r"(?P<directive>#[a-z]*)",
+    r"(?P<word>[_a-zA-Z][_a-zA-Z0-9]*)",
+    r"(?P<int>[0-9]+)",
+    r'(?P<filename>"[^"]*\.(?:mxsl|mtlx|tif|png|jpg)")',
+    r'(?P<string>"[^"]*")'
+]))
+
+_KEYWORDS = frozenset(Keyword)
+
+
 class Scanner:
     def __init__(self, source: str | Path):
         self.__file, self.__source = self.__read_source(source)
@@ -33,18 +71,26 @@ class Scanner:
         self.__line = 1
 
     def scan(self) -> list[Token]:
-        tokens = []
-        while self.__index < len(self.__source):
-            token = self.__identify_token()
+        return list(self.tokens())
+
+    def tokens(self) -> Iterator[Token]:
+        """
+        Scans the source as the tokens are read.
+        """
+        source = self.__source
+        length = len(source)
+        while self.__index < length:
+            match = _TOKEN_PATTERN.match(source, self.__index)
+            if match is None:
+                # skip unrecognised characters
+                self.__index += 1
+                continue
+            self.__index = match.end()
+            token = self.__identify_token(match)
             if token is not None:
-                if token.type != COMMENT:
-                    tokens.append(token)
+                yield token
                 if token.type == EOL:
                     self.__line += 1
-                self.__index += len(token.lexeme)
-            else:
-                self.__index += 1
-        return tokens
 
     def __read_source(self, source: str | Path) -> tuple[Path | None, str]:
         if isinstance(source, str):
@@ -53,71 +99,27 @@ class Scanner:
             with open(source, "r") as f:
                 return source, f.read()
 
-    def __identify_token(self) -> Token | None:
-        if comment := self.__get_line_comment():
-            return self.__token(COMMENT, comment)
-        if float_lit := self.__get_float_literal():
-            return self.__token(FLOAT_LITERAL, float_lit)
-        char = self.__peek()
-        if char in ["(", ")", "{", "}", "[", "]", ".", ",", ":", ";", "@", EOL]:
-            return self.__token(char)
-        if char in ["!", "=", ">", "<", "+", "-", "*", "/", "%", "^", "&", "|"]:
-            if self.__peek_next() == "=":
-                return self.__token(char + "=")
-            else:
-                return self.__token(char)
-        if directive := self.__get_directive():
-            return self.__token(directive)
-        if word := self.__get_word():
-            if word in Keyword:
-                return self.__token(word)
+    def __identify_token(self, match: re.Match) -> Token | None:
+        kind = match.lastgroup
+        lexeme = match.group(kind)
+        if kind in ["whitespace", "comment"]:
+            return None
+        if kind == "float":
+            return self.__token(FLOAT_LITERAL, lexeme)
+        if kind in ["symbol", "operator", "directive"]:
+            return self.__token(lexeme)
+        if kind == "word":
+            if lexeme in _KEYWORDS:
+                return self.__token(lexeme)
             else:
-                return self.__token(IDENTIFIER, word)
-        if int_lit := self.__get_int_literal():
-            return self.__token(INT_LITERAL, int_lit)
-        if filename_lit := self.__get_filename_literal():
-            return self.__token(FILENAME_LITERAL, filename_lit)
-        if string_lit := self.__get_string_literal():
-            return self.__token(STRING_LITERAL, string_lit)
-        return None
-
-    def __peek(self) -> str:
-        return self.__source[self.__index]
-
-    def __peek_next(self) -> str | None:
-        i = self.__index + 1
-        return self.__source[i] if i < len(self.__source) else None
-
-    def __peek_all(self) -> str:
-        return self.__source[self.__index:]
-
-    def __get_line_comment(self) -> str | None:
-        match = re.match(r"//.*", self.__peek_all())
-        return match.group() if match else None
-
-    def __get_directive(self) -> str | None:
-        match = re.match(r"#[a-z]*", self.__peek_all())
-        return match.group() if match else None
-
-    def __get_word(self) -> str | None:
-        match = re.match(r"[_a-zA-Z][_a-zA-Z0-9]*", self.__peek_all())
-        return match.group() if match else None
-
-    def __get_float_literal(self) -> str | None:
-        match = re.match(r"(([0-9]*\.[0-9]+)|([0-9]+\.[0-9]*))+(e-?[0-9]+)?", self.__peek_all())
-        return match.group() if match else None
-
-    def __get_int_literal(self) -> str | None:
-        match = re.match(r"[0-9]+", self.__peek_all())
-        return match.group() if match else None
-
-    def __get_filename_literal(self) -> str | None:
-        match = re.match(r'"[^"]*\.(mxsl|mtlx|tif|png|jpg)"', self.__peek_all())
-        return match.group() if match else None
-
-    def __get_string_literal(self) -> str | None:
-        match = re.match(r'"[^"]*"', self.__peek_all())
-        return match.group() if match else None
+                return self.__token(IDENTIFIER, lexeme)
+        if kind == "int":
+            return self.__token(INT_LITERAL, lexeme)
+        if kind == "filename":
+            return self.__token(FILENAME_LITERAL, lexeme)
+        if kind == "string":
+            return self.__token(STRING_LITERAL, lexeme)
+        raise AssertionError(kind)
 
     def __token(self, type_: str, lexeme: str = None) -> Token:
         return Token(type_, lexeme, self.__file, self.__line)
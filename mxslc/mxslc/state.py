@@ -5,8 +5,10 @@ from typing import Any
 
 from . import utils
 from .CompileError import CompileError
+from .CompilerContext import get_context
 from .DataType import DataType
-from .mx_wrapper import Node, NodeGraph, Output, GraphElement, Uniform
+from .ir import Node, NodeGraph, Output, GraphElement
+from .mx_wrapper import Uniform
 from .Token import Token, IdentifierToken
 from .document import get_document
 
@@ -41,7 +43,13 @@ class State(ABC):
         self._nodes: dict[str, Node] = {}
         self._consts: list[str] = []
         self.__parent = parent
-        self.__functions: list[Function] = []
+        # functions are indexed by name so that overload resolution only has to check functions with a matching name
+        self.__functions: dict[str, list[Function]] = {}
+        # also keeps the order that functions were added in
+        self.__added_functions: dict[Function, None] = {}
+        # overload resolution results, only valid for the function generation they were computed in
+        self.__resolutions: dict[tuple, Any] = {}
+        self.__resolutions_generation = get_context().function_generation
         self.__globals: dict[str, Uniform] = {}
 
     #
@@ -79,11 +87,31 @@ class State(ABC):
 
     def add_function(self, func: Function) -> None:
         # TODO add a check that there isn't already a function with the same signature already defined
-        assert func not in self.__functions
-        self.__functions.append(func)
+        assert func not in self.__added_functions
+        self.__functions.setdefault(func.name, []).append(func)
+        self.__added_functions[func] = None
+        # a new overload can change the result of any resolution in this scope or its child scopes
+        get_context().function_generation += 1
+
+    def has_function(self, func: Function) -> bool:
+        return func in self.__added_functions
+
+    def get_declared_functions(self) -> list[Function]:
+        """
+        Returns the functions added to this scope, excluding those of its parent scopes, in the order they were added.
+        """
+        return list(self.__added_functions)
 
     def get_function(self, identifier: str | Token, template_type: DataType = None, valid_types: set[DataType] = None, args: list[Argument] = None) -> Function:
         identifier, name = _handle_identifier(identifier)
+        key = ("function", *_resolution_key(name, template_type, valid_types, args, True))
+        if (func := self.__get_resolution(key)) is not None:
+            return func
+        func = self.__resolve_function(identifier, name, template_type, valid_types, args)
+        self.__set_resolution(key, func)
+        return func
+
+    def __resolve_function(self, identifier: Token | None, name: str, template_type: DataType, valid_types: set[DataType], args: list[Argument]) -> Function:
         matching_funcs = self.get_functions(name, template_type, valid_types, args)
         if len(matching_funcs) == 0:
             raise CompileError(f"Function signature '{utils.format_function(valid_types, name, template_type, args)}' does not exist.", identifier)
@@ -102,19 +130,45 @@ class State(ABC):
 
     def get_function_parameter_types(self, valid_types: set[DataType], identifier: str | Token, template_type: DataType, args: list[Argument], param_index: int | str) -> set[DataType]:
         identifier, name = _handle_identifier(identifier)
-        matching_funcs = self.get_functions(name, template_type, valid_types, args, strict_args=False)
-        return {
-            f.parameters[param_index].data_type
-            for f
-            in matching_funcs
-            if param_index in f.parameters
-        }
+        key = ("parameter_types", param_index, *_resolution_key(name, template_type, valid_types, args, False))
+        if (param_types := self.__get_resolution(key)) is None:
+            matching_funcs = self.get_functions(name, template_type, valid_types, args, strict_args=False)
+            param_types = frozenset(
+                f.parameters[param_index].data_type
+                for f
+                in matching_funcs
+                if param_index in f.parameters
+            )
+            self.__set_resolution(key, param_types)
+        return set(param_types)
+
+    def get_function_return_types(self, name: str, template_type: DataType, arg_types: tuple[tuple[int | str, frozenset[DataType]], ...]) -> frozenset[DataType]:
+        key = ("return_types", name, template_type, arg_types)
+        if (return_types := self.__get_resolution(key)) is None:
+            # unlike overload resolution, every scope is included, as the types of the arguments are not known yet
+            return_types = frozenset(
+                f.return_type
+                for f
+                in self.__functions.get(name, [])
+                if f.is_match(name, template_type) and f.accepts_types(arg_types)
+            )
+            if self.parent:
+                return_types |= self.parent.get_function_return_types(name, template_type, arg_types)
+            self.__set_resolution(key, return_types)
+        return return_types
 
     def get_functions(self, name: str, template_type: DataType = None, valid_types: set[DataType] = None, args: list[Argument] = None, strict_args=True) -> list[Function]:
+        key = ("functions", *_resolution_key(name, template_type, valid_types, args, strict_args))
+        if (matching_funcs := self.__get_resolution(key)) is None:
+            matching_funcs = tuple(self.__find_functions(name, template_type, valid_types, args, strict_args))
+            self.__set_resolution(key, matching_funcs)
+        return list(matching_funcs)
+
+    def __find_functions(self, name: str, template_type: DataType, valid_types: set[DataType], args: list[Argument], strict_args: bool) -> list[Function]:
         matching_funcs = [
             f
             for f
-            in self.__functions
+            in self.__functions.get(name, [])
             if f.is_match(name, template_type, valid_types, args, strict_args)
         ]
         if len(matching_funcs) == 0:
@@ -125,6 +179,20 @@ class State(ABC):
         else:
             return matching_funcs
 
+    def __get_resolution(self, key: tuple) -> Any:
+        context = get_context()
+        if self.__resolutions_generation != context.function_generation:
+            self.__resolutions.clear()
+            self.__resolutions_generation = context.function_generation
+        if key in self.__resolutions:
+            context.resolution_hits += 1
+            return self.__resolutions[key]
+        context.resolution_misses += 1
+        return None
+
+    def __set_resolution(self, key: tuple, value: Any) -> None:
+        self.__resolutions[key] = value
+
     #
     #   add/get globals
     #
@@ -301,8 +369,12 @@ class NodeGraphState(State):
 #
 
 
-_state: State = InlineState()
-_loop_counter = 0
+def _get_state() -> State:
+    # the live state belongs to the current compiler context
+    context = get_context()
+    if context.state is None:
+        context.state = InlineState()
+    return context.state
 
 
 #
@@ -311,38 +383,52 @@ _loop_counter = 0
 
 
 def enter_node_graph(node_graph: NodeGraph) -> None:
-    global _state
-    _state = NodeGraphState(_state, node_graph)
+    get_context().state = NodeGraphState(_get_state(), node_graph)
 
 
 def exit_node_graph() -> dict[str, Output]:
-    global _state
-    assert isinstance(_state, NodeGraphState)
-    child_state = _state
-    _state = _state.parent
+    child_state = _get_state()
+    assert isinstance(child_state, NodeGraphState)
+    get_context().state = child_state.parent
     return child_state.implicit_outputs
 
 
+def get_scope() -> State:
+    return _get_state()
+
+
+def enter_scope(scope: State) -> State:
+    """
+    Makes scope the live state, so that code can be executed in a scope other than the current one. Returns the state
+    that was live before, which must be passed to exit_scope.
+    """
+    outer_scope = _get_state()
+    get_context().state = scope
+    return outer_scope
+
+
+def exit_scope(outer_scope: State) -> None:
+    get_context().state = outer_scope
+
+
 def enter_inline() -> None:
-    global _state
-    _state = InlineState(_state)
+    get_context().state = InlineState(_get_state())
 
 
 def exit_inline() -> None:
-    global _state
-    _state = _state.parent
+    get_context().state = _get_state().parent
 
 
 def add_node(identifier: str | Token, node: Node, is_const=False) -> None:
-    _state.add_node(identifier, node, is_const)
+    _get_state().add_node(identifier, node, is_const)
 
 
 def get_node(identifier: str | Token) -> Node:
-    return _state.get_node(identifier)
+    return _get_state().get_node(identifier)
 
 
 def set_node(identifier: str | Token, node: Node) -> None:
-    _state.set_node(identifier, node)
+    _get_state().set_node(identifier, node)
 
 
 def is_node(identifier: str | Token) -> bool:
@@ -354,19 +440,34 @@ def is_node(identifier: str | Token) -> bool:
 
 
 def add_function(func: Function) -> None:
-    _state.add_function(func)
+    _get_state().add_function(func)
+
+
+def has_function(func: Function) -> bool:
+    return _get_state().has_function(func)
+
+
+def get_declared_functions() -> list[Function]:
+    return _get_state().get_declared_functions()
 
 
 def get_function(identifier: str | Token, template_type: DataType = None, valid_types: set[DataType] = None, args: list[Argument] = None) -> Function:
-    return _state.get_function(identifier, template_type, valid_types, args)
+    return _get_state().get_function(identifier, template_type, valid_types, args)
 
 
 def get_function_parameter_types(valid_types: set[DataType], identifier: str | Token, template_type: DataType, args: list[Argument], param_index: int | str) -> set[DataType]:
-    return _state.get_function_parameter_types(valid_types, identifier, template_type, args, param_index)
+    return _get_state().get_function_parameter_types(valid_types, identifier, template_type, args, param_index)
+
+
+def get_function_return_types(name: str, template_type: DataType, arg_types: tuple[tuple[int | str, frozenset[DataType]], ...]) -> frozenset[DataType]:
+    """
+    Returns the return types of the functions that could be called with arguments of the given possible types.
+    """
+    return _get_state().get_function_return_types(name, template_type, arg_types)
 
 
 def get_functions(name: str, template_type: DataType = None, valid_types: set[DataType] = None, args: list[Argument] = None, strict_args=True) -> list[Function]:
-    return _state.get_functions(name, template_type, valid_types, args, strict_args)
+    return _get_state().get_functions(name, template_type, valid_types, args, strict_args)
 
 
 def is_function(identifier: str | Token) -> bool:
@@ -377,8 +478,23 @@ def is_function(identifier: str | Token) -> bool:
         return False
 
 
+def get_resolution_cache_stats() -> dict[str, int]:
+    """
+    Returns the number of overload resolutions that were answered from the resolution cache (hits) and the number that
+    had to be computed (misses).
+    """
+    context = get_context()
+    return {"hits": context.resolution_hits, "misses": context.resolution_misses}
+
+
+def reset_resolution_cache_stats() -> None:
+    context = get_context()
+    context.resolution_hits = 0
+    context.resolution_misses = 0
+
+
 def add_global(name: str, value: Uniform) -> None:
-    _state.add_global(name, value)
+    _get_state().add_global(name, value)
 
 
 def add_globals(globals_: dict[str, Uniform]) -> None:
@@ -387,29 +503,41 @@ def add_globals(globals_: dict[str, Uniform]) -> None:
 
 
 def get_global(identifier: str | Token) -> Uniform:
-    return _state.get_global(identifier)
+    return _get_state().get_global(identifier)
 
 
 def get_graph() -> GraphElement:
-    return _state.graph
+    return _get_state().graph
 
 
 def get_loop_id() -> int:
-    global _loop_counter
-    _loop_counter += 1
-    return _loop_counter
+    context = get_context()
+    context.loop_counter += 1
+    return context.loop_counter
 
 
 def clear() -> None:
-    global _state, _loop_counter
-    _state = InlineState()
-    _loop_counter = 0
+    context = get_context()
+    context.state = InlineState()
+    context.loop_counter = 0
+    context.template_instances.clear()
 
 
 #
 #   Convenience Functions
 #
 
+def _resolution_key(name: str, template_type: DataType | None, valid_types: set[DataType] | None, args: list[Argument] | None, strict_args: bool) -> tuple:
+    # matches the way Function.is_match interprets its arguments, e.g., an empty set of valid types is the same as None
+    valid_types = frozenset(valid_types) if valid_types else None
+    signature = tuple(
+        (a.position if a.is_positional else a.name, a.data_type)
+        for a
+        in args
+    ) if args else None
+    return name, template_type, valid_types, signature, strict_args
+
+
 def _handle_identifier(identifier: str | Token) -> tuple[Token | None, str]:
     if isinstance(identifier, str):
         return None, identifier
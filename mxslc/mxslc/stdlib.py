@@ -0,0 +1,83 @@
+"""
+Process-wide cache of the MaterialX standard library functions.
+
+Loading the MaterialX data libraries and wrapping every nodedef in a function is expensive, so it is only done once per
+MaterialX version and library search path. The cached functions are shared by every compilation in the process and must
+not be modified.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+
+import MaterialX as mx
+
+from .Function import Function, NodeGraphFunction
+from .mx_wrapper import Document
+
+
+type LibraryKey = tuple[str, str, tuple[str, ...]]
+
+
+class StandardLibrary:
+    """
+    An immutable set of functions built from the default versions of the MaterialX standard library nodedefs.
+    """
+    def __init__(self, key: LibraryKey):
+        self.__key = key
+        # the document must outlive the functions, otherwise their nodedefs become orphaned
+        self.__document = Document()
+        self.__document.load_standard_library()
+        self.__functions: tuple[Function, ...] = tuple(
+            NodeGraphFunction.from_node_def(nd)
+            for nd
+            in self.__document.node_defs
+            if nd.is_default_version
+        )
+
+    @property
+    def key(self) -> LibraryKey:
+        return self.__key
+
+    @property
+    def document(self) -> Document:
+        return self.__document
+
+    @property
+    def functions(self) -> tuple[Function, ...]:
+        return self.__functions
+
+
+_libraries: dict[LibraryKey, StandardLibrary] = {}
+_lock = Lock()
+
+
+def get_standard_library() -> StandardLibrary:
+    """
+    Returns the standard library for the current MaterialX version and search path, building it on first use.
+    """
+    key = _library_key()
+    with _lock:
+        if key not in _libraries:
+            _libraries[key] = StandardLibrary(key)
+        return _libraries[key]
+
+
+def get_standard_library_functions() -> tuple[Function, ...]:
+    return get_standard_library().functions
+
+
+def clear_standard_library_cache() -> None:
+    """
+    Discards all cached standard libraries. The next compilation will reload the MaterialX data libraries.
+    """
+    with _lock:
+        _libraries.clear()
+
+
+def _library_key() -> LibraryKey:
+    return (
+        mx.getVersionString(),
+        mx.getDefaultDataSearchPath().asString(),
+        tuple(mx.getDefaultDataLibraryFolders())
+    )
@@ -0,0 +1,142 @@
+"""
+Cache of the tokens scanned from source files.
+
+Files are keyed by their path, size and modification time in memory, and by their path and content hash on disk, so
+compiling the same file or including the same header again does not scan it again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+
+from .Token import Token
+
+
+# bump this whenever Token or the scanner changes in a way that invalidates previously pickled tokens
+_DISK_CACHE_VERSION = 2
+
+
+type MemoryKey = tuple[str, str, int, int]
+
+
+class TokenCache:
+    def __init__(self, max_size=256, cache_dir: Path = None):
+        self.__max_size = max_size
+        self.__cache_dir: Path | None = None
+        self.cache_dir = cache_dir
+        self.__entries: OrderedDict[MemoryKey, tuple[Token, ...]] = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def cache_dir(self) -> Path | None:
+        return self.__cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, cache_dir: Path | None) -> None:
+        if cache_dir is not None:
+            cache_dir = Path(cache_dir).resolve()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        self.__cache_dir = cache_dir
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.__hits, "misses": self.__misses, "size": len(self.__entries)}
+
+    def get(self, file: Path, scan_file: Callable[[Path], list[Token]]) -> list[Token]:
+        """
+        Returns the tokens of file, calling scan_file only if they are not already cached.
+        """
+        key = _memory_key(file)
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return list(self.__entries[key])
+        tokens = self.__load_from_disk(file)
+        if tokens is None:
+            with self.__lock:
+                self.__misses += 1
+            tokens = tuple(scan_file(file))
+            self.__save_to_disk(file, tokens)
+        else:
+            with self.__lock:
+                self.__hits += 1
+        with self.__lock:
+            self.__entries[key] = tokens
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+        return list(tokens)
+
+    def clear(self) -> None:
+        """
+        Clears the in-memory cache. Files in the cache directory are left untouched.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __disk_path(self, file: Path) -> Path:
+        digest = hashlib.sha256()
+        digest.update(str(_DISK_CACHE_VERSION).encode())
+        digest.update(str(file).encode())
+        digest.update(file.read_bytes())
+        return self.__cache_dir / f"{digest.hexdigest()}.tokens"
+
+    def __load_from_disk(self, file: Path) -> tuple[Token, ...] | None:
+        if self.__cache_dir is None:
+            return None
+        disk_path = self.__disk_path(file)
+        if not disk_path.is_file():
+            return None
+        try:
+            with open(disk_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # a corrupt or outdated cache file is treated as a miss
+            return None
+
+    def __save_to_disk(self, file: Path, tokens: tuple[Token, ...]) -> None:
+        if self.__cache_dir is None:
+            return
+        disk_path = self.__disk_path(file)
+        # write to a temporary file first so that concurrent compilations never read a partially written cache file,
+        # each write has its own temporary file because threads of the same process can save the same file at once
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=disk_path.parent)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(tokens, f)
+        os.replace(tmp_path, disk_path)
+
+
+def _memory_key(file: Path) -> MemoryKey:
+    stat = file.stat()
+    # the path is kept as written as well as resolved, because tokens remember the path they were scanned from
+    return str(file.resolve()), str(file), stat.st_size, stat.st_mtime_ns
+
+
+_token_cache = TokenCache()
+
+
+def get_token_cache() -> TokenCache:
+    return _token_cache
+
+
+def set_token_cache_dir(cache_dir: str | Path | None) -> None:
+    """
+    Sets the directory used to persist scanned tokens between processes. None disables the on-disk cache.
+    """
+    _token_cache.cache_dir = cache_dir
+
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
@@ -0,0 +1,51 @@
+import shutil
+from pathlib import Path
+
+import MaterialX as mx
+import pytest
+
+import mxslc
+from mxslc.CompileError import CompileError
+
+_data = Path(__file__).parent / "data"
+
+
+def test_compile_folder_in_parallel(tmp_path: Path) -> None:
+    mxslc.compile_file(_data / "mxsl" / "simple", tmp_path, jobs=2)
+
+    expected_paths = sorted((_data / "mtlx" / "simple").glob("*.mtlx"))
+    assert len(expected_paths) > 1
+    for expected_path in expected_paths:
+        actual = (tmp_path / expected_path.name).read_text()
+        expected = expected_path.read_text()
+        assert actual.replace("\\", "/") == expected.replace("\\", "/")
+
+
+def test_compile_folder_in_parallel_with_globals(tmp_path: Path) -> None:
+    mxsl_dir = tmp_path / "mxsl"
+    mxsl_dir.mkdir()
+    for name in ["global_a", "global_b"]:
+        shutil.copy(_data / "mxsl" / "global.mxsl", mxsl_dir / f"{name}.mxsl")
+    globals_ = {
+        "x": mx.Vector2(0.0, 1.0),
+        "s": "world",
+        "c": mx.Color3(0.0, 0.5, 0.5),
+        "f": 0.78
+    }
+
+    mxslc.compile_file(mxsl_dir, tmp_path, globals=globals_, jobs=2)
+
+    expected = (_data / "mtlx" / "global.mtlx").read_text()
+    for name in ["global_a", "global_b"]:
+        assert (tmp_path / f"{name}.mtlx").read_text() == expected
+
+
+def test_compile_folder_in_parallel_reports_all_errors(tmp_path: Path) -> None:
+    for name in ["missing_semi_1", "const_1"]:
+        shutil.copy(_data / "error" / f"{name}.mxsl", tmp_path)
+
+    with pytest.raises(CompileError) as e:
+        mxslc.compile_file(tmp_path, jobs=2)
+
+    assert "missing_semi_1.mxsl" in str(e.value)
+    assert "const_1.mxsl" in str(e.value)
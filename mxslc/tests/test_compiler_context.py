@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import mxslc
+from mxslc import InteractiveCompiler, state
+from mxslc.CompileError import CompileError
+from mxslc.CompilerContext import CompilerContext, get_context
+from mxslc.compile import compile_
+
+_data = Path(__file__).parent / "data"
+
+_filenames = ["simple/test_001", "simple/test_002", "simple/test_003", "simple/test_004", "redbrick", "shaderart"]
+
+
+def _compile_and_compare(filename: str, mtlx_path: Path) -> None:
+    mxslc.compile_file((_data / "mxsl" / filename).with_suffix(".mxsl"), mtlx_path)
+    actual = mtlx_path.read_text()
+    expected = (_data / "mtlx" / filename).with_suffix(".mtlx").read_text()
+    assert actual.replace("\\", "/") == expected.replace("\\", "/")
+
+
+def test_compile_files_in_threads(tmp_path: Path) -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(_compile_and_compare, filename, tmp_path / f"{i}.mtlx")
+            for i, filename
+            in enumerate(_filenames * 2)
+        ]
+        for future in futures:
+            future.result()
+
+
+def test_compile_in_asyncio_tasks() -> None:
+    async def compile_snippet(name: str) -> str:
+        with CompilerContext() as context:
+            compile_(f"float {name} = 1.0;", [Path(".")], is_main=True)
+            # yield to the other task while inside the context
+            await asyncio.sleep(0)
+            compile_(f"float {name}_2 = {name} + 1.0;", [Path(".")], is_main=True)
+            return context.document.xml
+
+    async def compile_snippets() -> list[str]:
+        return await asyncio.gather(compile_snippet("a"), compile_snippet("b"))
+
+    xml_a, xml_b = asyncio.run(compile_snippets())
+    assert 'name="a_2"' in xml_a and 'name="b"' not in xml_a
+    assert 'name="b_2"' in xml_b and 'name="a"' not in xml_b
+
+
+def test_interactive_compilers_are_independent() -> None:
+    compiler_1 = InteractiveCompiler()
+    compiler_1.eval("float x = 1.0;")
+    compiler_2 = InteractiveCompiler()
+    compiler_2.eval("float y = 2.0;")
+
+    # using a compiler does not change the current context
+    assert get_context() is not compiler_1.context and get_context() is not compiler_2.context
+    with compiler_2.context, pytest.raises(CompileError):
+        state.get_node("x")
+    shader_1 = compiler_1.get_shader_interface()
+    assert "x" in shader_1 and "y" not in shader_1
+    assert 'name="x"' in compiler_1.xml and 'name="y"' not in compiler_1.xml
@@ -0,0 +1,33 @@
+import pickle
+
+import MaterialX as mx
+
+from mxslc.DataType import DataType, FLOAT, VECTOR3
+from mxslc.Keyword import Keyword
+from mxslc.Token import Token
+
+
+def test_data_types_are_interned() -> None:
+    assert DataType("float") is FLOAT
+    assert DataType(Token(Keyword.VECTOR3)) is VECTOR3
+    assert DataType(VECTOR3) is VECTOR3
+    assert pickle.loads(pickle.dumps(VECTOR3)) is VECTOR3
+    assert DataType(None) is None
+
+
+def test_data_types_compare_with_strings_and_tokens() -> None:
+    assert FLOAT == "float"
+    assert FLOAT == Token(Keyword.FLOAT)
+    assert FLOAT != VECTOR3
+    assert {FLOAT: 1}["float"] == 1
+    assert VECTOR3.size == 3
+    assert list(VECTOR3.zeros()) == [0.0, 0.0, 0.0]
+
+
+def test_default_values_are_not_shared() -> None:
+    zeros = DataType("vector3").zeros()
+    zeros[0] = 1.0
+    assert DataType("vector3").zeros() == mx.Vector3()
+    default = DataType("color3").default()
+    default[1] = 1.0
+    assert DataType("color3").default() == mx.Color3()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from mxslc.CompileError import CompileError
+from mxslc.CompilerContext import CompilerContext
+from mxslc.Preprocessor.includes import find_include_guard, get_include_stats, reset_include_stats
+from mxslc.compile import compile_
+from mxslc.scan import scan
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("#ifndef A\n#define A\nfloat x = 1.0;\n#endif\n", "A"),
+    ("\n\n#ifndef A\n#define A 1\n#ifdef B\n#endif\n#endif", "A"),
+    ("#ifndef A\n#define B\n#endif\n", None),
+    ("#ifndef A\n#define A\n#else\nfloat x = 1.0;\n#endif\n", None),
+    ("#ifndef A\n#define A\n#endif\nfloat x = 1.0;\n", None),
+    ("float x = 1.0;\n", None),
+])
+def test_find_include_guard(source: str, expected: str | None) -> None:
+    assert find_include_guard(scan(source)) == expected
+
+
+@pytest.mark.parametrize("filename, stat", [
+    ("directives/directives_6", "skipped_pragma_once"),
+    ("directives/directives_7", "skipped_include_guard"),
+])
+def test_include_skipped(filename: str, stat: str) -> None:
+    mxsl_path = (Path(__file__).parent / "data" / "mxsl" / filename).with_suffix(".mxsl")
+    with CompilerContext():
+        compile_(mxsl_path, [mxsl_path.parent, Path(".")], is_main=True)
+        stats = get_include_stats()
+        assert stats["included"] == 1
+        assert stats[stat] == 1
+        reset_include_stats()
+        assert get_include_stats()[stat] == 0
+
+
+@pytest.mark.parametrize("filename, function", [
+    ("pragma_once.mxsl", "add_one"),
+    ("include_guard.mxsl", "add_two"),
+])
+def test_include_in_branch_not_taken(filename: str, function: str) -> None:
+    # a file that is only included in a branch that is not taken is not marked as included
+    include_dir = Path(__file__).parent / "data" / "mxsl" / "directives"
+    source = f'#ifdef UNDEFINED\n#include "{filename}"\n#endif\n#include "{filename}"\nfloat a = {function}(1.0);\n'
+    with CompilerContext() as context:
+        compile_(source, [include_dir, Path(".")], is_main=True)
+        assert get_include_stats()["included"] == 1
+        assert function in [n.category for n in context.document.get_nodes()]
+
+
+def test_pragma_once_in_branch_not_taken(tmp_path: Path) -> None:
+    (tmp_path / "maybe_once.mxsl").write_text("#ifdef UNDEFINED\n#pragma once\n#endif\n")
+    source = '#include "maybe_once.mxsl"\n#include "maybe_once.mxsl"\n'
+    with CompilerContext():
+        compile_(source, [tmp_path, Path(".")], is_main=True)
+        assert get_include_stats()["included"] == 2
+
+
+def test_syntax_error_is_reported_before_later_includes() -> None:
+    # tokens are streamed into the parser, so files included after a syntax error are never searched for
+    source = 'float x = ;\n#include "does_not_exist.mxsl"\n'
+    with CompilerContext():
+        with pytest.raises(CompileError, match="Unexpected token"):
+            compile_(source, [Path(".")], is_main=True)
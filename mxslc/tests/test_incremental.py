@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import mxslc
+from mxslc.manifest import Dependencies, manifest_path, write_manifest
+
+
+@pytest.fixture
+def shader(tmp_path: Path) -> Path:
+    (tmp_path / "override").mkdir()
+    include_dir = tmp_path / "include"
+    include_dir.mkdir()
+    (include_dir / "lib.mxsl").write_text("float scale(float x) { return x * 2.0; }\n")
+    mxsl_path = tmp_path / "shader.mxsl"
+    mxsl_path.write_text('#include "lib.mxsl"\nfloat y = scale(3.0);\n')
+    return mxsl_path
+
+
+def _compile(mxsl_path: Path, capsys: pytest.CaptureFixture, **kwargs) -> bool:
+    include_dirs = [mxsl_path.parent / "override", mxsl_path.parent / "include"]
+    mxslc.compile_file(mxsl_path, add_include_dirs=include_dirs, incremental=True, **kwargs)
+    output = capsys.readouterr().out
+    assert output.startswith(mxsl_path.name)
+    return "compiled successfully" in output
+
+
+def test_unchanged_file_is_skipped(shader: Path, capsys: pytest.CaptureFixture) -> None:
+    assert _compile(shader, capsys)
+    assert manifest_path(shader.with_suffix(".mtlx")).is_file()
+    assert not _compile(shader, capsys)
+
+
+@pytest.mark.parametrize("change", [
+    lambda s: s.write_text(s.read_text() + "float z = 1.0;\n"),
+    lambda s: (s.parent / "include" / "lib.mxsl").write_text("float scale(float x) { return x * 3.0; }\n"),
+    lambda s: (s.parent / "override" / "lib.mxsl").write_text("float scale(float x) { return x; }\n"),
+    lambda s: s.with_suffix(".mtlx").write_text(""),
+    lambda s: manifest_path(s.with_suffix(".mtlx")).unlink()
+])
+def test_changed_dependency_is_recompiled(shader: Path, change, capsys: pytest.CaptureFixture) -> None:
+    assert _compile(shader, capsys)
+    change(shader)
+    assert _compile(shader, capsys)
+    assert not _compile(shader, capsys)
+
+
+def test_changed_options_are_recompiled(shader: Path, capsys: pytest.CaptureFixture) -> None:
+    assert _compile(shader, capsys)
+    assert _compile(shader, capsys, add_macros=["DEBUG"])
+    assert not _compile(shader, capsys, add_macros=["DEBUG"])
+    assert _compile(shader, capsys, add_macros=[mxslc.Macro("DEBUG", "1")])
+    assert _compile(shader, capsys, validate=True)
+
+
+def test_manifest_written_from_threads(shader: Path) -> None:
+    mtlx_path = shader.with_suffix(".mtlx")
+    mtlx_path.write_text("")
+    dependencies = Dependencies()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(write_manifest, mtlx_path, {}, dependencies) for _ in range(32)]
+    for future in futures:
+        future.result()
+    assert manifest_path(mtlx_path).is_file()
+    assert not list(shader.parent.glob("*.tmp"))
@@ -0,0 +1,35 @@
+from mxslc import InteractiveCompiler
+from mxslc.ir import Node
+from mxslc.mx_wrapper import Document
+
+
+def test_document_is_a_snapshot() -> None:
+    compiler = InteractiveCompiler()
+    compiler.eval("float x = time();")
+    document = compiler.document
+    assert isinstance(document, Document)
+    assert document.xml == compiler.xml
+    compiler.eval("float y = x + 1.0;")
+    assert document.source.getNode("y") is None
+    assert compiler.document.source.getNode("y") is not None
+
+
+def test_interactive_node_is_found_in_document() -> None:
+    compiler = InteractiveCompiler()
+    compiler.eval("float x = time(); float twice(float a) { return a * 2.0; }")
+    shader = compiler.get_shader_interface()
+    node = shader.twice(shader.x).node
+    assert isinstance(node, Node)
+    assert node.get_input("a").value is shader.x.node
+    document = compiler.document
+    assert document.source.getDescendant(node.name_path).getCategory() == "twice"
+
+
+def test_materialx_node_as_value() -> None:
+    compiler = InteractiveCompiler()
+    compiler.eval("float x = time(); float twice(float a) { return a * 2.0; }")
+    shader = compiler.get_shader_interface()
+    document = compiler.document
+    node = shader.twice(document.source.getNode("x")).node
+    assert node.category == "twice"
+    assert node.get_input("a").value is shader.x.node
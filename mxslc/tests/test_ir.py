@@ -0,0 +1,61 @@
+import MaterialX as mx
+
+from mxslc.DataType import FLOAT, VECTOR3
+from mxslc.ir import Document
+
+
+def test_node_names_match_materialx() -> None:
+    document = Document()
+    mx_document = mx.createDocument()
+    nodes = [document.add_node("add", FLOAT) for _ in range(5)]
+    mx_nodes = [mx_document.addNode("add", "", "float") for _ in range(5)]
+
+    # renaming and removing nodes frees their names, which new nodes are given first
+    nodes[1].name = "x"
+    mx_nodes[1].setName(mx_document.createValidChildName("x"))
+    nodes[3].remove()
+    mx_document.removeNode(mx_nodes[3].getName())
+    nodes[4].name = "node1"
+    mx_nodes[4].setName(mx_document.createValidChildName("node1"))
+    for _ in range(3):
+        nodes.append(document.add_node("add", FLOAT))
+        mx_nodes.append(mx_document.addNode("add", "", "float"))
+
+    assert [n.name for n in document.get_nodes()] == [n.getName() for n in mx_document.getNodes()]
+
+
+def test_emit_keeps_order_and_connections() -> None:
+    document = Document()
+    first = document.add_node("constant", VECTOR3)
+    first.add_input("value", mx.Vector3(1.0, 2.0, 3.0))
+    second = document.add_node("extract", FLOAT)
+    second.set_input("in", first)
+    second.set_input("index", 1)
+    # connections refer to nodes, so they follow nodes that are renamed after being connected
+    first.name = "v"
+
+    mx_document = document.emit()
+    assert [n.getName() for n in mx_document.getNodes()] == ["v", "node2"]
+    assert mx_document.getNode("node2").getInput("in").getNodeName() == "v"
+    assert mx_document.getNode("v").getInput("value").getValueString() == "1, 2, 3"
+    assert mx_document.getNode("node2").getInput("index").getType() == "integer"
+
+
+def test_repeated_names_match_materialx() -> None:
+    document = Document()
+    mx_document = mx.createDocument()
+    nodes = []
+    mx_nodes = []
+    for i in range(30):
+        nodes.append(document.add_node("add", FLOAT))
+        mx_nodes.append(mx_document.addNode("add", "", "float"))
+        # variables that are assigned in a loop rename a new node to the same name every iteration
+        name = ["x", "x3", "y09"][i % 3]
+        nodes[-1].name = name
+        mx_nodes[-1].setName(mx_document.createValidChildName(name))
+        if i % 7 == 6:
+            # removing a node frees its name, which is given to the next node with the same prefix
+            nodes.pop(i // 2).remove()
+            mx_document.removeNode(mx_nodes.pop(i // 2).getName())
+
+    assert [n.name for n in document.get_nodes()] == [n.getName() for n in mx_document.getNodes()]
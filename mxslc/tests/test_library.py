@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import MaterialX as mx
+import pytest
+
+import mxslc
+from mxslc.CompileError import CompileError
+from mxslc.library import signature_path
+
+
+LIBRARY = """
+float scale(float x, float amount = 2.0)
+{
+    return x * amount;
+}
+
+T double<float, vec3>(T x)
+{
+    return x + x;
+}
+
+float twice_scaled(float x)
+{
+    return scale(scale(x));
+}
+
+void split(vec3 v, out float first, out float rest)
+{
+    first = v.x;
+    rest = v.y + v.z;
+}
+
+inline float helper(float x)
+{
+    return x + 1.0;
+}
+
+float unused(float x)
+{
+    return helper(x);
+}
+"""
+
+SHADER = """
+float a = scale(3.0);
+float b = twice_scaled(a);
+vec3 c = double(vec3(1.0, 2.0, 3.0));
+float f = 0.0;
+float r = 0.0;
+split(c, f, r);
+surfaceshader s = standard_surface(base=b + f + r);
+"""
+
+
+@pytest.fixture
+def library(tmp_path: Path) -> Path:
+    mxsl_path = tmp_path / "shapes.mxsl"
+    mxsl_path.write_text(LIBRARY)
+    mxslc.compile_library(mxsl_path, validate=True)
+    return mxsl_path.with_suffix(".mtlx")
+
+
+def _read(mtlx_path: Path) -> mx.Document:
+    document = mx.createDocument()
+    mx.readFromXmlFile(document, str(mtlx_path))
+    return document
+
+
+def test_library_contains_every_function(library: Path) -> None:
+    node_defs = [nd.getName() for nd in _read(library).getNodeDefs()]
+    assert node_defs == ["ND_scale", "ND_double_float", "ND_double_vector3", "ND_twice_scaled", "ND_split", "ND_unused"]
+    assert signature_path(library).is_file()
+
+
+def test_linked_library_matches_included_source(library: Path) -> None:
+    # calling the functions of a linked library creates the same nodes as compiling the library along with the shader
+    linked_path = library.parent / "linked.mxsl"
+    linked_path.write_text(f'#include "shapes.mtlx"\n{SHADER}')
+    included_path = library.parent / "included.mxsl"
+    included_path.write_text(f'#include "shapes.mxsl"\n{SHADER}')
+    mxslc.compile_file(linked_path, validate=True)
+    mxslc.compile_file(included_path, validate=True)
+
+    linked = _read(linked_path.with_suffix(".mtlx"))
+    included = _read(included_path.with_suffix(".mtlx"))
+    assert [mx.prettyPrint(n) for n in linked.getNodes()] == [mx.prettyPrint(n) for n in included.getNodes()]
+    # only the definitions of the functions that were called, and the functions that they call, are copied
+    assert "ND_unused" not in [nd.getName() for nd in linked.getNodeDefs()]
+    assert linked.getNodeGraph("NG_scale") is not None
+
+
+def test_library_in_branch_not_taken(library: Path) -> None:
+    mxsl_path = library.parent / "shader.mxsl"
+    mxsl_path.write_text('#ifdef USE_LIB\n#include "shapes.mtlx"\n#endif\nfloat y = scale(1.0);\n')
+    with pytest.raises(CompileError):
+        mxslc.compile_file(mxsl_path)
+    mxslc.compile_file(mxsl_path, add_macros=["USE_LIB"], validate=True)
+
+
+def test_xinclude_library(library: Path) -> None:
+    mxsl_path = library.parent / "shader.mxsl"
+    mxsl_path.write_text(f'#include "shapes.mtlx"\n{SHADER}')
+    mtlx_path = library.parent / "out" / "shader.mtlx"
+    mxslc.compile_file(mxsl_path, mtlx_path, validate=True, xinclude_libraries=True)
+
+    assert '<xi:include href="../shapes.mtlx" />' in mtlx_path.read_text()
+    assert len(_read(mtlx_path).getNodeDefs()) == len(_read(library).getNodeDefs())
+
+
+def test_library_linking_a_library(library: Path) -> None:
+    outer_path = library.parent / "outer.mxsl"
+    outer_path.write_text('#include "shapes.mtlx"\nfloat quad(float x) { return twice_scaled(twice_scaled(x)); }\n')
+    mxslc.compile_library(outer_path, validate=True)
+    mxsl_path = library.parent / "shader.mxsl"
+    mxsl_path.write_text('#include "outer.mtlx"\nfloat y = quad(1.0);\n')
+    mxslc.compile_file(mxsl_path, validate=True)
+
+    node_defs = [nd.getName() for nd in _read(mxsl_path.with_suffix(".mtlx")).getNodeDefs()]
+    assert node_defs == ["ND_scale", "ND_twice_scaled", "ND_quad"]
+
+
+def test_inline_functions_are_not_linked(library: Path) -> None:
+    mxsl_path = library.parent / "shader.mxsl"
+    mxsl_path.write_text('#include "shapes.mtlx"\nfloat y = helper(1.0);\n')
+    with pytest.raises(CompileError):
+        mxslc.compile_file(mxsl_path)
+
+
+def test_library_cannot_declare_variables(tmp_path: Path) -> None:
+    mxsl_path = tmp_path / "lib.mxsl"
+    mxsl_path.write_text("float scale(float x) { return x * 2.0; }\nfloat y = 1.0;\n")
+    with pytest.raises(CompileError, match="'y' is declared outside of a function"):
+        mxslc.compile_library(mxsl_path)
+
+
+def test_mtlx_without_signatures_is_not_a_library(tmp_path: Path) -> None:
+    (tmp_path / "plain.mtlx").write_text(mx.writeToXmlString(mx.createDocument()))
+    mxsl_path = tmp_path / "shader.mxsl"
+    mxsl_path.write_text('#include "plain.mtlx"\nfloat y = 1.0;\n')
+    with pytest.raises(CompileError, match="not a library"):
+        mxslc.compile_file(mxsl_path)
+
+
+def test_default_value_calls_library_function(tmp_path: Path) -> None:
+    library_path = tmp_path / "lib.mxsl"
+    library_path.write_text("float g(float x) { return x * 2.0; }\nfloat f(float x, float y = g(1.0)) { return x + y; }\n")
+    mxslc.compile_library(library_path)
+    # defaults are initialised separately in every compilation that links the library
+    for name in ["first", "second"]:
+        mxsl_path = tmp_path / f"{name}.mxsl"
+        mxsl_path.write_text('#include "lib.mtlx"\nfloat z = f(2.0);\n')
+        mxslc.compile_file(mxsl_path, validate=True)
+        document = _read(mxsl_path.with_suffix(".mtlx"))
+        assert document.getNode("z").getInput("y").getNodeName() in [n.getName() for n in document.getNodes("g")]
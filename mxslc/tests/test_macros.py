@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from mxslc.CompilerContext import CompilerContext
+from mxslc.Preprocessor.macros import Macro, define_macro, undefine_macro, is_macro_defined, expand_macro
+from mxslc.Preprocessor.process import process
+from mxslc.scan import scan
+
+
+def test_macros_are_looked_up_by_identifier() -> None:
+    with CompilerContext():
+        for i in range(100):
+            define_macro(Macro(f"M{i}", f"{i}.0"))
+        define_macro(Macro("M5", "vec3"))
+        undefine_macro("M7")
+        undefine_macro("UNDEFINED")
+        tokens = scan("M5 M7 M99 M5")
+        assert is_macro_defined(tokens[0]) and is_macro_defined("M99") and not is_macro_defined(tokens[1])
+        assert [t.lexeme for t in expand_macro(tokens[0])] == ["vec3"]
+        assert expand_macro(tokens[1]) is None
+        assert [t.lexeme for t in process(tokens, [Path(".")], is_main=True)] == ["vec3", "M7", "99.0", "vec3"]
+
+
+def test_macros_are_expanded_when_defined() -> None:
+    with CompilerContext():
+        tokens = process(scan("#define A 1.0\n#define B A + A\n#undef A\nB A\n"), [Path(".")], is_main=True)
+        assert [t.lexeme for t in tokens] == ["1.0", "+", "1.0", "A"]
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 import main
 
 
@@ -25,3 +27,27 @@ def test_main_with_args():
         expected = f.read()
 
     assert actual.replace("\\", "/") == expected.replace("\\", "/")
+
+
+def test_optimize_before_path():
+    args = main._parse_args(["-O", "peephole", "-O", "cse", "shader.mxsl"])
+    assert args.mxsl_path == Path("shader.mxsl")
+    assert args.optimizations == ["peephole", "cse"]
+
+
+def test_optimize_all():
+    args = main._parse_args(["shader.mxsl", "-O"])
+    assert args.mxsl_path == Path("shader.mxsl")
+    assert args.optimizations == list(main.Optimization)
+    assert main._parse_args(["shader.mxsl"]).optimizations == []
+
+
+def test_jobs_before_path():
+    args = main._parse_args(["-j", "4", "shaders"])
+    assert args.mxsl_path == Path("shaders")
+    assert args.jobs == 4
+    assert main._parse_args(["-j", "0", "shaders"]).jobs == 0
+    assert main._parse_args(["shaders"]).jobs == 1
+    # the number of jobs can not be left out, otherwise the path would be read as the number of jobs
+    with pytest.raises(SystemExit):
+        main._parse_args(["-j", "shaders"])
@@ -0,0 +1,38 @@
+from mxslc.DataType import FLOAT
+from mxslc.mx_wrapper import Document
+
+
+def test_wrappers_are_reused() -> None:
+    document = Document()
+    node = document.add_node("add", FLOAT)
+    input_ = node.add_input("in1", 1.0)
+
+    assert document.get_nodes()[0] is node
+    assert node.inputs[0] is input_
+    assert input_.parent is node
+    assert document.add_node("add", FLOAT) != node
+
+
+def test_node_def_ports_are_updated() -> None:
+    document = Document()
+    node_def = document.add_node_def("ND_test", FLOAT, "test")
+    node_def.add_input("a", data_type=FLOAT)
+    assert [i.name for i in node_def.inputs] == ["a"]
+
+    node_def.add_input("b", data_type=FLOAT)
+    node_def.get_input("a").remove()
+    assert [i.name for i in node_def.inputs] == ["b"]
+    assert node_def.output_count == 1
+
+
+def test_inherited_node_def_ports_are_updated() -> None:
+    document = Document()
+    base = document.add_node_def("ND_base", FLOAT, "test")
+    base.add_input("a", data_type=FLOAT)
+    node_def = document.add_node_def("ND_test", FLOAT, "test")
+    node_def.source.setInheritString("ND_base")
+    node_def.add_input("b", data_type=FLOAT)
+    assert [i.name for i in node_def.inputs] == ["b", "a"]
+
+    base.add_input("c", data_type=FLOAT)
+    assert [i.name for i in node_def.inputs] == ["b", "a", "c"]
@@ -43,6 +43,8 @@ _overwrite_all_expected = False
     ("directives/directives_3", False),
     ("directives/directives_4", False),
     ("directives/directives_5", False),
+    ("directives/directives_6", False),
+    ("directives/directives_7", False),
     ("tern_rel_expr_1", False),
     ("func_overloads/func_overloads_1", False),
     ("func_overloads/func_overloads_2", False),
@@ -50,12 +52,14 @@ _overwrite_all_expected = False
     ("func_overloads/func_overloads_4", False),
     ("func_overloads/func_overloads_5", False),
     ("func_overloads/func_overloads_6", False),
+    # the expected output of templated functions only contains the template types that are called
     ("templates/templates_1", False),
     ("templates/templates_2", False),
     ("templates/templates_3", False),
     ("templates/templates_4", False),
     ("templates/templates_5", False),
     ("templates/templates_6", False),
+    ("templates/templates_7", False),
     ("default_values_1", False),
     ("default_values_2", False),
     ("empty_file", False),
@@ -102,6 +106,7 @@ _overwrite_all_expected = False
     ("if_else_1", False),
     ("if_else_2", False),
     ("if_else_3", False),
+    ("if_else_4", False),
     ("const", False),
     ("float_formats", False),
 ])
@@ -157,3 +162,14 @@ def test_mxslc_globals(filename: str, globals_: dict[str, Any], overwrite_expect
         actual_path.unlink()
 
     assert actual.replace("\\", "/") == expected.replace("\\", "/")
+
+
+def test_uncalled_template_types_are_not_emitted(tmp_path: Path) -> None:
+    # every template type is compiled, but only the ones that are called are written to the document
+    mxsl_path = tmp_path / "templates.mxsl"
+    mxsl_path.write_text("T one_minus<float, vec2, vec3>(T v) { return 1.0 - v; }\nvec2 inv_uv = one_minus<vec2>(texcoord());\n")
+    mxslc.compile_file(mxsl_path, validate=True)
+    document = mx.createDocument()
+    mx.readFromXmlFile(document, str(mxsl_path.with_suffix(".mtlx")))
+    assert [nd.getName() for nd in document.getNodeDefs()] == ["ND_one_minus_vector2"]
+    assert [ng.getName() for ng in document.getNodeGraphs()] == ["NG_one_minus_vector2"]
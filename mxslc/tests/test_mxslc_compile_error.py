@@ -26,6 +26,8 @@ from mxslc.CompileError import CompileError
     "bad_template_1",
     "bad_template_2",
     "bad_template_3",
+    "bad_template_4",
+    "bad_template_5",
     "bad_arguments_1",
     "keyword_as_identifier",
     "inline_with_attribs",
@@ -33,6 +35,7 @@ from mxslc.CompileError import CompileError
     "out_param_2",
     "const_1",
     "const_2",
+    "bad_if_else_1",
 ])
 def test_mxslc_compile_error(filename: str) -> None:
     mxsl_path = (Path(__file__).parent / "data" / "error" / filename).with_suffix(".mxsl")
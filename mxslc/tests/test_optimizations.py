@@ -0,0 +1,281 @@
+import hashlib
+from pathlib import Path
+
+import MaterialX as mx
+import pytest
+
+import mxslc
+from mxslc import InteractiveCompiler, Optimization, constant_folding
+from mxslc.CompilerContext import CompilerContext
+from mxslc.DataType import FLOAT
+from mxslc.compile import compile_
+from mxslc.post_process import post_process
+from mxslc.stdlib import get_standard_library, clear_standard_library_cache
+
+_data = Path(__file__).parent / "data"
+
+
+def _node_signature(node: mx.Node, graph: mx.GraphElement, signatures: dict[str, str]) -> str:
+    """
+    Hashes a node and everything upstream of it without using any auto-generated names.
+    """
+    if node.getName() not in signatures:
+        inputs = []
+        for input_ in node.getInputs():
+            upstream = graph.getNode(input_.getNodeName()) if input_.getNodeName() else None
+            inputs.append((
+                input_.getName(),
+                _attributes(input_, ["name", "nodename"]),
+                _node_signature(upstream, graph, signatures) if upstream else None
+            ))
+        signature = repr((_attributes(node, ["name"]), sorted(inputs, key=repr)))
+        signatures[node.getName()] = hashlib.sha256(signature.encode()).hexdigest()
+    return signatures[node.getName()]
+
+
+def _graph_signature(graph: mx.GraphElement, merged: bool) -> tuple:
+    signatures: dict[str, str] = {}
+    consumed = {i.getNodeName() for n in graph.getNodes() for i in n.getInputs()}
+    # nodes that are not connected to anything downstream are compared by structure, all other nodes are compared through them
+    sinks = [_node_signature(n, graph, signatures) for n in graph.getNodes() if n.getName() not in consumed]
+    # identical nodes are merged into one when common subexpressions are eliminated, so a node that was not connected
+    # to anything may now be shared with a connected node, and only the set of distinct nodes can be compared
+    if merged:
+        sinks = list({_node_signature(n, graph, signatures) for n in graph.getNodes()})
+    outputs = [
+        (o.getName(), _attributes(o, ["nodename"]), _node_signature(graph.getNode(o.getNodeName()), graph, signatures) if o.getNodeName() else None)
+        for o in graph.getOutputs()
+    ]
+    inputs = [i.asString() for i in graph.getInputs()]
+    return _attributes(graph, []), sorted(sinks), sorted(outputs, key=repr), sorted(inputs)
+
+
+def _document_signature(document: mx.Document, merged: bool = False) -> tuple:
+    node_defs = sorted(nd.asString() for nd in document.getNodeDefs())
+    graphs = sorted((_graph_signature(g, merged) for g in document.getNodeGraphs()), key=repr)
+    return node_defs, graphs, _graph_signature(document, merged)
+
+
+def _attributes(element: mx.Element, ignore: list[str]) -> tuple:
+    return tuple(sorted((a, element.getAttribute(a).replace("\\", "/")) for a in element.getAttributeNames() if a not in ignore))
+
+
+@pytest.mark.parametrize("filename", [
+    "redbrick",
+    "shaderart",
+    "condensation",
+    "mountain",
+    "binary_expressions_1",
+    "for_loops/for_loops_1",
+    "for_loops/for_loops_3",
+    "simple/test_001",
+    "simple/test_004",
+    "simple/test_007",
+    "simple/test_010",
+    "node_constructors_1",
+    "properties_1",
+    "tern_rel_expr_1",
+    "templates/templates_3",
+    "default_values_2",
+    "node_defs/multioutput_4",
+    "node_defs/localvars_1",
+    "node_defs/complex_func_2",
+    "attributes/attributes_3",
+    "inline/inline_test_5",
+    "out_params/out_param_3",
+    "if_else_2",
+    "const",
+    "float_formats",
+])
+@pytest.mark.parametrize("optimization", [Optimization.PEEPHOLE, Optimization.CSE])
+def test_optimized_output_is_equivalent(filename: str, optimization: Optimization, tmp_path: Path) -> None:
+    mxsl_path = (_data / "mxsl" / filename).with_suffix(".mxsl")
+    actual_path = tmp_path / "actual.mtlx"
+    expected_path = (_data / "mtlx" / filename).with_suffix(".mtlx")
+
+    mxslc.compile_file(mxsl_path, actual_path, validate=True, optimizations=[optimization])
+
+    actual = mx.createDocument()
+    mx.readFromXmlFile(actual, str(actual_path))
+    expected = mx.createDocument()
+    mx.readFromXmlFile(expected, str(expected_path))
+    merged = optimization == Optimization.CSE
+    assert _document_signature(actual, merged) == _document_signature(expected, merged)
+
+
+def test_peephole_nodes_are_never_added() -> None:
+    source = """
+    vector3 v = vector3(1.0, 2.0, 3.0);
+    float x = v.y;
+    float y = x;
+    float z = float(y) * time();
+    """
+    node_counts = []
+    for optimizations in [set(), {Optimization.PEEPHOLE}]:
+        with CompilerContext() as context:
+            context.optimizations = optimizations
+            compile_(source, [Path(".")], is_main=True)
+            node_counts.append(len(context.document.get_nodes()))
+    assert node_counts[1] < node_counts[0]
+    # only the time and multiply nodes are needed
+    assert node_counts[1] == 2
+
+
+def test_cse_merges_identical_nodes() -> None:
+    source = """
+    inline float f(float x) { return sin(x * 2.0) + 1.0; }
+    float t = time();
+    float a = f(t) * f(t);
+    float b = sin(t * 2.0) + 1.0;
+    float c = a + b;
+    """
+    node_counts = []
+    for optimizations in [set(), {Optimization.CSE}]:
+        with CompilerContext() as context:
+            context.optimizations = optimizations
+            compile_(source, [Path(".")], is_main=True)
+            post_process()
+            node_counts.append(len(context.document.get_nodes()))
+    # time, multiply, sin and add are shared, leaving the outer multiply and add
+    assert node_counts == [12, 6]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2.0 * 3.0 + sin(0.0)", 6.0),
+    ("7.0 % 3.0 - 2.0 ^ 3.0", -7.0),
+    ("-1.0 % 3.0", 2.0),
+    ("clamp(1.5, 0.0, 1.0) + mix(1.0, 3.0, 0.25)", 3.5),
+    ("if (1.0 > 2.0) { 3.0 } else { 4.0 }", 4.0),
+    ("atan2(0.0, -1.0)", 3.14159265),
+    ("magnitude(normalize(vector3(3.0, 0.0, 4.0)) * 2.0)", 2.0),
+    ("dotproduct(vector2(1.0, 2.0), vector2(3.0, 4.0))", 11.0),
+    ("float(3 + 4 - 2) + float(true)", 6.0),
+])
+def test_constant_folding(expression: str, expected: float) -> None:
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.CONSTANT_FOLDING}
+        compile_(f"surfaceshader s = standard_surface(base={expression});", [Path(".")], is_main=True)
+        post_process()
+        nodes = context.document.get_nodes()
+        assert [n.category for n in nodes] == ["standard_surface"]
+        assert nodes[0].get_input("base").literal == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("expression", [
+    "1.0 / 0.0",
+    "sqrt(-1.0)",
+    "ln(0.0)",
+    "time() * 2.0",
+])
+def test_constant_folding_keeps_undefined_and_varying_nodes(expression: str) -> None:
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.CONSTANT_FOLDING}
+        compile_(f"surfaceshader s = standard_surface(base={expression});", [Path(".")], is_main=True)
+        post_process()
+        assert len(context.document.get_nodes()) > 1
+
+
+def test_constant_folding_defaults_are_discarded_with_standard_library() -> None:
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.CONSTANT_FOLDING}
+        compile_("surfaceshader s = standard_surface(base=2.0 * 3.0);", [Path(".")], is_main=True)
+        post_process()
+    assert get_standard_library() in constant_folding._node_def_defaults_cache
+    clear_standard_library_cache()
+    assert get_standard_library() not in constant_folding._node_def_defaults_cache
+
+
+def test_dead_code_elimination() -> None:
+    source = """
+    float unused_func(float a) { return a * 2.0; }
+    float scale(float a, float b) { float unused = b * 3.0; return a * 4.0; }
+    float t = time();
+    float x = t + 1.0;
+    @keep "true"
+    float kept = t * 5.0;
+    float s = scale(t, x);
+    surfaceshader ss = standard_surface(base=s);
+    """
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.DEAD_CODE}
+        compile_(source, [Path(".")], is_main=True)
+        post_process()
+        document = context.document
+        report = context.dead_code_report
+        assert [n.name for n in document.get_nodes()] == ["t", "x", "kept", "s", "ss"]
+        assert [nd.name for nd in document.node_defs] == ["ND_scale"]
+        # the signature of scale is kept
+        assert [i.name for i in document.node_defs[0].inputs] == ["a", "b"]
+        assert [i.name for i in document.get_nodes("scale")[0].inputs] == ["a", "b"]
+        assert [n.category for n in document.node_graphs[0].get_nodes()] == ["multiply"]
+        assert (report.nodes, report.inputs, report.node_graphs, report.node_defs) == (2, 0, 1, 1)
+
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.DEAD_CODE, Optimization.UNUSED_INPUTS}
+        compile_(source, [Path(".")], is_main=True)
+        post_process()
+        document = context.document
+        report = context.dead_code_report
+        assert [n.name for n in document.get_nodes()] == ["t", "kept", "s", "ss"]
+        assert [i.name for i in document.node_defs[0].inputs] == ["a"]
+        assert [i.name for i in document.get_nodes("scale")[0].inputs] == ["a"]
+        assert (report.nodes, report.inputs, report.node_graphs, report.node_defs) == (3, 1, 1, 1)
+
+
+def test_unused_inputs_without_dead_code_elimination() -> None:
+    source = """
+    float scale(float a, float b) { return a * 4.0; }
+    float offset(float a, float b) { float unused = b * 3.0; return a + 1.0; }
+    float t = time();
+    float dead = scale(t, 2.0);
+    float s = scale(t, 3.0);
+    float o = offset(s, 4.0);
+    surfaceshader ss = standard_surface(base=o);
+    """
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.UNUSED_INPUTS}
+        compile_(source, [Path(".")], is_main=True)
+        post_process()
+        document = context.document
+        assert document.validate()[0]
+        assert [n.name for n in document.get_nodes()] == ["t", "dead", "s", "o", "ss"]
+        # the input is removed from the unused instance as well
+        assert [[i.name for i in n.inputs] for n in document.get_nodes("scale")] == [["a"], ["a"]]
+        # the unused node still reads b, so the input is kept
+        assert [[i.name for i in nd.inputs] for nd in document.node_defs] == [["a"], ["a", "b"]]
+        assert context.dead_code_report.inputs == 1
+
+
+def test_dead_code_elimination_counts_node_defs_without_node_graphs() -> None:
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.DEAD_CODE}
+        compile_("surfaceshader ss = standard_surface();", [Path(".")], is_main=True)
+        context.document.add_node_def("ND_unused", FLOAT, "unused")
+        post_process()
+        assert context.document.node_defs == []
+        assert context.dead_code_report.node_defs == 1
+
+
+def test_dead_code_elimination_keeps_libraries() -> None:
+    source = """
+    float scale(float a, float b) { float unused = b * 3.0; return a * 4.0; }
+    float x = time();
+    """
+    with CompilerContext() as context:
+        context.optimizations = {Optimization.DEAD_CODE}
+        compile_(source, [Path(".")], is_main=True)
+        post_process()
+        document = context.document
+        assert [n.name for n in document.get_nodes()] == ["x"]
+        assert [i.name for i in document.node_defs[0].inputs] == ["a", "b"]
+        assert [n.category for n in document.node_graphs[0].get_nodes()] == ["multiply"]
+        assert str(context.dead_code_report) == "Removed 1 unused nodes, 0 unused inputs, 0 unused nodegraphs and 0 unused nodedefs."
+
+
+def test_interactive_compiler_optimizations() -> None:
+    compiler = InteractiveCompiler(optimizations=["peephole"])
+    compiler.eval("float x = 1.0; float y = x * time();")
+    assert compiler.context.optimizations == {Optimization.PEEPHOLE}
+    assert 'category="constant"' not in compiler.xml
+    compiler.clear()
+    assert compiler.context.optimizations == {Optimization.PEEPHOLE}
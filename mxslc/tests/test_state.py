@@ -0,0 +1,54 @@
+import pytest
+
+from mxslc import InteractiveCompiler, state
+from mxslc.CompileError import CompileError
+from mxslc.DataType import FLOAT
+from mxslc.Expressions import Expression
+
+
+def test_resolution_cache_hit():
+    compiler = InteractiveCompiler()
+    compiler.eval("float f(float x) { return x; }")
+    with compiler.context:
+        func = state.get_function("f")
+        stats = state.get_resolution_cache_stats()
+        assert state.get_function("f") is func
+        assert state.get_resolution_cache_stats()["hits"] == stats["hits"] + 1
+
+
+def test_resolution_cache_invalidated_by_new_overload():
+    compiler = InteractiveCompiler()
+    compiler.eval("float f(float x) { return x; }")
+    with compiler.context:
+        assert state.get_function("f").return_type == FLOAT
+    compiler.eval("vec3 f(vec3 x) { return x; }")
+    with compiler.context, pytest.raises(CompileError):
+        state.get_function("f")
+
+
+@pytest.mark.parametrize("source, expected_failures", [
+    ('color4 c = image("a.png") ^ 2.2;', 0),
+    ('float d = dotproduct(image("a.png"), vec3(1.0)) * image("b.png");', 0),
+    ('color3 c = if (true) { image("a.png") } else if (false) { image("b.png") } else { color3(1.0) };', 0),
+    # only the expressions between the ambiguous call and the statement fail
+    ('vec3 v = image("a.png") + image("b.png");', 2),
+    ('float d = dotproduct(image("a.png"), image("b.png") * vec3(1.0));', 3),
+])
+def test_argument_types_are_inferred_without_probing(source: str, expected_failures: int, monkeypatch: pytest.MonkeyPatch):
+    failures = 0
+    init = Expression.init
+
+    def counted(self, *args, **kwargs):
+        nonlocal failures
+        try:
+            init(self, *args, **kwargs)
+        except CompileError:
+            failures += 1
+            raise
+
+    monkeypatch.setattr(Expression, "init", counted)
+    try:
+        InteractiveCompiler().eval(source)
+    except CompileError:
+        assert expected_failures > 0
+    assert failures == expected_failures
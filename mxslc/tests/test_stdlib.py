@@ -0,0 +1,14 @@
+from mxslc.stdlib import get_standard_library, get_standard_library_functions, clear_standard_library_cache
+
+
+def test_standard_library_is_cached():
+    library = get_standard_library()
+    assert get_standard_library() is library
+    assert get_standard_library_functions() is library.functions
+    assert len(library.functions) > 0
+
+
+def test_clear_standard_library_cache():
+    library = get_standard_library()
+    clear_standard_library_cache()
+    assert get_standard_library() is not library
@@ -0,0 +1,35 @@
+import pickle
+
+from mxslc.Keyword import Keyword
+from mxslc.Token import Token, IdentifierToken, LiteralToken
+from mxslc.token_types import IDENTIFIER
+
+
+def test_tokens_are_hashed_consistently_with_equality() -> None:
+    names = [IdentifierToken(f"x{i}") for i in range(3)]
+    assert {t: t.lexeme for t in names}[IdentifierToken("x1")] == "x1"
+    assert len({*names, IdentifierToken("x0")}) == 3
+    assert IdentifierToken("x") == IDENTIFIER
+    assert LiteralToken(1.5) == LiteralToken(1.5)
+    assert LiteralToken(1.5) != LiteralToken(2.5)
+    # keyword tokens can still be found in sets of keywords
+    assert Token("vec3") in Keyword.DATA_TYPES()
+    assert Token(Keyword.IF) in {Keyword.IF, Keyword.ELSE}
+
+
+def test_tokens_are_classified() -> None:
+    vec3 = Token("vec3")
+    assert (vec3.type, vec3.lexeme) == ("vector3", "vec3")
+    assert vec3.is_keyword and vec3.is_data_type and not vec3.is_literal
+    assert Token(Keyword.IF).is_keyword and not Token(Keyword.IF).is_data_type
+    assert Token(Keyword.TRUE).is_literal and Token(Keyword.TRUE).value is True
+    assert LiteralToken("a").is_literal and LiteralToken("a").value == "a"
+    assert not IdentifierToken("float3").is_keyword
+    assert not Token("(").is_keyword
+
+
+def test_pickled_tokens_are_equal() -> None:
+    tokens = [IdentifierToken("x", line=3), LiteralToken(2), Token("vec2"), Token(";")]
+    for token in tokens:
+        copy = pickle.loads(pickle.dumps(token))
+        assert copy == token and copy.type == token.type and copy.line == token.line and hash(copy) == hash(token)
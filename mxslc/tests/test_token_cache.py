@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mxslc.scan import scan
+from mxslc.token_cache import TokenCache
+
+
+def _scan_counting(calls: list[Path]):
+    def scan_file(file: Path):
+        calls.append(file)
+        return scan(file.read_text())
+    return scan_file
+
+
+def test_token_cache_hit(tmp_path: Path):
+    file = tmp_path / "a.mxsl"
+    file.write_text("float x = 1.0;")
+    cache = TokenCache()
+    calls = []
+    tokens1 = cache.get(file, _scan_counting(calls))
+    tokens2 = cache.get(file, _scan_counting(calls))
+    assert len(calls) == 1
+    assert [t.lexeme for t in tokens1] == [t.lexeme for t in tokens2]
+    assert tokens1 is not tokens2
+
+
+def test_token_cache_invalidated_by_modification(tmp_path: Path):
+    file = tmp_path / "a.mxsl"
+    file.write_text("float x = 1.0;")
+    cache = TokenCache()
+    calls = []
+    cache.get(file, _scan_counting(calls))
+    file.write_text("float x = 2.0; float y = x;")
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tokens = cache.get(file, _scan_counting(calls))
+    assert len(calls) == 2
+    assert "y" in [t.lexeme for t in tokens]
+
+
+def test_token_cache_on_disk(tmp_path: Path):
+    file = tmp_path / "a.mxsl"
+    file.write_text("float x = 1.0;")
+    cache_dir = tmp_path / "cache"
+    calls = []
+    cache1 = TokenCache()
+    cache1.cache_dir = cache_dir
+    cache1.get(file, _scan_counting(calls))
+    cache2 = TokenCache()
+    cache2.cache_dir = cache_dir
+    tokens = cache2.get(file, _scan_counting(calls))
+    assert len(calls) == 1
+    assert [t.lexeme for t in tokens] == ["float", "x", "=", "1.0", ";"]
+
+
+def test_token_cache_dir_from_constructor(tmp_path: Path):
+    cache = TokenCache(cache_dir=tmp_path / "new" / ".." / "cache")
+    assert cache.cache_dir == tmp_path.resolve() / "cache"
+    assert cache.cache_dir.is_dir()
+
+
+def test_token_cache_saved_from_threads(tmp_path: Path):
+    file = tmp_path / "a.mxsl"
+    file.write_text("float x = 1.0;")
+    cache_dir = tmp_path / "cache"
+    caches = [TokenCache(cache_dir=cache_dir) for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda c: c.get(file, _scan_counting([])), caches))
+    assert all([t.lexeme for t in r] == ["float", "x", "=", "1.0", ";"] for r in results)
+    assert [p.suffix for p in cache_dir.iterdir()] == [".tokens"]